@@ -0,0 +1,44 @@
+"""Benchmark parsing of a LimeSurvey XML structure file
+
+Compares `read_lime_questionnaire_structure` with the fast HTML-to-text
+path against the BeautifulSoup-only cleaning of question texts.
+
+Usage:
+    poetry run python benchmarks/structure_parsing.py [path/to/structure.xml]
+"""
+import sys
+import timeit
+from unittest import mock
+
+from n2survey.lime import structure
+
+STRUCTURE_FILE = "data/survey_structure_2021.xml"
+REPEAT = 5
+
+
+def benchmark(structure_file: str, parser: str) -> float:
+    """Get the best time of parsing the structure file in seconds"""
+    return min(
+        timeit.repeat(
+            lambda: structure.read_lime_questionnaire_structure(
+                structure_file, parser=parser
+            ),
+            number=1,
+            repeat=REPEAT,
+        )
+    )
+
+
+def main(structure_file: str = STRUCTURE_FILE) -> None:
+    for parser in structure.STRUCTURE_PARSERS:
+        fast = benchmark(structure_file, parser)
+        with mock.patch.object(structure, "_html_to_text", structure._html_to_text_bs4):
+            slow = benchmark(structure_file, parser)
+        print(
+            f"{parser:>5}: BeautifulSoup cleaning {slow * 1000:7.1f} ms,"
+            f" fast cleaning {fast * 1000:7.1f} ms ({slow / fast:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -1,3 +1,17 @@
+from .answer_index import *
+from .arrow import *
+from .bitmatrix import *
+from .cache import *
+from .code_matrix import *
+from .filters import *
+from .label_index import *
+from .lss import *
+from .query import *
+from .question_index import *
+from .question_registry import *
+from .sqlite_store import *
+from .storage import *
 from .structure import *
+from .structure_diff import *
 from .survey import *
 from .transformations import *
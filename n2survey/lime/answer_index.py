@@ -0,0 +1,218 @@
+"""Inverted index of answers to rows
+
+The module contains `AnswerIndex`, which maps each answer of indexed
+columns, e.g. "A3" of single-choice question "A6", to the rows with the
+answer as a mask packed to bits (see `pack_mask`). Masks of a column are
+built once, on first use, from its category codes. Filters like
+"A6 == 'A3' & B2 != 'A5'" are evaluated as bitwise operations on masks.
+"""
+
+from typing import Dict, Iterable
+
+import numpy as np
+import pandas as pd
+
+from n2survey.lime.bitmatrix import invert_mask, pack_mask
+from n2survey.lime.code_matrix import MISSING_CODE
+from n2survey.lime.query import And, Compare, Not, Or, QueryNode, iter_comparisons
+
+__all__ = ["AnswerIndex"]
+
+# Operators of comparisons evaluated on masks
+_INDEX_OPERATORS = ("==", "!=", "in", "not in")
+
+
+class AnswerIndex:
+    """Packed masks of rows by column and answer
+
+    Columns are added with their category codes (see `add_column`). The
+    masks of a column, one per category and one of missing values, are
+    built when the column is first used.
+
+    Attributes:
+        n_rows (int): Number of rows, i.e. responses
+    """
+
+    __slots__ = ("n_rows", "_categories", "_codes", "_masks")
+
+    def __init__(self, n_rows: int) -> None:
+        """Create an empty index
+
+        Args:
+            n_rows (int): Number of rows
+        """
+        self.n_rows = n_rows
+        self._categories: Dict[str, pd.Index] = {}
+        self._codes: Dict[str, np.ndarray] = {}
+        self._masks: Dict[str, np.ndarray] = {}
+
+    def __contains__(self, column: str) -> bool:
+        return column in self._categories
+
+    @property
+    def columns(self) -> list:
+        """Names of indexed columns"""
+        return list(self._categories)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of built masks in bytes"""
+        return sum(masks.nbytes for masks in self._masks.values())
+
+    def add_column(self, column: str, codes: np.ndarray, categories: Iterable) -> None:
+        """Add a column to the index
+
+        Args:
+            column (str): Column name
+            codes (np.ndarray): Category codes of the rows, `MISSING_CODE`
+              for missing values, e.g. `pd.Categorical.codes`
+            categories (Iterable): Values by code
+
+        Raises:
+            ValueError: Number of codes is not the number of rows
+        """
+        if len(codes) != self.n_rows:
+            raise ValueError(
+                f"Column '{column}' has {len(codes)} rows instead of {self.n_rows}"
+            )
+        self._categories[column] = pd.Index(categories)
+        self._codes[column] = codes
+        self._masks.pop(column, None)
+
+    def _get_masks(self, column: str) -> np.ndarray:
+        """Get masks of a column, one per category followed by missing values"""
+        masks = self._masks.get(column)
+        if masks is None:
+            codes = self._codes.pop(column)
+            n_categories = len(self._categories[column])
+            masks = np.empty((n_categories + 1, (self.n_rows + 7) // 8), dtype=np.uint8)
+            for code in range(n_categories):
+                masks[code] = pack_mask(codes == code)
+            masks[n_categories] = pack_mask(codes == MISSING_CODE)
+            self._masks[column] = masks
+        return masks
+
+    def _no_rows(self) -> np.ndarray:
+        """Get a packed mask of no rows"""
+        return np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+
+    def get_mask(self, column: str, value) -> np.ndarray:
+        """Get rows where a column has a value
+
+        Args:
+            column (str): Name of an indexed column
+            value: Value, e.g. "A3"
+
+        Raises:
+            KeyError: The column is not indexed
+
+        Returns:
+            np.ndarray: Packed mask of rows (see `unpack_mask`), no rows
+              for values that are not categories
+        """
+        if column not in self._categories:
+            raise KeyError(f"Column '{column}' is not indexed")
+        code = self._categories[column].get_indexer([value])[0]
+        if code == MISSING_CODE:
+            return self._no_rows()
+        return self._get_masks(column)[code].copy()
+
+    def get_missing(self, column: str) -> np.ndarray:
+        """Get rows where a column has no value
+
+        Args:
+            column (str): Name of an indexed column
+
+        Raises:
+            KeyError: The column is not indexed
+
+        Returns:
+            np.ndarray: Packed mask of rows
+        """
+        if column not in self._categories:
+            raise KeyError(f"Column '{column}' is not indexed")
+        return self._get_masks(column)[-1].copy()
+
+    def supports(self, node: QueryNode) -> bool:
+        """Whether a parsed query can be evaluated on the index
+
+        Args:
+            node (QueryNode): Parsed query, see `parse_query`
+
+        Returns:
+            bool: All comparisons are "==", "!=", "in" or "not in" of
+              indexed columns with values other than NaN
+        """
+        for comparison in iter_comparisons(node):
+            values = (
+                comparison.value
+                if isinstance(comparison.value, tuple)
+                else (comparison.value,)
+            )
+            if (
+                comparison.op not in _INDEX_OPERATORS
+                or comparison.column not in self._categories
+                # NaN is not a category, but `isin` selects missing values
+                or any(pd.isna(value) for value in values)
+            ):
+                return False
+        return True
+
+    def evaluate(self, node: QueryNode) -> np.ndarray:
+        """Evaluate a parsed query as in `pd.DataFrame.query`
+
+        Missing values compare as NaN, i.e. only "!=" and "not in"
+        select them.
+
+        Args:
+            node (QueryNode): Parsed query, see `parse_query` and `supports`
+
+        Raises:
+            ValueError: The query cannot be evaluated on the index
+
+        Returns:
+            np.ndarray: Packed mask of selected rows
+        """
+        if not self.supports(node):
+            raise ValueError(f"Query {node} cannot be evaluated on the answer index")
+        return self._evaluate(node)
+
+    def _evaluate(self, node: QueryNode) -> np.ndarray:
+        """Evaluate a supported query node"""
+        if isinstance(node, Compare):
+            values = node.value if isinstance(node.value, tuple) else (node.value,)
+            bits = self._no_rows()
+            for value in values:
+                bits |= self.get_mask(node.column, value)
+            if node.op in ("!=", "not in"):
+                bits = invert_mask(bits, self.n_rows)
+            return bits
+        if isinstance(node, Not):
+            return invert_mask(self._evaluate(node.operand), self.n_rows)
+        if isinstance(node, And):
+            bits = invert_mask(self._no_rows(), self.n_rows)
+            for operand in node.operands:
+                bits &= self._evaluate(operand)
+            return bits
+        if isinstance(node, Or):
+            bits = self._no_rows()
+            for operand in node.operands:
+                bits |= self._evaluate(operand)
+            return bits
+        raise ValueError(f"Unexpected query node {node}")
+
+    def select(self, conditions: Iterable[tuple]) -> np.ndarray:
+        """Get rows where all columns have given values
+
+        Args:
+            conditions (Iterable[tuple]): Pairs of (column, value)
+
+        Raises:
+            KeyError: A column is not indexed
+
+        Returns:
+            np.ndarray: Packed mask of rows
+        """
+        return self._evaluate(
+            And(tuple(Compare(column, "==", value) for column, value in conditions))
+        )
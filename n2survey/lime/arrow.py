@@ -0,0 +1,211 @@
+"""Reading response CSV files with pyarrow
+
+The module contains `read_csv_arrow`, a replacement of `pd.read_csv`
+for response exports which parses the file with multithreaded
+`pyarrow.csv` and gives the same DataFrame as the pandas C parser
+for the dtypes used by `LimeSurvey.read_responses`.
+
+pyarrow is an optional dependency and is imported on first use.
+"""
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+__all__ = ["read_csv_arrow"]
+
+# Values pd.read_csv treats as missing (its default `na_values`) and as booleans
+_NA_VALUES = [
+    "",
+    "#N/A",
+    "#N/A N/A",
+    "#NA",
+    "-1.#IND",
+    "-1.#QNAN",
+    "-NaN",
+    "-nan",
+    "1.#IND",
+    "1.#QNAN",
+    "<NA>",
+    "N/A",
+    "NA",
+    "NULL",
+    "NaN",
+    "n/a",
+    "nan",
+    "null",
+]
+_TRUE_VALUES = ["True", "TRUE", "true"]
+_FALSE_VALUES = ["False", "FALSE", "false"]
+
+
+def _import_pyarrow():
+    """Import pyarrow modules, raising a helpful error if it is missing"""
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.csv
+        import pyarrow.feather
+    except ImportError as error:
+        raise ImportError(
+            "pyarrow is required for this feature. Install it with "
+            "`pip install pyarrow` or the `arrow` extra of n2survey."
+        ) from error
+    return pyarrow
+
+
+def _restore_missing_strings(frame: pd.DataFrame) -> pd.DataFrame:
+    """Replace None of arrow nulls in object columns by NaN in place
+
+    pd.read_csv gives NaN for missing values in string columns, while
+    arrow string columns give None in pandas.
+    """
+    for name in frame.columns[frame.dtypes == object]:
+        values = frame[name].to_numpy(copy=True)
+        values[pd.isnull(values)] = np.nan
+        frame[name] = values
+    return frame
+
+
+def _get_arrow_types(pa) -> Dict:
+    """Get arrow types of pandas dtypes supported in `read_csv_arrow`"""
+    return {
+        "str": pa.string(),
+        "category": pa.string(),
+        "float64": pa.float64(),
+        pd.Int16Dtype(): pa.int16(),
+        pd.Int32Dtype(): pa.int32(),
+        pd.UInt32Dtype(): pa.uint32(),
+    }
+
+
+def _get_pandas_types(pa) -> Dict:
+    """Get pandas nullable dtypes of arrow integer types"""
+    return {
+        pa.int16(): pd.Int16Dtype(),
+        pa.int32(): pd.Int32Dtype(),
+        pa.uint32(): pd.UInt32Dtype(),
+    }
+
+
+def _encode_categories(pa, column, categories: List[str]):
+    """Dictionary encode a string column with the given categories
+
+    Values not in categories become null as in pd.read_csv with
+    a `pd.CategoricalDtype`.
+    """
+    dictionary = pa.array(categories, type=pa.string())
+    indices = pa.compute.index_in(column, value_set=dictionary)
+    return pa.chunked_array(
+        [pa.DictionaryArray.from_arrays(chunk, dictionary) for chunk in indices.chunks],
+        type=pa.dictionary(pa.int32(), pa.string()),
+    )
+
+
+def _parse_datetimes(pa, column):
+    """Parse a string column of ISO timestamps, keep strings if it fails
+
+    Strings are parsed by `_parse_datetime_strings` after conversion to pandas.
+    """
+    try:
+        return pa.compute.cast(column, pa.timestamp("ns"))
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        return column
+
+
+def _parse_datetime_strings(frame: pd.DataFrame, names: Sequence[str]) -> None:
+    """Parse string columns arrow could not cast to timestamps in place
+
+    Other formats are parsed by `pd.to_datetime` like in `pd.read_csv`, which
+    keeps strings it cannot parse.
+    """
+    for name in names:
+        if frame[name].dtype != object:
+            continue
+        try:
+            frame[name] = pd.to_datetime(frame[name])
+        except (ValueError, TypeError):
+            continue
+
+
+def read_csv_arrow(
+    filepath: str,
+    names: Sequence[str],
+    dtype: dict = None,
+    parse_dates: Sequence[str] = (),
+    index_col: int = 0,
+) -> pd.DataFrame:
+    """Read a CSV file with pyarrow like `pd.read_csv`
+
+    The header row of the file is replaced by `names`. Supported dtypes
+    are `pd.CategoricalDtype`, "category", "str", "float64" and nullable
+    Int16, Int32 and UInt32. Types of other columns are inferred.
+
+    Args:
+        filepath (str): Path to the CSV file
+        names (Sequence[str]): Column names to use instead of the header
+        dtype (dict, optional): Column name -> dtype. Defaults to None.
+        parse_dates (Sequence[str], optional): Columns to parse as
+          datetimes. Defaults to ().
+        index_col (int, optional): Position of the index column. Defaults to 0.
+
+    Raises:
+        ValueError: A dtype is not supported
+
+    Returns:
+        pd.DataFrame: The same DataFrame as `pd.read_csv(filepath, header=0,
+          names=names, index_col=index_col, dtype=dtype, parse_dates=parse_dates)`
+    """
+    pa = _import_pyarrow()
+    dtype = dtype or {}
+    arrow_types = _get_arrow_types(pa)
+
+    column_types = {}
+    for name, column_dtype in dtype.items():
+        if isinstance(column_dtype, pd.CategoricalDtype):
+            column_types[name] = pa.string()
+        elif column_dtype in arrow_types:
+            column_types[name] = arrow_types[column_dtype]
+        else:
+            raise ValueError(f"dtype {column_dtype} of '{name}' is not supported")
+    for name in parse_dates:
+        column_types[name] = pa.string()
+
+    table = pa.csv.read_csv(
+        filepath,
+        read_options=pa.csv.ReadOptions(
+            column_names=list(names), skip_rows=1, use_threads=True
+        ),
+        convert_options=pa.csv.ConvertOptions(
+            column_types=column_types,
+            null_values=_NA_VALUES,
+            true_values=_TRUE_VALUES,
+            false_values=_FALSE_VALUES,
+            strings_can_be_null=True,
+        ),
+    )
+
+    # Convert columns in arrow, so to_pandas gives final pandas dtypes
+    columns = []
+    for name, column in zip(table.column_names, table.columns):
+        column_dtype = dtype.get(name)
+        if isinstance(column_dtype, pd.CategoricalDtype):
+            column = _encode_categories(pa, column, list(column_dtype.categories))
+        elif column_dtype == "category":
+            categories = sorted(pa.compute.unique(column).drop_null().to_pylist())
+            column = _encode_categories(pa, column, categories)
+        elif name in parse_dates:
+            column = _parse_datetimes(pa, column)
+        elif column.type == pa.null():
+            # pandas reads empty columns as float
+            column = column.cast(pa.float64())
+        columns.append(column)
+    table = pa.table(columns, names=table.column_names)
+
+    responses = _restore_missing_strings(
+        table.to_pandas(types_mapper=_get_pandas_types(pa).get)
+    )
+    _parse_datetime_strings(responses, parse_dates)
+
+    return responses.set_index(responses.columns[index_col])
@@ -0,0 +1,184 @@
+"""Boolean matrices of responses packed to bits
+
+The module contains `BitMatrix`, which keeps boolean columns, e.g.
+checked boxes of a multiple-choice question, as bits packed along the
+responses, one bit per respondent. Counting, co-occurrence and
+combining columns run as bitwise operations on whole bytes.
+
+Row masks are packed with `pack_mask` as well, so masks of different
+columns can be combined with `&`, `|` and `invert_mask` before they are
+unpacked with `unpack_mask`.
+"""
+
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+__all__ = ["BitMatrix", "count_bits", "invert_mask", "pack_mask", "unpack_mask"]
+
+# Number of set bits of each byte value
+_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def pack_mask(mask: np.ndarray) -> np.ndarray:
+    """Pack boolean masks of rows to bits
+
+    Args:
+        mask (np.ndarray): Boolean mask of rows, or a 2D array of
+          masks, one per row of the array
+
+    Returns:
+        np.ndarray: uint8 array of `ceil(n_rows / 8)` bytes per mask
+    """
+    return np.packbits(np.asarray(mask, dtype=bool), axis=-1, bitorder="little")
+
+
+def unpack_mask(bits: np.ndarray, n_rows: int) -> np.ndarray:
+    """Unpack masks packed by `pack_mask`
+
+    Args:
+        bits (np.ndarray): Packed masks
+        n_rows (int): Number of rows
+
+    Returns:
+        np.ndarray: Boolean mask of rows, or a 2D array of masks
+    """
+    return np.unpackbits(bits, axis=-1, count=n_rows, bitorder="little").view(bool)
+
+
+def invert_mask(bits: np.ndarray, n_rows: int) -> np.ndarray:
+    """Invert packed masks, keeping padding bits after the last row unset
+
+    Args:
+        bits (np.ndarray): Packed masks
+        n_rows (int): Number of rows
+
+    Returns:
+        np.ndarray: Packed inverted masks
+    """
+    inverted = ~bits
+    if n_rows % 8:
+        inverted[..., -1] &= np.uint8((1 << (n_rows % 8)) - 1)
+    return inverted
+
+
+def count_bits(bits: np.ndarray) -> np.ndarray:
+    """Count set bits of packed masks
+
+    Args:
+        bits (np.ndarray): Packed masks
+
+    Returns:
+        np.ndarray: Number of selected rows of each mask
+    """
+    return _POPCOUNT[bits].sum(axis=-1, dtype=np.int64)
+
+
+class BitMatrix:
+    """Boolean columns of responses packed to bits
+
+    Attributes:
+        bits (np.ndarray): uint8 array with a packed mask per column
+        columns (pd.Index): Column names
+        n_rows (int): Number of rows, i.e. responses
+    """
+
+    __slots__ = ("bits", "columns", "n_rows")
+
+    def __init__(self, bits: np.ndarray, columns: Iterable[str], n_rows: int) -> None:
+        """Create a matrix from packed masks, see `from_frame`
+
+        Args:
+            bits (np.ndarray): uint8 array of shape
+              (len(columns), ceil(n_rows / 8)) with a packed mask per column
+            columns (Iterable[str]): Column names
+            n_rows (int): Number of rows
+        """
+        self.bits = bits
+        self.columns = pd.Index(columns)
+        self.n_rows = n_rows
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> "BitMatrix":
+        """Pack boolean columns of a DataFrame
+
+        Args:
+            frame (pd.DataFrame): Boolean columns, e.g. `responses.notnull()`
+
+        Returns:
+            BitMatrix: Packed columns
+        """
+        return cls(
+            pack_mask(frame.to_numpy(dtype=bool).T), frame.columns, frame.shape[0]
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Size of packed bits in bytes"""
+        return self.bits.nbytes
+
+    def _get_bits(self, columns: Optional[Iterable[str]]) -> np.ndarray:
+        """Get packed masks of columns, of all columns if None"""
+        if columns is None:
+            return self.bits
+        columns = list(columns)
+        positions = self.columns.get_indexer_for(columns)
+        if (positions < 0).any():
+            missing = [column for column in columns if column not in self.columns]
+            raise KeyError(f"Unknown columns {missing}")
+        return self.bits[positions]
+
+    def to_array(self) -> np.ndarray:
+        """Unpack the matrix
+
+        Returns:
+            np.ndarray: Boolean array of shape (n_rows, len(columns))
+        """
+        return unpack_mask(self.bits, self.n_rows).T
+
+    def count(self) -> pd.Series:
+        """Count rows with set bits per column
+
+        Returns:
+            pd.Series: Number of rows per column, i.e. checked boxes
+        """
+        return pd.Series(count_bits(self.bits), index=self.columns)
+
+    def cooccurrence(self) -> pd.DataFrame:
+        """Count rows with set bits for each pair of columns
+
+        Returns:
+            pd.DataFrame: Square table of counts, its diagonal is `count()`
+        """
+        counts = count_bits(self.bits[:, np.newaxis, :] & self.bits[np.newaxis, :, :])
+        return pd.DataFrame(counts, index=self.columns, columns=self.columns)
+
+    def any(self, columns: Optional[Iterable[str]] = None) -> np.ndarray:
+        """Get packed mask of rows with a set bit in any of the columns
+
+        Args:
+            columns (Iterable[str], optional): Column names. Defaults to
+              None, i.e. all columns.
+
+        Returns:
+            np.ndarray: Packed mask of rows, see `unpack_mask`
+        """
+        return np.bitwise_or.reduce(
+            self._get_bits(columns), axis=0, initial=np.uint8(0)
+        )
+
+    def all(self, columns: Optional[Iterable[str]] = None) -> np.ndarray:
+        """Get packed mask of rows with set bits in all of the columns
+
+        Args:
+            columns (Iterable[str], optional): Column names. Defaults to
+              None, i.e. all columns.
+
+        Returns:
+            np.ndarray: Packed mask of rows, see `unpack_mask`
+        """
+        bits = self._get_bits(columns)
+        if not len(bits):
+            return invert_mask(np.zeros(self.bits.shape[1], np.uint8), self.n_rows)
+        return np.bitwise_and.reduce(bits, axis=0)
@@ -0,0 +1,236 @@
+"""On-disk caches for parsed LimeSurvey files
+
+The module contains helper functions for storing parsed survey
+structure tables and responses in a cache folder, so unchanged files
+do not have to be parsed again.
+"""
+
+import hashlib
+import importlib.util
+import os
+import pickle
+from typing import Optional, Tuple
+
+import pandas as pd
+
+from n2survey.lime.storage import (
+    ResponsesStoreWriter,
+    read_responses_store,
+    read_responses_store_metadata,
+)
+
+__all__ = [
+    "get_file_fingerprint",
+    "read_structure_cache",
+    "write_structure_cache",
+    "read_responses_cache",
+    "write_responses_cache",
+]
+
+# Increase when the layout of cached objects changes
+CACHE_FORMAT_VERSION = 1
+
+
+def _hash_file(filepath: str) -> str:
+    """Get SHA-256 hex digest of a file content"""
+    sha256 = hashlib.sha256()
+    with open(filepath, "rb") as fp:
+        for block in iter(lambda: fp.read(1 << 20), b""):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+def get_file_fingerprint(filepath: str, content_hash: bool = True) -> dict:
+    """Get a fingerprint of a file
+
+    Args:
+        filepath (str): Path to the file
+        content_hash (bool, optional): Whether to hash the file content.
+          Defaults to True.
+
+    Returns:
+        dict: Absolute "path", "size", "mtime_ns" and, if requested,
+          "sha256" of the file
+    """
+    filepath = os.path.abspath(filepath)
+    stat = os.stat(filepath)
+    fingerprint = {
+        "path": filepath,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+    if content_hash:
+        fingerprint["sha256"] = _hash_file(filepath)
+    return fingerprint
+
+
+def _is_fingerprint_valid(cached: dict, filepath: str) -> bool:
+    """Check a cached fingerprint against the current file
+
+    Path, size and modification time are compared first. If the file
+    was only touched (i.e. mtime changed), the content hash decides.
+    """
+    current = get_file_fingerprint(filepath, content_hash=False)
+    if cached.get("path") != current["path"] or cached.get("size") != current["size"]:
+        return False
+    if cached.get("mtime_ns") == current["mtime_ns"]:
+        return True
+    return cached.get("sha256") == _hash_file(filepath)
+
+
+def _get_cache_path(
+    cache_dir: str, filepath: str, prefix: str, extension: str = ".pkl"
+) -> str:
+    """Get path of a cache file for a given source file"""
+    path_hash = hashlib.sha1(os.path.abspath(filepath).encode("utf8")).hexdigest()
+    return os.path.join(cache_dir, f"{prefix}-{path_hash[:16]}{extension}")
+
+
+def read_structure_cache(
+    structure_file: str, cache_dir: str
+) -> Optional[Tuple[pd.DataFrame, pd.DataFrame]]:
+    """Read cached structure tables of a structure file
+
+    Args:
+        structure_file (str): Path to the structure XML file
+        cache_dir (str): Path to the cache folder
+
+    Returns:
+        Optional[tuple[pd.DataFrame, pd.DataFrame]]: Pair of (sections, questions)
+          tables, or None if there is no valid cache for the file
+    """
+    cache_path = _get_cache_path(cache_dir, structure_file, "structure")
+    if not os.path.isfile(cache_path):
+        return None
+
+    try:
+        with open(cache_path, "rb") as fp:
+            cached = pickle.load(fp)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+
+    if (
+        cached.get("format_version") != CACHE_FORMAT_VERSION
+        or cached.get("pandas_version") != pd.__version__
+        or not _is_fingerprint_valid(cached["fingerprint"], structure_file)
+    ):
+        return None
+
+    return cached["sections"], cached["questions"]
+
+
+def write_structure_cache(
+    structure_file: str,
+    cache_dir: str,
+    sections: pd.DataFrame,
+    questions: pd.DataFrame,
+) -> str:
+    """Store parsed structure tables of a structure file
+
+    Args:
+        structure_file (str): Path to the structure XML file
+        cache_dir (str): Path to the cache folder. Created if does not exist.
+        sections (pd.DataFrame): Sections table
+        questions (pd.DataFrame): Questions table
+
+    Returns:
+        str: Path to the cache file
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    cache_path = _get_cache_path(cache_dir, structure_file, "structure")
+    cached = {
+        "format_version": CACHE_FORMAT_VERSION,
+        "pandas_version": pd.__version__,
+        "fingerprint": get_file_fingerprint(structure_file),
+        "sections": sections,
+        "questions": questions,
+    }
+    # Write to a temporary file first, so concurrent readers never
+    # see a partially written cache
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as fp:
+        pickle.dump(cached, fp, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_path)
+
+    return cache_path
+
+
+def read_responses_cache(
+    responses_file: str, cache_dir: str, structure_file: str
+) -> Optional[Tuple[pd.DataFrame, pd.DataFrame, Optional[str]]]:
+    """Read cached responses of a responses CSV file
+
+    Responses depend on the survey structure (e.g. categories of
+    choice columns), so the cache is only valid if neither the responses
+    file nor the structure file changed. Responses are cached as
+    a responses store (see `ResponsesStoreWriter`), which needs pyarrow.
+
+    Args:
+        responses_file (str): Path to the responses CSV file
+        cache_dir (str): Path to the cache folder
+        structure_file (str): Path to the structure file the responses
+          were read with
+
+    Returns:
+        Optional[tuple[pd.DataFrame, pd.DataFrame, Optional[str]]]: Triple of
+          (responses, system_info, org), or None if there is no valid cache
+          for the file or pyarrow is missing
+    """
+    if importlib.util.find_spec("pyarrow") is None:
+        return None
+    cache_path = _get_cache_path(cache_dir, responses_file, "responses", "")
+    try:
+        metadata = read_responses_store_metadata(cache_path, missing_ok=True)
+    except (OSError, ValueError):
+        return None
+
+    if (
+        metadata is None
+        or metadata.get("pandas_version") != pd.__version__
+        or not _is_fingerprint_valid(metadata["fingerprint"], responses_file)
+        or not _is_fingerprint_valid(metadata["structure_fingerprint"], structure_file)
+    ):
+        return None
+
+    responses, system_info = read_responses_store(cache_path)
+    return responses, system_info, metadata.get("org")
+
+
+def write_responses_cache(
+    responses_file: str,
+    cache_dir: str,
+    structure_file: str,
+    responses: pd.DataFrame,
+    system_info: pd.DataFrame,
+    org: Optional[str] = None,
+) -> Optional[str]:
+    """Store read responses of a responses CSV file
+
+    Args:
+        responses_file (str): Path to the responses CSV file
+        cache_dir (str): Path to the cache folder. Created if does not exist.
+        structure_file (str): Path to the structure file the responses
+          were read with
+        responses (pd.DataFrame): Responses to survey questions
+        system_info (pd.DataFrame): LimeSurvey system info of the responses
+        org (Optional[str], optional): Organization found in the responses file
+
+    Returns:
+        Optional[str]: Path to the cache folder of the responses, or None
+          if pyarrow is missing
+    """
+    if importlib.util.find_spec("pyarrow") is None:
+        return None
+    cache_path = _get_cache_path(cache_dir, responses_file, "responses", "")
+    with ResponsesStoreWriter(cache_path) as writer:
+        writer.write(responses, system_info)
+        writer.metadata.update(
+            {
+                "pandas_version": pd.__version__,
+                "fingerprint": get_file_fingerprint(responses_file),
+                "structure_fingerprint": get_file_fingerprint(structure_file),
+                "org": org,
+            }
+        )
+
+    return cache_path
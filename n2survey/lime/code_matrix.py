@@ -0,0 +1,174 @@
+"""Integer codes of categorical responses
+
+The module contains `CodeMatrix`, which keeps categorical response
+columns, e.g. of single-choice and array questions, as small integer
+category codes in one contiguous NumPy array. Counting and filtering
+compare integers, and labels are looked up in per-column tables only
+when results are presented.
+"""
+
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+__all__ = ["CodeMatrix", "MISSING_CODE"]
+
+# Code of missing values, as in `pd.Categorical.codes`
+MISSING_CODE = -1
+
+
+class CodeMatrix:
+    """Category codes of categorical columns
+
+    Codes are positions of values in the categories of a column.
+
+    Attributes:
+        codes (np.ndarray): int8 (or int16 for more than 128 categories)
+          array of shape (n_rows, len(columns)). It is column-major, so
+          codes of a column are contiguous.
+        columns (pd.Index): Column names
+        categories (dict[str, pd.Index]): Column name -> values by code
+        labels (dict[str, np.ndarray]): Column name -> labels by code
+    """
+
+    __slots__ = ("codes", "columns", "categories", "labels")
+
+    def __init__(
+        self,
+        codes: np.ndarray,
+        columns: Iterable[str],
+        categories: Dict[str, pd.Index],
+        labels: Dict[str, np.ndarray],
+    ) -> None:
+        """Create a matrix from codes, see `from_frame`
+
+        Args:
+            codes (np.ndarray): Array of shape (n_rows, len(columns))
+            columns (Iterable[str]): Column names
+            categories (dict[str, pd.Index]): Column name -> values by code
+            labels (dict[str, np.ndarray]): Column name -> labels by code
+        """
+        self.codes = codes
+        self.columns = pd.Index(columns)
+        self.categories = categories
+        self.labels = labels
+
+    @classmethod
+    def from_frame(
+        cls, frame: pd.DataFrame, choices: Optional[Dict[str, dict]] = None
+    ) -> "CodeMatrix":
+        """Get codes of categorical columns of a DataFrame
+
+        Args:
+            frame (pd.DataFrame): Categorical columns
+            choices (dict[str, dict], optional): Column name -> dict of
+              value -> label, e.g. {"A6": {"A1": "Yes", "A2": "No"}}. Values
+              without a label are labels of themselves. Defaults to None.
+
+        Returns:
+            CodeMatrix: Codes of the columns
+        """
+        choices = choices or {}
+        n_categories = max(
+            (len(frame[column].cat.categories) for column in frame.columns), default=0
+        )
+        codes = np.empty(
+            frame.shape, dtype=np.min_scalar_type(-max(n_categories, 1)), order="F"
+        )
+        categories = {}
+        labels = {}
+        for position, column in enumerate(frame.columns):
+            values = frame[column].array
+            codes[:, position] = values.codes
+            categories[column] = values.categories
+            column_choices = choices.get(column) or {}
+            labels[column] = np.array(
+                [column_choices.get(value, value) for value in values.categories],
+                dtype=object,
+            )
+        return cls(codes, frame.columns, categories, labels)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of codes in bytes"""
+        return self.codes.nbytes
+
+    def get_codes(self, column: str) -> np.ndarray:
+        """Get codes of a column
+
+        Args:
+            column (str): Column name
+
+        Returns:
+            np.ndarray: Codes of the column, a view of `codes`
+        """
+        return self.codes[:, self.columns.get_loc(column)]
+
+    def encode(self, column: str, value) -> int:
+        """Get code of a value of a column
+
+        Args:
+            column (str): Column name
+            value: Value, e.g. "A3"
+
+        Returns:
+            int: Code of the value, `MISSING_CODE` if it is not a category
+        """
+        return int(self.categories[column].get_indexer([value])[0])
+
+    def mask(self, column: str, value) -> np.ndarray:
+        """Get rows where a column has a value
+
+        Args:
+            column (str): Column name
+            value: Value, e.g. "A3"
+
+        Returns:
+            np.ndarray: Boolean mask of rows, no rows for values that
+              are not categories
+        """
+        codes = self.get_codes(column)
+        code = self.encode(column, value)
+        if code == MISSING_CODE:
+            return np.zeros(len(codes), dtype=bool)
+        return codes == code
+
+    def count(self, column: str, labels: bool = False) -> pd.Series:
+        """Count values of a column, not counting missing values
+
+        Args:
+            column (str): Column name
+            labels (bool, optional): Index counts by labels instead of
+              values. Defaults to False.
+
+        Returns:
+            pd.Series: Number of rows per category in the category order
+        """
+        codes = self.get_codes(column)
+        counts = np.bincount(
+            codes[codes != MISSING_CODE], minlength=len(self.categories[column])
+        )
+        index = self.labels[column] if labels else self.categories[column]
+        return pd.Series(counts, index=index, name=column)
+
+    def decode(self, column: str, codes: np.ndarray, labels: bool = True) -> np.ndarray:
+        """Get values or labels of codes of a column
+
+        Args:
+            column (str): Column name
+            codes (np.ndarray): Codes of the column
+            labels (bool, optional): Get labels instead of values.
+              Defaults to True.
+
+        Returns:
+            np.ndarray: Object array of values or labels, None for
+              missing values
+        """
+        table = self.labels[column] if labels else self.categories[column].to_numpy()
+        codes = np.asarray(codes)
+        if not len(table):
+            return np.full(codes.shape, None, dtype=object)
+        return np.where(
+            codes == MISSING_CODE, None, table.astype(object)[np.maximum(codes, 0)]
+        )
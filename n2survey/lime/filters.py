@@ -0,0 +1,93 @@
+"""Composable row filters
+
+The module contains filters of survey responses, which are combined
+with `&`, `|` and `~`, e.g. `Answer("A6", "A3") & ~Missing("B2")`.
+Filters are hashable values, so `LimeSurvey` caches the row mask of each
+filter (see `LimeSurvey.get_filter_mask`) and evaluates a filter used by
+`__getitem__`, `count` and `plot` once per survey.
+"""
+
+from dataclasses import dataclass
+from typing import Tuple
+
+__all__ = ["AllOf", "Answer", "AnyOf", "Filter", "Missing", "NoneOf"]
+
+
+class Filter:
+    """Base class of row filters"""
+
+    def __and__(self, other: "Filter") -> "AllOf":
+        if not isinstance(other, Filter):
+            return NotImplemented
+        return AllOf(_operands(self, AllOf) + _operands(other, AllOf))
+
+    def __or__(self, other: "Filter") -> "AnyOf":
+        if not isinstance(other, Filter):
+            return NotImplemented
+        return AnyOf(_operands(self, AnyOf) + _operands(other, AnyOf))
+
+    def __invert__(self) -> "Filter":
+        # Inverting a single inverted filter gives the filter back
+        if isinstance(self, NoneOf) and len(self.filters) == 1:
+            return self.filters[0]
+        return NoneOf((self,))
+
+
+def _operands(flt: Filter, cls: type) -> Tuple[Filter, ...]:
+    """Get operands of a filter combined with `cls`, flattening nested ones"""
+    return flt.filters if isinstance(flt, cls) else (flt,)
+
+
+@dataclass(frozen=True)
+class Answer(Filter):
+    """Rows with one of given answers to a single-column question
+
+    Attributes:
+        question (str): Name of a column, e.g. a single-choice question
+          "A6" or a subquestion "B6_SQ001"
+        value: Answer code, e.g. "A3", or a tuple (or list) of codes
+    """
+
+    question: str
+    value: object
+
+    def __post_init__(self) -> None:
+        if isinstance(self.value, list):
+            object.__setattr__(self, "value", tuple(self.value))
+
+    @property
+    def values(self) -> tuple:
+        """Selected answer codes"""
+        return self.value if isinstance(self.value, tuple) else (self.value,)
+
+
+@dataclass(frozen=True)
+class Missing(Filter):
+    """Rows without an answer to any column of a question
+
+    Attributes:
+        question (str): Name of a question or a column
+    """
+
+    question: str
+
+
+@dataclass(frozen=True)
+class AllOf(Filter):
+    """Rows selected by all filters"""
+
+    filters: Tuple[Filter, ...]
+
+
+@dataclass(frozen=True)
+class AnyOf(Filter):
+    """Rows selected by any of the filters"""
+
+    filters: Tuple[Filter, ...]
+
+
+@dataclass(frozen=True)
+class NoneOf(Filter):
+    """Rows selected by none of the filters, `~filter` for a single one"""
+
+    filters: Tuple[Filter, ...]
@@ -0,0 +1,199 @@
+"""Full-text index of survey question texts
+
+The module contains `LabelIndex`, an inverted index from words of
+question labels, descriptions and choice texts to rows of
+`LimeSurvey.questions`, so text search does not have to scan every
+question.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Set
+
+from n2survey.lime.question_registry import QuestionRegistry
+
+__all__ = ["LabelIndex", "LABEL_INDEX_FIELDS"]
+
+# Fields of question records covered by the index
+LABEL_INDEX_FIELDS = ("label", "question_label", "question_description", "choices")
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Length of character n-grams of words, see `LabelIndex._get_words`
+_NGRAM_LENGTH = 3
+
+
+def _tokenize(text: str) -> List[str]:
+    """Split a text into lowercase words"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class LabelIndex:
+    """Inverted index of question texts
+
+    Each word of the indexed texts points to row positions of the
+    questions table where it appears. A search looks up candidate rows
+    by the words of the search text and checks only them for the exact
+    phrase. Parts of words at the ends of the search text are looked up
+    by character n-grams of the indexed words.
+    """
+
+    def __init__(self, registry: QuestionRegistry) -> None:
+        """Build the index
+
+        Args:
+            registry (QuestionRegistry): Question records in the table order,
+              see `LimeSurvey.questions`
+        """
+        self._names: List[str] = registry.names
+        self._groups: List[str] = []
+        self._texts: List[Dict[str, str]] = []
+        self._postings: Dict[str, Set[int]] = {}
+        # Words by their n-grams, built on the first search for a part of a word
+        self._ngrams: Optional[Dict[str, Set[str]]] = None
+
+        # Choices dicts are shared between records, join them once
+        choice_texts: Dict[int, str] = {}
+        for position, record in enumerate(registry):
+            group = record.get("question_group")
+            self._groups.append(group if isinstance(group, str) else record.name)
+
+            texts = {}
+            for field in LABEL_INDEX_FIELDS:
+                value = record.get(field, None)
+                if field == "choices" and isinstance(value, dict):
+                    if id(value) not in choice_texts:
+                        choice_texts[id(value)] = "\n".join(
+                            str(text) for text in value.values()
+                        )
+                    value = choice_texts[id(value)]
+                if isinstance(value, str) and value:
+                    texts[field] = value
+            self._texts.append(texts)
+
+            for text in texts.values():
+                for token in _tokenize(text):
+                    self._postings.setdefault(token, set()).add(position)
+
+    def _get_token_positions(self, token: str, prefix: bool, suffix: bool) -> Set[int]:
+        """Get positions of rows having a word matching the token
+
+        Args:
+            token (str): Lowercase word of the search text
+            prefix (bool): Whether the token may be the end of a longer word
+            suffix (bool): Whether the token may be the start of a longer word
+        """
+        if not prefix and not suffix:
+            return self._postings.get(token, set())
+
+        positions = set()
+        for word in self._get_words(token):
+            if (
+                (prefix and suffix)
+                or (prefix and word.endswith(token))
+                or (suffix and word.startswith(token))
+            ):
+                positions |= self._postings[word]
+        return positions
+
+    def _get_words(self, token: str) -> Set[str]:
+        """Get indexed words containing a token
+
+        Words are looked up by the n-grams of the token, so only words with
+        all of them are checked.
+        """
+        if self._ngrams is None:
+            self._ngrams = {}
+            for word in self._postings:
+                for length in range(1, _NGRAM_LENGTH + 1):
+                    for start in range(len(word) - length + 1):
+                        self._ngrams.setdefault(
+                            word[start : start + length], set()
+                        ).add(word)
+
+        if len(token) <= _NGRAM_LENGTH:
+            return self._ngrams.get(token, set())
+        word_sets = sorted(
+            (
+                self._ngrams.get(token[start : start + _NGRAM_LENGTH], set())
+                for start in range(len(token) - _NGRAM_LENGTH + 1)
+            ),
+            key=len,
+        )
+        return {
+            word for word in word_sets[0].intersection(*word_sets[1:]) if token in word
+        }
+
+    def search(
+        self,
+        text: str,
+        fields: Optional[Iterable[str]] = None,
+        case_sensitive: bool = False,
+    ) -> List[int]:
+        """Find rows containing a text
+
+        Args:
+            text (str): Text to look for, e.g. "interest or pleasure"
+            fields (Iterable[str], optional): Fields to search in, by default
+              all of `LABEL_INDEX_FIELDS`
+            case_sensitive (bool, optional): Whether to match the case.
+              Defaults to False.
+
+        Raises:
+            ValueError: The text has no words or a field is not indexed
+
+        Returns:
+            list[int]: Positions of matching rows in the table order
+        """
+        fields = LABEL_INDEX_FIELDS if fields is None else tuple(fields)
+        unknown_fields = set(fields) - set(LABEL_INDEX_FIELDS)
+        if unknown_fields:
+            raise ValueError(
+                f"Fields {unknown_fields} are not indexed."
+                f" Supported fields: {LABEL_INDEX_FIELDS}"
+            )
+        tokens = _tokenize(text)
+        if not tokens:
+            raise ValueError(f"No words to search for in '{text}'")
+
+        # Words at the ends of the text may be parts of longer words
+        last = len(tokens) - 1
+        starts_inside_word = bool(_TOKEN_RE.match(text))
+        ends_inside_word = bool(_TOKEN_RE.match(text[-1]))
+        candidates = None
+        for i, token in enumerate(tokens):
+            positions = self._get_token_positions(
+                token,
+                prefix=i == 0 and starts_inside_word,
+                suffix=i == last and ends_inside_word,
+            )
+            candidates = positions if candidates is None else candidates & positions
+            if not candidates:
+                return []
+
+        # Check candidates for the whole phrase
+        if not case_sensitive:
+            text = text.lower()
+        matches = []
+        for position in sorted(candidates):
+            for field in fields:
+                field_text = self._texts[position].get(field)
+                if field_text is None:
+                    continue
+                if not case_sensitive:
+                    field_text = field_text.lower()
+                if text in field_text:
+                    matches.append(position)
+                    break
+        return matches
+
+    def find_columns(self, text: str, **kwargs) -> List[str]:
+        """Get names of columns containing a text, see `search`"""
+        return [self._names[position] for position in self.search(text, **kwargs)]
+
+    def find_groups(self, text: str, **kwargs) -> List[str]:
+        """Get unique question groups containing a text, see `search`"""
+        return list(
+            dict.fromkeys(
+                self._groups[position] for position in self.search(text, **kwargs)
+            )
+        )
@@ -0,0 +1,418 @@
+"""LimeSurvey .lss survey archive reader
+
+The module contains helper functions for building the survey structure
+directly from LimeSurvey survey archives (*.lss), without exporting
+a questionnaire XML file first. The result has the same layout as
+the one of `read_lime_questionnaire_structure`.
+"""
+
+from typing import Dict, List, Optional, Tuple
+from warnings import warn
+
+from lxml import etree
+
+from n2survey.lime.structure import _clean_text, _combine_question_columns
+
+__all__ = ["read_lime_lss_structure"]
+
+# Tables of the archive used to build the structure. Since LimeSurvey 4,
+# texts are stored in separate *_l10ns tables, one row per language.
+LSS_TABLES = (
+    "groups",
+    "group_l10ns",
+    "questions",
+    "subquestions",
+    "question_l10ns",
+    "answers",
+    "answer_l10ns",
+)
+
+# Answer options of question types with predefined answers
+_FIXED_CHOICES = {
+    "5": {str(value): str(value) for value in range(1, 6)},
+    "A": {str(value): str(value) for value in range(1, 6)},
+    "B": {str(value): str(value) for value in range(1, 11)},
+    "C": {"Y": "Yes", "U": "Uncertain", "N": "No"},
+    "E": {"I": "Increase", "S": "Same", "D": "Decrease"},
+    "G": {"F": "Female", "M": "Male"},
+    "Y": {"Y": "Yes", "N": "No"},
+}
+# Formats of question types with free input
+_FREE_FORMATS = {
+    "D": "date",
+    "N": "integer",
+    "K": "integer",
+    "S": "longtext",
+    "T": "longtext",
+    "U": "longtext",
+    "Q": "text",
+    ":": "integer",
+    ";": "text",
+}
+# Question types that have no columns in the questionnaire XML file,
+# i.e. equation, file upload and language switch
+_SKIPPED_TYPES = ("*", "|", "I")
+# Text display questions are added to the section information
+_TEXT_DISPLAY_TYPE = "X"
+
+
+def _read_lss_rows(
+    filepath: str, language: Optional[str] = None
+) -> Tuple[Dict[str, List[Dict]], Optional[str]]:
+    """Read rows of the structure tables of a .lss file
+
+    Walks the file with `lxml.etree.iterparse`, so only the current
+    <row> is kept in memory as an element. Rows in other languages
+    are dropped as soon as the language is known.
+
+    Args:
+        filepath (str): Path to the .lss file
+        language (str, optional): Language of the texts. By default,
+          the first one in <languages> is used.
+
+    Returns:
+        tuple[dict[str, list[dict]], Optional[str]]: Pair of rows (dicts
+          of field values) per table and the used language
+    """
+    tables = {table: [] for table in LSS_TABLES}
+    for _, element in etree.iterparse(filepath, tag=("row", "languages")):
+        if element.tag == "languages":
+            if language is None:
+                language = next((child.text for child in element), None)
+        else:
+            table = element.getparent().getparent().tag
+            if table in tables:
+                row = {field.tag: field.text or "" for field in element}
+                if language is None or row.get("language", language) == language:
+                    tables[table].append(row)
+        # Drop the parsed element and everything before it
+        element.clear(keep_tail=True)
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+
+    if language is None:
+        # No <languages> section, use the language of the first text
+        language = next(
+            (
+                row["language"]
+                for rows in tables.values()
+                for row in rows
+                if "language" in row
+            ),
+            None,
+        )
+    tables = {
+        table: [row for row in rows if row.get("language", language) == language]
+        for table, rows in tables.items()
+    }
+
+    return tables, language
+
+
+def _merge_l10ns(rows: List[Dict], l10ns: List[Dict], key: str) -> List[Dict]:
+    """Add texts from a *_l10ns table to the table rows"""
+    if not l10ns:
+        return rows
+    texts = {row[key]: row for row in l10ns}
+    return [{**texts.get(row[key], {}), **row} for row in rows]
+
+
+def _sort_rows(rows: List[Dict], field: str) -> List[Dict]:
+    """Sort rows by an integer field keeping the file order for ties"""
+    return sorted(rows, key=lambda row: int(row.get(field) or 0))
+
+
+def _free_response(name: str, response_format: str, label: str = "") -> Tuple:
+    """Get a parsed <response> with free input"""
+    return (
+        {
+            "name": name,
+            "format": response_format,
+            "length": None,
+            "label": label,
+            "choices": None,
+        },
+        None,
+    )
+
+
+def _fixed_response(
+    name: str, choices: Dict[str, str], contingent: Optional[Dict] = None
+) -> Tuple:
+    """Get a parsed <response> with answer options"""
+    return (
+        {
+            "name": name,
+            "format": None,
+            "length": None,
+            "label": None,
+            "choices": choices,
+        },
+        contingent,
+    )
+
+
+def _contingent_response(name: str, text: str, of_name: str, of_choice: str) -> Dict:
+    """Get a parsed <contingentQuestion> with long text input"""
+    return {
+        "name": name,
+        "text": text,
+        "length": None,
+        "format": "longtext",
+        "contingent_of_name": of_name,
+        "contingent_of_choice": of_choice,
+    }
+
+
+def _other_response(title: str) -> Tuple:
+    """Get a parsed "Other" option of a multiple-choice question"""
+    return _fixed_response(
+        f"{title}T",
+        {"Y": "Other"},
+        _contingent_response(f"{title}other", "Other", f"{title}T", "Y"),
+    )
+
+
+def _get_subquestions(
+    subquestions: List[Dict], name: str, scale_id: str = "0"
+) -> List[Tuple[str, str]]:
+    """Get (column name, label) pairs of subquestions of a scale
+
+    Args:
+        subquestions (list[dict]): Rows of the subquestions table
+        name (str): Column name template, e.g. "G2Q1_{}"
+        scale_id (str, optional): Scale of the subquestions. Defaults to "0".
+    """
+    return [
+        (name.format(row["title"]), _clean_text(row.get("question", "")))
+        for row in subquestions
+        if row.get("scale_id", "0") == scale_id
+    ]
+
+
+def _get_choices(answers: List[Dict], scale_id: str = "0") -> Dict[str, str]:
+    """Get answer options of a scale"""
+    return {
+        row["code"]: _clean_text(row.get("answer", ""))
+        for row in answers
+        if row.get("scale_id", "0") == scale_id
+    }
+
+
+def _get_choice_question_parts(
+    question: Dict, subquestions: List[Dict], answers: List[Dict]
+) -> Optional[List[Tuple]]:
+    """Get parts of single choice and array questions
+
+    See `_get_question_parts`. Returns None for other question types.
+    """
+    title = question["title"]
+    question_type = question["type"]
+
+    # Single choice questions
+    if question_type in ("5", "G", "Y"):
+        return [([], [_fixed_response(title, _FIXED_CHOICES[question_type])])]
+    if question_type in ("L", "!"):
+        choices = _get_choices(answers)
+        contingent = None
+        if question.get("other") == "Y":
+            choices["-oth-"] = "Other"
+            contingent = _contingent_response(f"{title}other", "Other", title, "-oth-")
+        return [([], [_fixed_response(title, choices, contingent)])]
+    if question_type == "O":
+        return [
+            (
+                [],
+                [
+                    _fixed_response(title, _get_choices(answers)),
+                    _free_response(f"{title}_comment", "longtext"),
+                ],
+            )
+        ]
+
+    # Arrays
+    if question_type in ("A", "B", "C", "E", "F", "H"):
+        choices = _FIXED_CHOICES.get(question_type) or _get_choices(answers)
+        return [
+            (
+                _get_subquestions(subquestions, f"{title}_{{}}"),
+                [_fixed_response(title, choices)],
+            )
+        ]
+    if question_type == "1":
+        # Dual scale array has a column per subquestion and scale
+        return [
+            (
+                _get_subquestions(subquestions, f"{title}_{{}}#{scale_id}"),
+                [_fixed_response(title, _get_choices(answers, scale_id))],
+            )
+            for scale_id in ("0", "1")
+        ]
+
+    return None
+
+
+def _get_input_question_parts(
+    question: Dict, subquestions: List[Dict], answers: List[Dict]
+) -> Optional[List[Tuple]]:
+    """Get parts of multiple choice and free input questions
+
+    See `_get_question_parts`. Returns None for other question types.
+    """
+    title = question["title"]
+    question_type = question["type"]
+
+    # Multiple choice
+    if question_type in ("M", "P"):
+        responses = [
+            _fixed_response(
+                name,
+                {"Y": label},
+                # Multiple choice with comments
+                _contingent_response(f"{name}comment", "Comment", name, "Y")
+                if question_type == "P"
+                else None,
+            )
+            for name, label in _get_subquestions(subquestions, f"{title}_{{}}")
+        ]
+        if question.get("other") == "Y":
+            responses.append(_other_response(title))
+        return [([], responses)]
+
+    # Free input
+    if question_type in (":", ";"):
+        # Array of inputs has a column per pair of Y and X subquestions
+        x_subquestions = _get_subquestions(subquestions, "{}", scale_id="1")
+        return [
+            (
+                [],
+                [
+                    _free_response(
+                        f"{y_name}_{x_code}", _FREE_FORMATS[question_type], x_label
+                    )
+                    for x_code, x_label in x_subquestions
+                ],
+            )
+            for y_name, _ in _get_subquestions(subquestions, f"{title}_{{}}")
+        ]
+    if question_type == "R":
+        # Ranking has a column per rank
+        ranks = [
+            (f"{title}_{code}", f"Rank {rank}")
+            for rank, code in enumerate(_get_choices(answers), start=1)
+        ]
+        return [(ranks, [_free_response(title, "integer")])]
+    if question_type in ("K", "Q"):
+        return [
+            (
+                _get_subquestions(subquestions, f"{title}_{{}}"),
+                [_free_response(title, _FREE_FORMATS[question_type])],
+            )
+        ]
+    if question_type in _FREE_FORMATS:
+        return [([], [_free_response(title, _FREE_FORMATS[question_type])])]
+
+    return None
+
+
+def _get_question_parts(
+    question: Dict, subquestions: List[Dict], answers: List[Dict]
+) -> List[Tuple[List[Tuple[str, str]], List[Tuple]]]:
+    """Get subquestions and responses of a question like in the XML file
+
+    Args:
+        question (dict): Row of the questions table
+        subquestions (list[dict]): Rows of its subquestions, sorted
+        answers (list[dict]): Rows of its answer options, sorted
+
+    Returns:
+        list[tuple[list, list]]: Pairs of parsed subquestions and responses
+          (see `_combine_question_columns`), one per <question> element
+          of the XML file. Empty for question types without data columns.
+    """
+    for get_parts in (_get_choice_question_parts, _get_input_question_parts):
+        parts = get_parts(question, subquestions, answers)
+        if parts is not None:
+            return parts
+
+    if question["type"] not in _SKIPPED_TYPES:
+        warn(
+            f"Unknown type '{question['type']}' of question {question['title']}."
+            " Skipped."
+        )
+    return []
+
+
+def read_lime_lss_structure(
+    filepath: str, language: Optional[str] = None
+) -> dict[str, list[dict]]:
+    """Read LimeSurvey .lss survey archive
+
+    Builds sections from question groups and data columns from
+    questions, subquestions and answer options of the archive, like
+    they are described in the questionnaire XML file of the survey.
+
+    Args:
+        filepath (str): Path to the .lss file
+        language (str, optional): Language of the texts. By default,
+          the base language of the survey is used.
+
+    Returns:
+        dict[str, list[dict]]: A dictionary with "sections" and "questions",
+          see `read_lime_questionnaire_structure`
+    """
+    tables, language = _read_lss_rows(filepath, language=language)
+
+    groups = _merge_l10ns(tables["groups"], tables["group_l10ns"], "gid")
+    questions = _merge_l10ns(tables["questions"], tables["question_l10ns"], "qid")
+    subquestions = _merge_l10ns(tables["subquestions"], tables["question_l10ns"], "qid")
+    answers = _merge_l10ns(tables["answers"], tables["answer_l10ns"], "aid")
+
+    # Group rows by their parent
+    subquestions_by_parent = {}
+    for row in _sort_rows(subquestions, "question_order"):
+        subquestions_by_parent.setdefault(row["parent_qid"], []).append(row)
+    answers_by_question = {}
+    for row in _sort_rows(answers, "sortorder"):
+        answers_by_question.setdefault(row["qid"], []).append(row)
+    questions_by_group = {}
+    for row in _sort_rows(questions, "question_order"):
+        # Questions table of old archives contains subquestions as well
+        if row.get("parent_qid", "0") == "0":
+            questions_by_group.setdefault(row["gid"], []).append(row)
+
+    result_sections = list()
+    result_questions = list()
+    for group in _sort_rows(groups, "group_order"):
+        section_dict = {
+            "id": int(group["gid"]),
+            "title": _clean_text(group.get("group_name", "")),
+            "info": _clean_text(group.get("description", "")),
+        }
+        result_sections.append(section_dict)
+
+        for question in questions_by_group.get(group["gid"], []):
+            question_label = _clean_text(question.get("question", ""))
+            if question["type"] == _TEXT_DISPLAY_TYPE:
+                section_dict["info"] = f"{section_dict['info']} {question_label}"
+                section_dict["info"] = section_dict["info"].strip()
+                continue
+
+            question_description = _clean_text(question.get("help", ""))
+            for subquestion_list, responses in _get_question_parts(
+                question,
+                subquestions_by_parent.get(question["qid"], []),
+                answers_by_question.get(question["qid"], []),
+            ):
+                result_questions += [
+                    {**column, "section_id": section_dict["id"]}
+                    for column in _combine_question_columns(
+                        question["title"],
+                        question_label,
+                        question_description,
+                        subquestion_list,
+                        responses,
+                    )
+                ]
+
+    return {"sections": result_sections, "questions": result_questions}
@@ -0,0 +1,273 @@
+"""Parsing of row filter expressions
+
+The module contains `parse_query`, which parses expressions of
+`pd.DataFrame.query` into a tree of `Compare`, `And`, `Or` and `Not`
+nodes, and `to_sql`, which translates the tree into an SQL condition
+selecting the same rows as `pd.DataFrame.query`.
+
+Supported are comparisons of columns with literals (==, !=, <, <=, >,
+>=), `in` and `not in` with lists of literals, and `and`, `or`, `not`,
+`&`, `|` and `~`. As in pandas, `&` and `|` bind like `and` and `or`.
+Other expressions, e.g. with local variables (`@name`) or arithmetic,
+raise a ValueError, so callers can fall back to pandas.
+"""
+
+import ast
+import io
+import tokenize
+from dataclasses import dataclass
+from typing import Collection, FrozenSet, Iterator, List, Tuple, Union
+
+__all__ = [
+    "And",
+    "Compare",
+    "Not",
+    "Or",
+    "iter_comparisons",
+    "parse_query",
+    "quote_identifier",
+    "to_sql",
+]
+
+# Operators of Compare nodes by AST operator
+_OPERATORS = {
+    ast.Eq: "==",
+    ast.NotEq: "!=",
+    ast.Lt: "<",
+    ast.LtE: "<=",
+    ast.Gt: ">",
+    ast.GtE: ">=",
+    ast.In: "in",
+    ast.NotIn: "not in",
+}
+# Operator for swapped operands, e.g. "'A3' == A6"
+_SWAPPED_OPERATORS = {
+    "==": "==",
+    "!=": "!=",
+    "<": ">",
+    "<=": ">=",
+    ">": "<",
+    ">=": "<=",
+}
+_SQL_OPERATORS = {"==": "=", "!=": "!=", "<": "<", "<=": "<=", ">": ">", ">=": ">="}
+
+
+@dataclass(frozen=True)
+class Compare:
+    """Comparison of a column with a value or, for "in", with values
+
+    Attributes:
+        column (str): Column name
+        op (str): One of "==", "!=", "<", "<=", ">", ">=", "in" and "not in"
+        value: Literal value, a tuple of literal values for "in" and "not in"
+    """
+
+    column: str
+    op: str
+    value: object
+
+    @property
+    def columns(self) -> FrozenSet[str]:
+        """Names of compared columns"""
+        return frozenset([self.column])
+
+
+@dataclass(frozen=True)
+class And:
+    """Rows selected by all operands"""
+
+    operands: tuple
+
+    @property
+    def columns(self) -> FrozenSet[str]:
+        """Names of compared columns"""
+        return frozenset().union(*(operand.columns for operand in self.operands))
+
+
+@dataclass(frozen=True)
+class Or:
+    """Rows selected by any operand"""
+
+    operands: tuple
+
+    @property
+    def columns(self) -> FrozenSet[str]:
+        """Names of compared columns"""
+        return frozenset().union(*(operand.columns for operand in self.operands))
+
+
+@dataclass(frozen=True)
+class Not:
+    """Rows not selected by the operand"""
+
+    operand: Union[Compare, And, Or, "Not"]
+
+    @property
+    def columns(self) -> FrozenSet[str]:
+        """Names of compared columns"""
+        return self.operand.columns
+
+
+QueryNode = Union[Compare, And, Or, Not]
+
+
+def _replace_booleans(expr: str) -> str:
+    """Replace `&` and `|` by `and` and `or` to get their precedence in pandas"""
+    tokens = []
+    for token in tokenize.generate_tokens(io.StringIO(expr).readline):
+        if token.type == tokenize.OP and token.string in ("&", "|"):
+            tokens.append((tokenize.NAME, "and" if token.string == "&" else "or"))
+        else:
+            tokens.append((token.type, token.string))
+    return tokenize.untokenize(tokens)
+
+
+def _parse_literal(node: ast.AST, expr: str):
+    """Get the value of a literal or a list of literals"""
+    if isinstance(node, (ast.List, ast.Tuple)):
+        return tuple(_parse_literal(element, expr) for element in node.elts)
+    try:
+        value = ast.literal_eval(node)
+    except ValueError:
+        raise ValueError(
+            f"Unsupported value '{ast.unparse(node)}' in query '{expr}'"
+        ) from None
+    if isinstance(value, (list, tuple, set, dict)):
+        raise ValueError(f"Unsupported value '{ast.unparse(node)}' in query '{expr}'")
+    return value
+
+
+def _parse_compare(left: ast.AST, op: ast.cmpop, right: ast.AST, expr: str) -> Compare:
+    """Parse a comparison of a column with a literal"""
+    operator = _OPERATORS.get(type(op))
+    if operator is None:
+        raise ValueError(f"Unsupported operator in query '{expr}'")
+    if not isinstance(left, ast.Name) and operator in _SWAPPED_OPERATORS:
+        left, right = right, left
+        operator = _SWAPPED_OPERATORS[operator]
+    if not isinstance(left, ast.Name):
+        raise ValueError(f"Expected a column name in query '{expr}'")
+
+    value = _parse_literal(right, expr)
+    if operator in ("in", "not in"):
+        if not isinstance(value, tuple):
+            value = (value,)
+    # As in pandas, comparing with a list checks if values are in the list
+    elif isinstance(value, tuple):
+        if operator not in ("==", "!="):
+            raise ValueError(f"Unsupported comparison with a list in query '{expr}'")
+        operator = "in" if operator == "==" else "not in"
+    return Compare(left.id, operator, value)
+
+
+def _parse_node(node: ast.AST, expr: str) -> QueryNode:
+    """Parse a node of a boolean expression"""
+    if isinstance(node, ast.BoolOp):
+        operands = tuple(_parse_node(value, expr) for value in node.values)
+        return And(operands) if isinstance(node.op, ast.And) else Or(operands)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.Invert)):
+        return Not(_parse_node(node.operand, expr))
+    if isinstance(node, ast.Compare):
+        comparisons = []
+        left = node.left
+        # Chained comparisons, e.g. "1 < x < 3"
+        for op, right in zip(node.ops, node.comparators):
+            comparisons.append(_parse_compare(left, op, right, expr))
+            left = right
+        return comparisons[0] if len(comparisons) == 1 else And(tuple(comparisons))
+    raise ValueError(f"Unsupported expression '{ast.unparse(node)}' in query '{expr}'")
+
+
+def parse_query(expr: str) -> QueryNode:
+    """Parse an expression of `pd.DataFrame.query`
+
+    Args:
+        expr (str): Query, e.g. "A6 == 'A3' & B2 != 'A5'"
+
+    Raises:
+        ValueError: The query is not supported
+
+    Returns:
+        QueryNode: Tree of `Compare`, `And`, `Or` and `Not` nodes
+    """
+    try:
+        tree = ast.parse(_replace_booleans(expr.strip()), mode="eval")
+    except (SyntaxError, tokenize.TokenError):
+        raise ValueError(f"Cannot parse query '{expr}'") from None
+    return _parse_node(tree.body, expr)
+
+
+def iter_comparisons(node: QueryNode) -> Iterator[Compare]:
+    """Iterate over comparisons of a parsed query
+
+    Args:
+        node (QueryNode): Parsed query, see `parse_query`
+
+    Yields:
+        Compare: Comparisons in the order of the query
+    """
+    if isinstance(node, Compare):
+        yield node
+    elif isinstance(node, Not):
+        yield from iter_comparisons(node.operand)
+    else:
+        for operand in node.operands:
+            yield from iter_comparisons(operand)
+
+
+def quote_identifier(name: str) -> str:
+    """Quote an SQL identifier, e.g. a column name
+
+    Args:
+        name (str): Identifier
+
+    Returns:
+        str: Identifier in double quotes, with inner quotes doubled
+    """
+    return '"' + name.replace('"', '""') + '"'
+
+
+def to_sql(node: QueryNode, na_columns: Collection[str] = ()) -> Tuple[str, List]:
+    """Translate a parsed query into an SQL condition
+
+    Missing values (NULL) compare as NaN in pandas, i.e. only "!=" and
+    "not in" select them, so each comparison is 0 or 1 and never NULL.
+    Missing values of nullable dtypes (e.g. "Int32") are `pd.NA`, which
+    propagates through comparisons, `&`, `|` and `~` as NULL does in SQL,
+    so comparisons of such columns are left NULL. As in pandas, `in`
+    and `not in` are never NULL. Rows with a NULL condition are not
+    selected, as `pd.DataFrame.query` drops rows where the query is NA.
+
+    Args:
+        node (QueryNode): Parsed query, see `parse_query`
+        na_columns (Collection[str], optional): Names of columns with
+          missing values `pd.NA`. Defaults to no columns.
+
+    Returns:
+        tuple[str, list]: Pair of (condition, parameters) for "?" placeholders
+    """
+    if isinstance(node, Compare):
+        column = quote_identifier(node.column)
+        if node.op in ("in", "not in"):
+            placeholders = ", ".join("?" * len(node.value))
+            condition = f"{column} {node.op.upper()} ({placeholders})"
+            params = list(node.value)
+        else:
+            condition = f"{column} {_SQL_OPERATORS[node.op]} ?"
+            params = [node.value]
+            if node.column in na_columns:
+                return condition, params
+        missing = 1 if node.op in ("!=", "not in") else 0
+        return f"IFNULL({condition}, {missing})", params
+    if isinstance(node, Not):
+        condition, params = to_sql(node.operand, na_columns)
+        return f"NOT {condition}", params
+    if isinstance(node, (And, Or)):
+        conditions, params = [], []
+        for operand in node.operands:
+            condition, operand_params = to_sql(operand, na_columns)
+            conditions.append(condition)
+            params.extend(operand_params)
+        joiner = " AND " if isinstance(node, And) else " OR "
+        return f"({joiner.join(conditions)})", params
+    raise ValueError(f"Unexpected query node {node}")
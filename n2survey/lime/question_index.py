@@ -0,0 +1,159 @@
+"""Hashed index of a survey questions table
+
+The module contains `QuestionIndex` which maps question and column
+codes to rows of `LimeSurvey.questions`, so lookups do not have to
+scan the whole table.
+"""
+
+from typing import Dict, List, Optional, Set
+
+import pandas as pd
+
+from n2survey.lime.question_registry import QuestionRegistry
+
+__all__ = ["QuestionIndex"]
+
+
+class QuestionIndex:
+    """Index of a questions table
+
+    A key is either a question group name (e.g. "C3") or a column name
+    (e.g. "C3_SQ001"), like in `LimeSurvey.get_question`. For each key
+    the index stores rows of the table matching it as a group or as a
+    column, in the table order.
+
+    Attributes:
+        columns_by_group (dict[str, list[str]]): Key -> column names
+        group_by_column (dict[str, str]): Column name -> question group
+        type_by_column (dict[str, str]): Column name -> question type
+        label_by_group (dict[str, str]): Key -> question label
+        choices_by_group (dict[str, Optional[dict]]): Key -> choices as returned
+          by `LimeSurvey.get_choices`
+    """
+
+    def __init__(self, registry: QuestionRegistry) -> None:
+        """Build the index
+
+        Args:
+            registry (QuestionRegistry): Question records in the table order,
+              see `LimeSurvey.questions`
+        """
+        self.columns_by_group: Dict[str, List[str]] = {}
+        self.group_by_column: Dict[str, str] = {}
+        self.type_by_column: Dict[str, str] = {}
+        self.label_by_group: Dict[str, str] = {}
+        self.choices_by_group: Dict[str, Optional[dict]] = {}
+        self._positions: Dict[str, List[int]] = {}
+        self._other_positions: Dict[str, Set[int]] = {}
+
+        self._columns = columns = registry.names
+        groups = [record.get("question_group") for record in registry]
+        self._types = types = [record.get("type") for record in registry]
+        labels = [record.get("label") for record in registry]
+        question_labels = [record.get("question_label") for record in registry]
+        self._choices = [record.get("choices") for record in registry]
+        is_contingent = [record.get("is_contingent") for record in registry]
+
+        # Collect row positions per key
+        for position, (column, group) in enumerate(zip(columns, groups)):
+            if isinstance(group, str):
+                self.group_by_column[column] = group
+            self.type_by_column[column] = types[position]
+            keys = [column]
+            if isinstance(group, str) and group != column:
+                keys.append(group)
+            for key in keys:
+                self._positions.setdefault(key, []).append(position)
+                if pd.notnull(is_contingent[position]) and is_contingent[position]:
+                    self._other_positions.setdefault(key, set()).add(position)
+
+        # Precompute per key information
+        for key, positions in self._positions.items():
+            self.columns_by_group[key] = [columns[position] for position in positions]
+
+            # Use question label for a group of columns
+            first = positions[0]
+            if len(positions) > 1:
+                self.label_by_group[key] = question_labels[first]
+            else:
+                self.label_by_group[key] = labels[first]
+
+            # Some malformed questions have no valid choices,
+            # `get_choices` raises an error for them on lookup
+            try:
+                self.choices_by_group[key] = self._collect_choices(key)
+            except (KeyError, TypeError, IndexError):
+                pass
+
+    def _collect_choices(self, key: str) -> Optional[dict]:
+        """Collect choices for a key, see `LimeSurvey.get_choices`"""
+        # Skip contingent columns
+        positions = self.get_positions(key, drop_other=True)
+        if not positions:
+            return None
+        if len(positions) > 1 and all(
+            self._types[position] == "multiple-choice" for position in positions
+        ):
+            # Flatten nested dict and get choice text directly for multiple-choice
+            return {
+                self._columns[position]: self._choices[position]["Y"]
+                for position in positions
+            }
+        return self._choices[positions[0]]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._positions
+
+    def get_positions(self, key: str, drop_other: bool = False) -> List[int]:
+        """Get row positions for a question or a column
+
+        Args:
+            key (str): Name of question or subquestion
+            drop_other (bool, optional): Whether to exclude contingent
+              columns (i.e. "other")
+
+        Returns:
+            list[int]: Positions of matching rows, empty if there is no such key
+        """
+        positions = self._positions.get(key, [])
+        if drop_other and key in self._other_positions:
+            other_positions = self._other_positions[key]
+            positions = [
+                position for position in positions if position not in other_positions
+            ]
+        return positions
+
+    def get_columns(self, key: str, drop_other: bool = False) -> List[str]:
+        """Get column names for a question or a column
+
+        Args:
+            key (str): Name of question or subquestion
+            drop_other (bool, optional): Whether to exclude contingent
+              columns (i.e. "other")
+
+        Returns:
+            list[str]: Column names, empty if there is no such key
+        """
+        if not drop_other or key not in self._other_positions:
+            return self.columns_by_group.get(key, [])
+        positions = self._positions[key]
+        other_positions = self._other_positions[key]
+        return [
+            column
+            for position, column in zip(positions, self.columns_by_group[key])
+            if position not in other_positions
+        ]
+
+    def get_choices(self, key: str) -> Optional[dict]:
+        """Get choices for a question or a column, see `LimeSurvey.get_choices`"""
+        if key in self.choices_by_group:
+            return self.choices_by_group[key]
+        return self._collect_choices(key)
+
+    def get_types(self, key: str) -> List[str]:
+        """Get unique question types of the columns for a key in table order"""
+        return list(
+            dict.fromkeys(
+                self.type_by_column[column] for column in self.columns_by_group[key]
+            )
+        )
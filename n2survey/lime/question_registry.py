@@ -0,0 +1,250 @@
+"""Compact registry of survey questions
+
+The module contains `QuestionRecord`, a slotted record of a single data
+column, and `QuestionRegistry`, an ordered collection of such records.
+`LimeSurvey` keeps its question structure in a registry and builds the
+`LimeSurvey.questions` table from it on demand.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+__all__ = ["QuestionRecord", "QuestionRegistry"]
+
+# Fields stored in slots, other fields go to `QuestionRecord.extra`
+QUESTION_FIELDS = (
+    "label",
+    "format",
+    "choices",
+    "question_group",
+    "question_label",
+    "question_description",
+    "type",
+    "section_id",
+    "contingent_of_name",
+    "contingent_of_choice",
+    "is_contingent",
+)
+
+
+class QuestionRecord:
+    """Description of a single data column
+
+    Fields that were not provided are not set at all, so that they
+    become NA in `QuestionRegistry.to_frame`, like missing keys do in
+    `pandas.DataFrame`.
+    """
+
+    __slots__ = ("name", "extra") + QUESTION_FIELDS
+
+    def __init__(self, name: str, **fields) -> None:
+        """Create a record
+
+        Args:
+            name (str): Column name, e.g. "A3other"
+            **fields: Column attributes, e.g. label="...", type="single-choice"
+        """
+        self.name = name
+        self.extra = None
+        for field, value in fields.items():
+            self.set(field, value)
+
+    def get(self, field: str, default=np.nan):
+        """Get a field value or `default` if the field is not set"""
+        if field in QUESTION_FIELDS:
+            return getattr(self, field, default)
+        if self.extra is None:
+            return default
+        return self.extra.get(field, default)
+
+    def set(self, field: str, value) -> None:
+        """Set a field value"""
+        if field in QUESTION_FIELDS:
+            setattr(self, field, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[field] = value
+
+    def to_dict(self) -> dict:
+        """Get set fields as a dict"""
+        fields = {
+            field: getattr(self, field)
+            for field in QUESTION_FIELDS
+            if hasattr(self, field)
+        }
+        if self.extra:
+            fields.update(self.extra)
+        return fields
+
+    @property
+    def has_choices(self) -> bool:
+        """Whether the column has answer options"""
+        return isinstance(self.get("choices", None), dict)
+
+    def __repr__(self) -> str:
+        return f"QuestionRecord({self.name!r}, {self.to_dict()!r})"
+
+
+def _intern_choices(record: QuestionRecord, choice_maps: Dict[tuple, dict]) -> None:
+    """Share the choices dict of a record with records having the same choices"""
+    if record.has_choices:
+        try:
+            key = tuple(record.choices.items())
+            record.choices = choice_maps.setdefault(key, record.choices)
+        except TypeError:
+            # Unhashable choice values are not shared
+            pass
+
+
+class QuestionRegistry:
+    """Ordered collection of question records
+
+    Choices dicts are interned, i.e. records with identical answer
+    options (e.g. all subquestions of an array or the same Likert scale
+    in different questions) share one dict object. Do not modify them
+    in place.
+    """
+
+    def __init__(
+        self,
+        records: Iterable[QuestionRecord],
+        fields: Optional[List[str]] = None,
+        index_name: Optional[str] = None,
+        dtypes: Optional[Dict[str, np.dtype]] = None,
+        choice_maps: Optional[Dict[tuple, dict]] = None,
+    ) -> None:
+        """Create a registry
+
+        Args:
+            records (Iterable[QuestionRecord]): Records in the table order
+            fields (list[str], optional): Order of table columns. By default,
+              fields are ordered by their first appearance in the records.
+            index_name (str, optional): Name of the table index
+            dtypes (dict, optional): dtypes of the table columns to restore
+              in `to_frame`
+            choice_maps (dict, optional): Already interned choices dicts
+        """
+        self._records: List[QuestionRecord] = []
+        self._by_name: Dict[str, QuestionRecord] = {}
+        self._choice_maps = dict(choice_maps or {})
+        self.fields = list(fields or [])
+        self.index_name = index_name
+        self.dtypes = dtypes or {}
+        self._add(records)
+
+    def _add(self, records: Iterable[QuestionRecord]) -> None:
+        """Add records at the end"""
+        known_fields = set(self.fields)
+        for record in records:
+            self._records.append(record)
+            self._by_name.setdefault(record.name, record)
+            _intern_choices(record, self._choice_maps)
+            for field in record.to_dict():
+                if field not in known_fields:
+                    self.fields.append(field)
+                    known_fields.add(field)
+
+    @classmethod
+    def from_columns(cls, columns: List[dict]) -> "QuestionRegistry":
+        """Create a registry from parsed structure columns
+
+        Args:
+            columns (list[dict]): Data columns as returned in "questions" of
+              `read_lime_questionnaire_structure`
+
+        Returns:
+            QuestionRegistry: registry with "is_contingent" field set
+        """
+        records = []
+        # Order fields by first appearance like `pandas.DataFrame` does
+        fields = {}
+        for column in columns:
+            column = dict(column)
+            name = column.pop("name")
+            fields.update(dict.fromkeys(column))
+            column["is_contingent"] = pd.notnull(column.get("contingent_of_name"))
+            records.append(QuestionRecord(name, **column))
+        return cls(records, fields=[*fields, "is_contingent"], index_name="name")
+
+    @classmethod
+    def from_frame(cls, questions: pd.DataFrame) -> "QuestionRegistry":
+        """Create a registry from a questions table
+
+        Args:
+            questions (pd.DataFrame): Questions table like `LimeSurvey.questions`
+
+        Returns:
+            QuestionRegistry: registry with all table cells set
+        """
+        fields = questions.columns.to_list()
+        values = [questions[field].to_list() for field in fields]
+        records = [
+            QuestionRecord(name, **dict(zip(fields, row)))
+            for name, *row in zip(questions.index.to_list(), *values)
+        ]
+        return cls(
+            records,
+            fields=fields,
+            index_name=questions.index.name,
+            dtypes=questions.dtypes.to_dict(),
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """Get a questions table, one row per record"""
+        questions = pd.DataFrame(
+            [record.to_dict() for record in self._records],
+            index=pd.Index(self.names, name=self.index_name),
+            columns=self.fields,
+        )
+        # Restore object columns that would be inferred as numeric
+        object_columns = {
+            field: object
+            for field, dtype in self.dtypes.items()
+            if dtype == object and questions[field].dtype != object
+        }
+        if object_columns:
+            questions = questions.astype(object_columns)
+        return questions
+
+    def extended(self, records: Iterable[QuestionRecord]) -> "QuestionRegistry":
+        """Get a new registry with records added at the end
+
+        The registry itself is not modified, as it may be shared between
+        copies of a survey.
+        """
+        registry = QuestionRegistry(
+            [],
+            fields=self.fields,
+            # Like pandas.concat with an unnamed index
+            index_name=None,
+            dtypes=self.dtypes,
+            choice_maps=self._choice_maps,
+        )
+        registry._records = list(self._records)
+        registry._by_name = dict(self._by_name)
+        registry._add(records)
+        return registry
+
+    @property
+    def names(self) -> List[str]:
+        """Column names in the table order"""
+        return [record.name for record in self._records]
+
+    def get(self, name: str) -> Optional[QuestionRecord]:
+        """Get a record by column name, or None if there is no such column"""
+        return self._by_name.get(name)
+
+    def __getitem__(self, position: int) -> QuestionRecord:
+        return self._records[position]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def __iter__(self) -> Iterator[QuestionRecord]:
+        return iter(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
@@ -0,0 +1,476 @@
+"""SQLite storage of survey responses
+
+The module contains `SQLiteResponsesWriter`, which writes responses
+into an SQLite database in a store folder, as `ResponsesStoreWriter`
+writes Feather files, and `SQLiteColumnLoader`, which loads columns
+of the database for lazy loading of responses.
+
+Unlike Feather stores, the database is never read as a whole. Row
+filters stay SQL conditions of the loader (see `SQLiteColumnLoader.filter`)
+and values are counted with `GROUP BY` in the database, so only loaded
+columns of selected rows and counts are held in memory. Single-choice
+columns are indexed, so filters on them do not scan the table.
+"""
+
+import copy
+import itertools
+import os
+import sqlite3
+import weakref
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from n2survey.lime.query import QueryNode, iter_comparisons, quote_identifier, to_sql
+from n2survey.lime.storage import (
+    _TABLES,
+    STORE_FORMAT_VERSION,
+    _remove_store,
+    _write_metadata_file,
+    read_responses_store_metadata,
+)
+
+__all__ = ["SQLiteColumnLoader", "SQLiteResponsesWriter"]
+
+SQLITE_DATABASE_FILE = "responses.sqlite"
+# Name of the column with the index of the responses
+_INDEX_COLUMN = "__index__"
+# Names of temporary tables of selected rows
+_temp_table_names = (f"selected_rows_{number}" for number in itertools.count())
+
+
+def _dtype_to_spec(dtype) -> object:
+    """Get a JSON representation of a dtype"""
+    if isinstance(dtype, pd.CategoricalDtype):
+        return {"categories": dtype.categories.tolist(), "ordered": dtype.ordered}
+    return str(dtype)
+
+
+def _spec_to_dtype(spec: object):
+    """Get a dtype from its JSON representation"""
+    if isinstance(spec, dict):
+        return pd.CategoricalDtype(spec["categories"], ordered=spec["ordered"])
+    return pd.api.types.pandas_dtype(spec)
+
+
+def _merge_dtypes(dtype, other):
+    """Get dtype of a column written in parts with different dtypes, as in
+    `_concat_frames`"""
+    if dtype == other:
+        return dtype
+    if isinstance(dtype, pd.CategoricalDtype) and isinstance(
+        other, pd.CategoricalDtype
+    ):
+        return pd.CategoricalDtype(
+            union_categoricals(
+                [pd.Categorical([], dtype=dtype), pd.Categorical([], dtype=other)],
+                sort_categories=True,
+            ).categories
+        )
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_bool_dtype(other):
+        return np.dtype(object)
+    return pd.concat([pd.Series([], dtype=dtype), pd.Series([], dtype=other)]).dtype
+
+
+def _to_sql_values(values: pd.Series) -> list:
+    """Convert values to Python objects SQLite can store, None for missing values"""
+    missing = values.isna().to_numpy()
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        values = values.astype(str)
+    values = values.to_numpy(dtype=object)
+    values[missing] = None
+    return values.tolist()
+
+
+def _from_sql_values(values: Sequence, dtype) -> object:
+    """Convert values read from SQLite to an array of a dtype"""
+    if isinstance(dtype, pd.CategoricalDtype):
+        return pd.Categorical(values, dtype=dtype)
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return pd.to_datetime(pd.Series(values, dtype=object)).astype(dtype).array
+    if dtype == object:
+        array = np.empty(len(values), dtype=object)
+        array[:] = values
+        # Missing strings are NaN in responses
+        array[array == None] = np.nan  # noqa: E711
+        return array
+    series = pd.Series(values, dtype=dtype)
+    if isinstance(dtype, pd.api.extensions.ExtensionDtype):
+        return series.array
+    return series.to_numpy()
+
+
+class SQLiteResponsesWriter:
+    """Writer of responses stores with an SQLite database
+
+    Usage:
+        with SQLiteResponsesWriter("store", indexed_columns=["A6"]) as writer:
+            for responses, system_info in chunks:
+                writer.write(responses, system_info)
+            writer.metadata["org"] = "MPS"
+
+    Attributes:
+        store_dir (str): Path to the store folder
+        indexed_columns (list): Names of responses columns indexed in the
+          database, e.g. of single-choice questions
+        metadata (dict): Metadata written to the store on close
+        rows (int): Number of written responses
+    """
+
+    def __init__(self, store_dir: str, indexed_columns: Iterable[str] = ()) -> None:
+        """Prepare a store folder, removing a previously written store
+
+        Args:
+            store_dir (str): Path to the store folder, created if missing
+            indexed_columns (Iterable[str], optional): Names of responses
+              columns to index. Defaults to no columns.
+        """
+        self.store_dir = store_dir
+        self.indexed_columns = list(indexed_columns)
+        self.metadata = {}
+        self.rows = 0
+        # Table -> index name and dtypes of the index and the columns
+        self._index_names: Dict[str, Optional[str]] = {}
+        self._dtypes: Dict[str, dict] = {}
+
+        os.makedirs(store_dir, exist_ok=True)
+        _remove_store(store_dir)
+        database_path = os.path.join(store_dir, SQLITE_DATABASE_FILE)
+        # A database of an interrupted write has no metadata file
+        if os.path.isfile(database_path):
+            os.remove(database_path)
+        self._connection = sqlite3.connect(database_path)
+
+    def write(self, responses: pd.DataFrame, system_info: pd.DataFrame) -> None:
+        """Write a part of responses
+
+        Args:
+            responses (pd.DataFrame): Responses to survey questions
+            system_info (pd.DataFrame): LimeSurvey system info of the responses
+        """
+        for table, frame in zip(_TABLES, (responses, system_info)):
+            self._write_table(table, frame)
+        self.rows += len(responses)
+
+    def _write_table(self, table: str, frame: pd.DataFrame) -> None:
+        """Insert rows of a part into a table, creating it for the first part"""
+        dtypes = {_INDEX_COLUMN: frame.index.dtype, **frame.dtypes.to_dict()}
+        if table not in self._dtypes:
+            # Columns without a type keep values as inserted
+            columns = ", ".join(quote_identifier(column) for column in dtypes)
+            self._connection.execute(
+                f"CREATE TABLE {quote_identifier(table)} ({columns})"
+            )
+            self._index_names[table] = frame.index.name
+            self._dtypes[table] = dtypes
+        elif list(dtypes) != list(self._dtypes[table]):
+            raise ValueError(f"Parts of table '{table}' have different columns")
+        else:
+            self._dtypes[table] = {
+                column: _merge_dtypes(dtype, dtypes[column])
+                for column, dtype in self._dtypes[table].items()
+            }
+
+        values = [_to_sql_values(frame.index.to_series())] + [
+            _to_sql_values(frame.iloc[:, position])
+            for position in range(frame.shape[1])
+        ]
+        placeholders = ", ".join("?" * len(values))
+        self._connection.executemany(
+            f"INSERT INTO {quote_identifier(table)} VALUES ({placeholders})",
+            zip(*values),
+        )
+
+    def close(self) -> None:
+        """Finish the store by indexing columns and writing its metadata file"""
+        for column in self.indexed_columns:
+            if column in self._dtypes.get("responses", {}):
+                self._connection.execute(
+                    f"CREATE INDEX {quote_identifier('responses.' + column)} "
+                    f"ON responses ({quote_identifier(column)})"
+                )
+        self._connection.commit()
+        self._connection.close()
+
+        metadata = {
+            **self.metadata,
+            "format_version": STORE_FORMAT_VERSION,
+            "backend": "sqlite",
+            "database": SQLITE_DATABASE_FILE,
+            "parts": [],
+            "rows": self.rows,
+            "tables": {
+                table: {
+                    "index_name": self._index_names[table],
+                    "dtypes": {
+                        column: _dtype_to_spec(dtype)
+                        for column, dtype in dtypes.items()
+                    },
+                }
+                for table, dtypes in self._dtypes.items()
+            },
+        }
+        _write_metadata_file(self.store_dir, metadata)
+
+    def __enter__(self) -> "SQLiteResponsesWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+
+
+def _drop_temp_table(connection: sqlite3.Connection, name: str) -> None:
+    """Drop a temporary table of selected rows if the connection is open"""
+    try:
+        connection.execute(f"DROP TABLE IF EXISTS temp.{name}")
+    except sqlite3.ProgrammingError:
+        pass
+
+
+class _TempTable:
+    """Temporary table of selected rows, dropped with the last loader using it"""
+
+    __slots__ = ("name", "__weakref__")
+
+    def __init__(self, connection: sqlite3.Connection, rowids: np.ndarray) -> None:
+        self.name = next(_temp_table_names)
+        connection.execute(f"CREATE TEMP TABLE {self.name} (row INTEGER PRIMARY KEY)")
+        connection.executemany(
+            f"INSERT INTO temp.{self.name} VALUES (?)", ((int(row),) for row in rowids)
+        )
+        weakref.finalize(self, _drop_temp_table, connection, self.name)
+
+
+class _Database:
+    """Connection to a store database, closed with the last loader using it"""
+
+    __slots__ = ("connection", "__weakref__")
+
+    def __init__(self, database_path: str) -> None:
+        self.connection = sqlite3.connect(database_path)
+        weakref.finalize(self, self.connection.close)
+
+
+class SQLiteColumnLoader:
+    """Loader of columns of selected rows of an SQLite responses store
+
+    A loader selects all rows of a table or, after `filter` and `take`,
+    rows matching SQL conditions. Conditions are evaluated by SQLite
+    whenever columns are loaded or values counted, rows are in the
+    order they were written in. Loaders of a store share one connection,
+    which is closed when the last of them is dropped.
+
+    Attributes:
+        columns (pd.Index): Names of all columns of the table
+        dtypes (dict): Column name -> dtype of the column in responses
+        table (str): "responses" or "system_info"
+    """
+
+    def __init__(self, store_dir: str, table: str = "responses") -> None:
+        """Open the database of a store
+
+        Args:
+            store_dir (str): Path to the store folder
+            table (str, optional): "responses" or "system_info".
+              Defaults to "responses".
+
+        Raises:
+            ValueError: The store has no SQLite database
+        """
+        metadata = read_responses_store_metadata(store_dir)
+        if metadata.get("backend") != "sqlite":
+            raise ValueError(f"Responses store in '{store_dir}' has no SQLite database")
+        # Loaders of the store keep the database open, see `_Database`
+        self._database = _Database(os.path.join(store_dir, metadata["database"]))
+        self._connection = self._database.connection
+        self.table = table
+        layout = metadata["tables"].get(table)
+        # A store without written parts has no tables
+        self._has_table = layout is not None
+        layout = layout or {"index_name": None, "dtypes": {_INDEX_COLUMN: "int64"}}
+        self._index_name = layout["index_name"]
+        dtypes = {
+            column: _spec_to_dtype(spec) for column, spec in layout["dtypes"].items()
+        }
+        self._index_dtype = dtypes.pop(_INDEX_COLUMN)
+        self.dtypes = dtypes
+        self.columns = pd.Index(list(dtypes))
+        # Pairs of (condition, parameters) selecting rows
+        self._conditions: Tuple[Tuple[str, tuple], ...] = ()
+        # Temporary tables the conditions refer to, dropped with the loaders
+        self._temp_tables: tuple = ()
+
+    def _where(self) -> Tuple[str, list]:
+        """Get the WHERE clause of selected rows and its parameters"""
+        if not self._conditions:
+            return "", []
+        clause = " AND ".join(condition for condition, _ in self._conditions)
+        return f" WHERE {clause}", [
+            param for _, params in self._conditions for param in params
+        ]
+
+    def _execute(self, select: str, suffix: str = "", params: Sequence = ()) -> list:
+        """Select from the selected rows of the table and fetch the results"""
+        where, where_params = self._where()
+        return self._connection.execute(
+            f"SELECT {select} FROM {quote_identifier(self.table)}{where}{suffix}",
+            [*params, *where_params],
+        ).fetchall()
+
+    def translate(self, node: QueryNode) -> Optional[Tuple[str, list]]:
+        """Translate a parsed query into an SQL condition on the table
+
+        Ordering comparisons are translated for numeric columns only, as
+        categories are ordered by their positions and not by their values.
+        Comparisons of datetimes are not translated. Missing values of
+        nullable dtypes propagate as `pd.NA`, see `to_sql`.
+
+        Args:
+            node (QueryNode): Parsed query, see `parse_query`
+
+        Returns:
+            Optional[tuple[str, list]]: Pair of (condition, parameters),
+              None if SQLite could select other rows than pandas
+        """
+        na_columns = set()
+        for comparison in iter_comparisons(node):
+            dtype = self.dtypes.get(comparison.column)
+            if dtype is None or pd.api.types.is_datetime64_any_dtype(dtype):
+                return None
+            if getattr(dtype, "na_value", None) is pd.NA:
+                na_columns.add(comparison.column)
+            if comparison.op in ("<", "<=", ">", ">="):
+                value = comparison.value
+                if (
+                    isinstance(dtype, pd.CategoricalDtype)
+                    or not pd.api.types.is_numeric_dtype(dtype)
+                    or isinstance(value, bool)
+                    or not isinstance(value, (int, float))
+                ):
+                    return None
+        return to_sql(node, na_columns)
+
+    def filter(self, condition: str, params: Sequence = ()) -> "SQLiteColumnLoader":
+        """Get a loader of selected rows matching an SQL condition
+
+        Args:
+            condition (str): SQL condition on columns of the table,
+              e.g. from `translate`
+            params (Sequence, optional): Parameters of "?" placeholders in
+              the condition. Defaults to no parameters.
+
+        Returns:
+            SQLiteColumnLoader: Loader of the matching rows
+        """
+        loader = copy.copy(self)
+        loader._conditions = (*self._conditions, (f"({condition})", tuple(params)))
+        return loader
+
+    def mask(self, condition: str, params: Sequence = ()) -> np.ndarray:
+        """Get selected rows matching an SQL condition
+
+        Args:
+            condition (str): SQL condition on columns of the table
+            params (Sequence, optional): Parameters of "?" placeholders in
+              the condition. Defaults to no parameters.
+
+        Returns:
+            np.ndarray: Boolean mask of selected rows
+        """
+        rows = self._execute(f"IFNULL({condition}, 0)", " ORDER BY rowid", params)
+        return np.array([row[0] for row in rows], dtype=bool)
+
+    def take(self, positions: Iterable[int]) -> "SQLiteColumnLoader":
+        """Get a loader of selected rows at given positions
+
+        Args:
+            positions (Iterable[int]): Increasing positions of rows among
+              the selected rows
+
+        Raises:
+            ValueError: Positions are not increasing
+
+        Returns:
+            SQLiteColumnLoader: Loader of the rows
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        if (np.diff(positions) <= 0).any():
+            raise ValueError("Positions of rows must be increasing")
+        rowids = np.array(
+            [row[0] for row in self._execute("rowid", " ORDER BY rowid")],
+            dtype=np.int64,
+        )[positions]
+        temp_table = _TempTable(self._connection, rowids)
+        loader = self.filter(f"rowid IN temp.{temp_table.name}")
+        # Loaders filtered from this one need the table as well
+        loader._temp_tables = (*self._temp_tables, temp_table)
+        return loader
+
+    def load(self, columns: Iterable[str]) -> pd.DataFrame:
+        """Read columns of the selected rows
+
+        Args:
+            columns (Iterable[str]): Names of columns to read, can be empty
+              to get the index only
+
+        Returns:
+            pd.DataFrame: Responses of the columns
+        """
+        if not self._has_table:
+            return pd.DataFrame()
+        columns = list(columns)
+        rows = self._execute(
+            ", ".join(quote_identifier(column) for column in [_INDEX_COLUMN, *columns]),
+            " ORDER BY rowid",
+        )
+        values = list(zip(*rows)) if rows else [()] * (len(columns) + 1)
+        index = pd.Index(
+            _from_sql_values(values[0], self._index_dtype), name=self._index_name
+        )
+        return pd.DataFrame(
+            {
+                column: _from_sql_values(column_values, self.dtypes[column])
+                for column, column_values in zip(columns, values[1:])
+            },
+            index=index,
+            columns=columns,
+        )
+
+    def count_rows(self) -> int:
+        """Count the selected rows"""
+        if not self._has_table:
+            return 0
+        return self._execute("COUNT(*)")[0][0]
+
+    def count_values(self, column: str) -> List[Tuple[object, int]]:
+        """Count values of a column in the selected rows
+
+        Args:
+            column (str): Column name
+
+        Returns:
+            list[tuple[object, int]]: Pairs of (value, count), the value
+              of missing values is None
+        """
+        return self._execute(
+            f"{quote_identifier(column)}, COUNT(*)",
+            f" GROUP BY {quote_identifier(column)}",
+        )
+
+    def count_non_null(self, columns: Iterable[str]) -> pd.Series:
+        """Count non-missing values of columns in the selected rows
+
+        Args:
+            columns (Iterable[str]): Column names
+
+        Returns:
+            pd.Series: Number of values per column
+        """
+        columns = list(columns)
+        counts = self._execute(
+            ", ".join(f"COUNT({quote_identifier(column)})" for column in columns)
+        )[0]
+        return pd.Series(counts, index=columns, dtype="int64")
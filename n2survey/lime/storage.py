@@ -0,0 +1,550 @@
+"""On-disk columnar storage of survey responses
+
+The module contains `ResponsesStoreWriter` which writes responses in
+parts, e.g. one per chunk of a large CSV export, as Feather files,
+and `read_responses_store` which reads all parts back into single
+DataFrames.
+
+A store is a folder with a "store.json" metadata file and the Feather
+files of the parts. The metadata file is written last, so a store
+with an interrupted write cannot be read.
+
+Feather files are Arrow IPC files. Uncompressed stores can be memory
+mapped (see `read_responses_tables`), so processes reading the same
+store share one copy of the data in the OS page cache.
+
+`FrameColumnLoader` keeps columns moved out of responses, e.g. free
+texts, in memory as an Arrow table and loads them like a store.
+`ViewColumnLoader` loads columns of selected rows of other responses,
+e.g. of filtered surveys.
+"""
+
+import json
+import os
+from typing import TYPE_CHECKING, Callable, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from n2survey.lime.arrow import _import_pyarrow, _restore_missing_strings
+
+if TYPE_CHECKING:
+    import pyarrow
+
+__all__ = [
+    "FrameColumnLoader",
+    "ResponsesStoreWriter",
+    "StoreColumnLoader",
+    "ViewColumnLoader",
+    "read_responses_store",
+    "read_responses_store_metadata",
+    "read_responses_tables",
+]
+
+# Increase when the layout of stores changes
+STORE_FORMAT_VERSION = 1
+
+STORE_METADATA_FILE = "store.json"
+_TABLES = ("responses", "system_info")
+
+
+def _get_part_path(store_dir: str, part: str, table: str) -> str:
+    """Get path of a Feather file of a store part"""
+    return os.path.join(store_dir, f"{part}.{table}.feather")
+
+
+def _concat_frames(frames: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate DataFrames read in parts
+
+    Unlike `pd.concat`, categorical columns stay categorical if parts
+    have different categories. Categories are then merged and sorted,
+    as `pd.read_csv` infers them. Columns that are boolean in some parts
+    and numeric in others (i.e. parts without values) become objects,
+    as if the whole file was read at once.
+
+    Args:
+        frames (Iterable[pd.DataFrame]): Parts to concatenate
+
+    Returns:
+        pd.DataFrame: Concatenated DataFrame
+    """
+    frames = list(frames)
+    if len(frames) == 1:
+        return frames[0]
+
+    dtypes = {}
+    for column in frames[0].columns:
+        column_dtypes = [frame[column].dtype for frame in frames if column in frame]
+        if all(dtype == column_dtypes[0] for dtype in column_dtypes):
+            continue
+        if all(isinstance(dtype, pd.CategoricalDtype) for dtype in column_dtypes):
+            dtypes[column] = pd.CategoricalDtype(
+                union_categoricals(
+                    [frame[column] for frame in frames if column in frame],
+                    sort_categories=True,
+                ).categories
+            )
+        elif any(pd.api.types.is_bool_dtype(dtype) for dtype in column_dtypes):
+            dtypes[column] = object
+
+    if dtypes:
+        frames = [
+            frame.astype({key: value for key, value in dtypes.items() if key in frame})
+            for frame in frames
+        ]
+    return pd.concat(frames)
+
+
+class ResponsesStoreWriter:
+    """Writer of responses stores
+
+    Usage:
+        with ResponsesStoreWriter("store") as writer:
+            for responses, system_info in chunks:
+                writer.write(responses, system_info)
+            writer.metadata["org"] = "MPS"
+
+    Attributes:
+        store_dir (str): Path to the store folder
+        compression (Optional[str]): Compression of Feather files
+        metadata (dict): Metadata written to the store on close
+        rows (int): Number of written responses
+    """
+
+    def __init__(self, store_dir: str, compression: Optional[str] = "zstd") -> None:
+        """Prepare a store folder, removing a previously written store
+
+        Args:
+            store_dir (str): Path to the store folder, created if missing
+            compression (Optional[str], optional): Compression of Feather files,
+              "zstd", "lz4" or None. Uncompressed files are larger but can be
+              memory mapped without copying. Defaults to "zstd".
+        """
+        self._pa = _import_pyarrow()
+        self.store_dir = store_dir
+        self.compression = compression
+        self.metadata = {}
+        self.rows = 0
+        self._parts: List[str] = []
+
+        os.makedirs(store_dir, exist_ok=True)
+        _remove_store(store_dir)
+
+    def write(self, responses: pd.DataFrame, system_info: pd.DataFrame) -> None:
+        """Write a part of responses
+
+        Args:
+            responses (pd.DataFrame): Responses to survey questions
+            system_info (pd.DataFrame): LimeSurvey system info of the responses
+        """
+        part = f"part-{len(self._parts):05d}"
+        for table, frame in zip(_TABLES, (responses, system_info)):
+            self._pa.feather.write_feather(
+                frame,
+                _get_part_path(self.store_dir, part, table),
+                compression=self.compression or "uncompressed",
+            )
+        self._parts.append(part)
+        self.rows += len(responses)
+
+    def close(self) -> None:
+        """Finish the store by writing its metadata file"""
+        metadata = {
+            **self.metadata,
+            "format_version": STORE_FORMAT_VERSION,
+            "compression": self.compression,
+            "parts": self._parts,
+            "rows": self.rows,
+        }
+        _write_metadata_file(self.store_dir, metadata)
+
+    def __enter__(self) -> "ResponsesStoreWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+
+
+def _remove_store(store_dir: str) -> None:
+    """Remove the metadata file and the data files of a store of any backend"""
+    old_metadata = _read_metadata_file(store_dir)
+    if old_metadata is None:
+        return
+    os.remove(os.path.join(store_dir, STORE_METADATA_FILE))
+    paths = [
+        _get_part_path(store_dir, part, table)
+        for part in old_metadata.get("parts", [])
+        for table in _TABLES
+    ]
+    if "database" in old_metadata:
+        paths.append(os.path.join(store_dir, old_metadata["database"]))
+    for path in paths:
+        if os.path.isfile(path):
+            os.remove(path)
+
+
+def _write_metadata_file(store_dir: str, metadata: dict) -> None:
+    """Write the metadata file of a store, which finishes the store"""
+    with open(os.path.join(store_dir, STORE_METADATA_FILE), "w") as fp:
+        json.dump(metadata, fp, indent=2)
+
+
+def _read_metadata_file(store_dir: str) -> Optional[dict]:
+    """Read the metadata file of a store of any format, None if missing"""
+    metadata_path = os.path.join(store_dir, STORE_METADATA_FILE)
+    if not os.path.isfile(metadata_path):
+        return None
+    with open(metadata_path) as fp:
+        return json.load(fp)
+
+
+def read_responses_store_metadata(
+    store_dir: str, missing_ok: bool = False
+) -> Optional[dict]:
+    """Read the metadata of a responses store
+
+    Args:
+        store_dir (str): Path to the store folder
+        missing_ok (bool, optional): Whether to return None instead of
+          raising for a folder without a store. Defaults to False.
+
+    Raises:
+        ValueError: The folder has no store or the store format is not supported
+
+    Returns:
+        Optional[dict]: Store metadata with "parts", "rows" and values
+          added by the writer, e.g. "org"
+    """
+    metadata = _read_metadata_file(store_dir)
+    if metadata is None:
+        if missing_ok:
+            return None
+        raise ValueError(f"No responses store found in '{store_dir}'")
+    if metadata.get("format_version") != STORE_FORMAT_VERSION:
+        raise ValueError(
+            f"Responses store format {metadata.get('format_version')} is not supported"
+        )
+    return metadata
+
+
+def _read_feather_store_metadata(store_dir: str) -> dict:
+    """Read the metadata of a store of Feather files"""
+    metadata = read_responses_store_metadata(store_dir)
+    if metadata.get("backend", "feather") != "feather":
+        raise ValueError(
+            f"Responses store in '{store_dir}' has the {metadata['backend']} backend"
+        )
+    return metadata
+
+
+def read_responses_tables(
+    store_dir: str, memory_map: bool = False
+) -> Tuple["pyarrow.Table", "pyarrow.Table"]:
+    """Read all parts of a responses store as Arrow tables
+
+    With `memory_map`, columns of uncompressed stores point directly
+    into the mapped files and are not copied into memory. Parts are
+    concatenated without copying as well.
+
+    Args:
+        store_dir (str): Path to the store folder
+        memory_map (bool, optional): Whether to memory map the files.
+          Defaults to False.
+
+    Returns:
+        tuple[pyarrow.Table, pyarrow.Table]: Pair of (responses, system_info)
+    """
+    pa = _import_pyarrow()
+    metadata = _read_feather_store_metadata(store_dir)
+    # Parts may lack columns without values, they are promoted to nulls
+    if int(pa.__version__.split(".")[0]) >= 14:
+        promote = {"promote_options": "default"}
+    else:
+        promote = {"promote": True}
+    return tuple(
+        pa.concat_tables(
+            [
+                pa.feather.read_table(
+                    _get_part_path(store_dir, part, table), memory_map=memory_map
+                )
+                for part in metadata["parts"]
+            ],
+            **promote,
+        )
+        for table in _TABLES
+    )
+
+
+def _table_to_pandas(table: "pyarrow.Table", memory_map: bool) -> pd.DataFrame:
+    """Convert a part read from a store to pandas"""
+    # Without consolidation, columns without nulls can stay views of
+    # the mapped file
+    return _restore_missing_strings(table.to_pandas(split_blocks=memory_map))
+
+
+def read_responses_store(
+    store_dir: str, memory_map: bool = False
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Read all parts of a responses store
+
+    Args:
+        store_dir (str): Path to the store folder
+        memory_map (bool, optional): Whether to memory map the files, see
+          `read_responses_tables`. Numeric columns without missing values
+          of uncompressed stores are then not copied. Defaults to False.
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: Pair of (responses, system_info)
+    """
+    pa = _import_pyarrow()
+    metadata = _read_feather_store_metadata(store_dir)
+    if not metadata["parts"]:
+        return pd.DataFrame(), pd.DataFrame()
+
+    return tuple(
+        _concat_frames(
+            _table_to_pandas(
+                pa.feather.read_table(
+                    _get_part_path(store_dir, part, table), memory_map=memory_map
+                ),
+                memory_map,
+            )
+            for part in metadata["parts"]
+        )
+        for table in _TABLES
+    )
+
+
+class StoreColumnLoader:
+    """Loader of selected columns of a responses store table
+
+    Only the schema of the table is read on creation. Columns are read
+    from all parts on request, e.g. for lazy loading of responses.
+
+    Attributes:
+        columns (pd.Index): Names of all columns of the table
+        memory_map (bool): Whether the store files are memory mapped
+    """
+
+    def __init__(
+        self, store_dir: str, table: str = "responses", memory_map: bool = False
+    ) -> None:
+        """Read the schema of a store table
+
+        Args:
+            store_dir (str): Path to the store folder
+            table (str, optional): "responses" or "system_info".
+              Defaults to "responses".
+            memory_map (bool, optional): Whether to memory map the files.
+              Defaults to False.
+        """
+        self._pa = _import_pyarrow()
+        metadata = _read_feather_store_metadata(store_dir)
+        self._paths = [
+            _get_part_path(store_dir, part, table) for part in metadata["parts"]
+        ]
+        self.memory_map = memory_map
+
+        self._index_columns = []
+        self.columns = pd.Index([])
+        if self._paths:
+            with self._pa.memory_map(self._paths[0]) as source:
+                schema = self._pa.ipc.open_file(source).schema
+            # A RangeIndex is stored as a description, not as a column
+            self._index_columns = [
+                column
+                for column in schema.pandas_metadata["index_columns"]
+                if isinstance(column, str)
+            ]
+            self.columns = pd.Index(
+                [name for name in schema.names if name not in self._index_columns]
+            )
+
+    def load(self, columns: Iterable[str]) -> pd.DataFrame:
+        """Read columns from all parts
+
+        Args:
+            columns (Iterable[str]): Names of columns to read, can be empty
+              to get the index only
+
+        Returns:
+            pd.DataFrame: Responses of the columns
+        """
+        if not self._paths:
+            return pd.DataFrame()
+        columns = [*self._index_columns, *columns]
+        return _concat_frames(
+            _table_to_pandas(
+                self._pa.feather.read_table(
+                    path, columns=columns, memory_map=self.memory_map
+                ),
+                self.memory_map,
+            )
+            for path in self._paths
+        )
+
+
+class FrameColumnLoader:
+    """Loader of columns moved out of a DataFrame into an Arrow table
+
+    Arrow keeps strings in contiguous buffers, which needs less memory
+    than Python string objects of an object column. The loader can
+    replace a `StoreColumnLoader` for lazy loading of responses.
+
+    Attributes:
+        columns (pd.Index): Names of all columns of the DataFrame, including
+          columns kept in it
+    """
+
+    def __init__(self, frame: pd.DataFrame, columns: Iterable[str]) -> None:
+        """Move columns to an Arrow table
+
+        Args:
+            frame (pd.DataFrame): Columns to keep in the table
+            columns (Iterable[str]): Names of all columns of the DataFrame
+              in their order
+        """
+        pa = _import_pyarrow()
+        self._table = pa.Table.from_pandas(frame, preserve_index=False)
+        self._index = frame.index
+        self.columns = pd.Index(columns)
+
+    @property
+    def moved_columns(self) -> list:
+        """Names of columns kept in the Arrow table"""
+        return self._table.column_names
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the Arrow table in bytes"""
+        return self._table.nbytes
+
+    def memory_usage(self) -> pd.Series:
+        """Get size of each column of the Arrow table in bytes"""
+        return pd.Series(
+            [column.nbytes for column in self._table.columns],
+            index=self._table.column_names,
+            dtype="int64",
+        )
+
+    def load(self, columns: Iterable[str]) -> pd.DataFrame:
+        """Convert columns of the table to pandas
+
+        Args:
+            columns (Iterable[str]): Names of columns to load, columns not
+              in the table are skipped
+
+        Returns:
+            pd.DataFrame: Columns with the index of the original DataFrame
+        """
+        columns = [column for column in columns if column in self._table.column_names]
+        frame = _restore_missing_strings(self._table.select(columns).to_pandas())
+        frame.index = self._index
+        return frame
+
+
+class ViewColumnLoader:
+    """Loader of columns of selected rows and columns of other responses
+
+    A view holds positions of rows and names of columns only. Columns are
+    copied from the viewed DataFrame, or loaded by its loader, on request,
+    e.g. for lazy loading of filtered responses. Views of views select
+    rows of the viewed DataFrame directly and share the way of loading
+    columns, so columns of a survey loaded for one view are not loaded
+    again for the others (see `LimeSurvey._get_view`).
+
+    Attributes:
+        columns (pd.Index): Names of the selected columns
+        positions (Optional[np.ndarray]): Positions of the selected rows,
+          None for all rows
+    """
+
+    def __init__(
+        self,
+        frame: pd.DataFrame,
+        positions: Optional[np.ndarray] = None,
+        loader=None,
+        columns: Optional[Iterable[str]] = None,
+        load: Optional[Callable[[List[str]], pd.DataFrame]] = None,
+    ) -> None:
+        """Create a view of responses
+
+        Args:
+            frame (pd.DataFrame): Viewed responses, e.g. loaded columns in
+              lazy mode
+            positions (Optional[np.ndarray], optional): Positions of rows.
+              Defaults to None, i.e. all rows.
+            loader (optional): Loader of columns not in `frame` with the rows
+              of `frame`, e.g. `StoreColumnLoader`. Defaults to None.
+            columns (Optional[Iterable[str]], optional): Names of columns.
+              Defaults to None, i.e. all columns of `loader` and `frame`.
+            load (Optional[Callable], optional): Function loading columns of
+              `loader` with the rows of `frame`, e.g. into the viewed survey.
+              Defaults to None, i.e. `loader.load`.
+        """
+        self._frame = frame
+        self._loader = loader
+        self._load = load if load is not None or loader is None else loader.load
+        self.positions = positions
+        if columns is None:
+            columns = frame.columns
+            if loader is not None:
+                columns = loader.columns.append(
+                    frame.columns.difference(loader.columns, sort=False)
+                )
+        self.columns = pd.Index(columns)
+
+    def take(self, positions: np.ndarray) -> "ViewColumnLoader":
+        """Get a view of rows at given positions among the selected rows
+
+        Args:
+            positions (np.ndarray): Positions of rows
+
+        Returns:
+            ViewColumnLoader: View of the rows
+        """
+        if self.positions is not None:
+            positions = self.positions[positions]
+        return ViewColumnLoader(
+            self._frame, positions, self._loader, self.columns, self._load
+        )
+
+    def select(self, columns: Iterable[str]) -> "ViewColumnLoader":
+        """Get a view of given columns of the selected rows
+
+        Args:
+            columns (Iterable[str]): Names of columns
+
+        Returns:
+            ViewColumnLoader: View of the columns
+        """
+        return ViewColumnLoader(
+            self._frame, self.positions, self._loader, columns, self._load
+        )
+
+    def load(self, columns: Iterable[str]) -> pd.DataFrame:
+        """Copy columns of the selected rows
+
+        Args:
+            columns (Iterable[str]): Names of columns to load, columns not
+              selected are skipped
+
+        Returns:
+            pd.DataFrame: Responses of the columns
+        """
+        columns = [column for column in columns if column in self.columns]
+        rows = slice(None) if self.positions is None else self.positions
+        frame_columns = [column for column in columns if column in self._frame]
+        frame = self._frame.iloc[
+            rows, self._frame.columns.get_indexer_for(frame_columns)
+        ]
+        loader_columns = [column for column in columns if column not in self._frame]
+        if loader_columns:
+            frame = pd.concat(
+                [frame, self._load(loader_columns).iloc[rows]],
+                axis=1,
+                copy=False,
+            )
+        return frame
@@ -4,24 +4,88 @@ The module contains helper functions for parsing
 lime survey data such as *.xml structure files
 """
 
+import html
+import html.entities
+import itertools
 import os
 import re
-from typing import Dict, List, Optional, Tuple
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
 from warnings import warn
 
 from bs4 import BeautifulSoup
 from bs4.element import Tag
+from lxml import etree
 
 __all__ = [
     "read_lime_questionnaire_structure",
+    "STRUCTURE_PARSERS",
 ]
 
+STRUCTURE_PARSERS = ("lxml", "bs4")
+
 
 def _get_clean_string(tag: Tag) -> str:
     """Clear a text in XML from HTML tags and line breaks"""
+    return _clean_text(tag.text)
+
+
+# A well-formed HTML start or end tag, quoted attribute values may contain ">".
+# Tags with stray quotes or "<" are not matched, so they go to BeautifulSoup.
+_HTML_TAG_RE = re.compile(
+    r"""</?[a-zA-Z][^\s/>"'<]*"""
+    r"""(?:\s+[^\s/>"'<=]+(?:\s*=\s*(?:"[^"<]*"|'[^'<]*'|[^\s>"'<=`]+))?)*"""
+    r"""\s*/?>"""
+)
+# A complete character reference, i.e. "&amp;", "&#8211;", or "&#x27;"
+_HTML_ENTITY_RE = re.compile(r"&(?:[a-zA-Z][a-zA-Z0-9]*|#[0-9]+|#[xX][0-9a-fA-F]+);")
+# Markup that the fast path does not handle: comments, declarations,
+# processing instructions and raw text elements
+_HTML_SPECIAL_RE = re.compile(r"<[!?]|<(?:script|style)", re.IGNORECASE)
+
+
+def _html_to_text_bs4(text: str) -> str:
+    """Get text pieces of an HTML fragment joined by spaces with BeautifulSoup"""
+    return " ".join(BeautifulSoup(text, "html.parser").stripped_strings)
+
+
+def _html_to_text(text: str) -> str:
+    """Get text pieces of an HTML fragment joined by spaces
+
+    Gives the same result as `_html_to_text_bs4`, but strips tags and
+    character references with precompiled regular expressions. Fragments
+    that can not be handled this way (e.g. a stray "<", quotes or "<"
+    inside a tag, comments, or unknown entities) are passed to
+    BeautifulSoup.
+    """
+    if "<" in text:
+        if _HTML_SPECIAL_RE.search(text):
+            return _html_to_text_bs4(text)
+        pieces = _HTML_TAG_RE.split(text)
+        if any("<" in piece for piece in pieces):
+            # Malformed fragment
+            return _html_to_text_bs4(text)
+    else:
+        pieces = [text]
+
+    if "&" in text:
+        entities = _HTML_ENTITY_RE.findall(text)
+        if text.count("&") != len(entities) or not all(
+            entity.startswith("&#") or entity[1:] in html.entities.html5
+            for entity in entities
+        ):
+            return _html_to_text_bs4(text)
+        pieces = [html.unescape(piece) for piece in pieces]
+
+    return " ".join(piece.strip() for piece in pieces if piece and not piece.isspace())
+
+
+def _clean_text(text: str) -> str:
+    """Clear a text from HTML tags and line breaks"""
     # Remove HTML tags and line breaks
     clean_string = (
-        " ".join(BeautifulSoup(tag.text, "html.parser").stripped_strings)
+        _html_to_text(text)
         .replace("\n", " ")
         .replace("\t", " ")
         .replace("\xa0", " ")
@@ -284,6 +348,32 @@ def _parse_question(question: Tag) -> List[Dict]:
     # Get question responses
     responses = _parse_question_responses(question)
 
+    return _combine_question_columns(
+        question, question_label, question_description, subquestions, responses
+    )
+
+
+def _combine_question_columns(
+    question,
+    question_label: str,
+    question_description: str,
+    subquestions: List[Tuple[str, str]],
+    responses: List[Tuple[Dict, Optional[Dict]]],
+) -> List[Dict]:
+    """Combine parsed parts of a <question> section into data columns
+
+    Args:
+        question: <question> element (bs4 tag or lxml element), used
+          in error messages only
+        question_label (str): Parsed question title
+        question_description (str): Parsed question description
+        subquestions (list[tuple[str, str]]): Parsed subquestions
+        responses (list[tuple[dict, Optional[dict]]]): Parsed responses
+
+    Returns:
+        list[dict]: List of parsed response columns (see `_parse_question`)
+    """
+
     # Get question type
     question_type = _get_question_type(subquestions, responses)
 
@@ -431,19 +521,246 @@ def _parse_section(section: Tag) -> Dict:
     }
 
 
-def read_lime_questionnaire_structure(filepath: str) -> dict[str, list[dict]]:
-    """Read LimeSurvey XML structure file
+def _get_element_string(element: etree._Element) -> str:
+    """Clear a text of an lxml element from HTML tags and line breaks"""
+    return _clean_text("".join(element.itertext()))
+
+
+def _find_element(element: etree._Element, tag: str) -> Optional[etree._Element]:
+    """Find the first descendant element with a given tag (like `Tag.find`)"""
+    return next(element.iterdescendants(tag), None)
+
+
+def _parse_question_element(question: etree._Element) -> List[Dict]:
+    """Parse single <question> element with lxml
+
+    The lxml counterpart of `_parse_question`, see it for the details.
 
     Args:
-        filepath (str): Path to the XML structure file
+        question (etree._Element): lxml element of <question> section
 
     Returns:
-        dict[str, list[dict]]: A dictionary
-        {
-            "sections": [...] - list of sections (see _parse_section)
-            "questions": [...] - list of data columns (see _parse_question)
+        list[dict]: List of parsed response columns
+    """
+    # Get question label
+    text_sections = question.findall("text")
+    if len(text_sections) >= 1:
+        question_label = _get_element_string(text_sections[0])
+        if len(text_sections) > 1:
+            warn(
+                f"More than one 'text' section provided for question {_element_repr(question)}."
+                " Only the first one was used."
+            )
+    else:
+        raise AssertionError(
+            f"No question label for question {_element_repr(question)}"
+        )
+
+    # Get question description
+    question_description = ""
+    directive_sections = question.findall("directive")
+    if len(directive_sections) >= 1:
+        question_description = " ".join(
+            [
+                _get_element_string(description)
+                for description in directive_sections[0].iterdescendants("text")
+            ]
+        )
+        if len(directive_sections) > 1:
+            warn(
+                f"More than one 'directive' section provided for question {_element_repr(question)}."
+                " Only the first one was used."
+            )
+
+    # Get question subQuestions, if it has
+    subquestions = [
+        (
+            subquestion.attrib["varName"],
+            _get_element_string(_find_element(subquestion, "text")),
+        )
+        for subquestion in question.findall("subQuestion")
+    ]
+
+    # Get question responses
+    response_sections = question.findall("response")
+    if len(response_sections) == 0:
+        raise AssertionError(
+            f"Unexpected question format for question {_element_repr(question)}."
+            " There is no 'response' section."
+        )
+    responses = [_parse_response_element(response) for response in response_sections]
+
+    return _combine_question_columns(
+        question, question_label, question_description, subquestions, responses
+    )
+
+
+def _parse_response_element(
+    response: etree._Element,
+) -> Tuple[Dict, Optional[Dict]]:
+    """Parse single <response> element with lxml
+
+    The lxml counterpart of `_parse_single_question_response`, see it
+    for the details.
+    """
+    # Common response structure
+    parsed_response = {
+        "name": response.attrib["varName"],
+        "format": None,
+        "length": None,
+        "label": None,
+        "choices": None,
+    }
+    contingent_response = None
+
+    # Get first child node of <response> section
+    response_data = next(response.iterchildren(etree.Element), None)
+    response_type = None if response_data is None else response_data.tag
+
+    # Parse non-fixed question
+    if response_type == "free":
+        parsed_response.update(
+            format=_get_element_string(_find_element(response_data, "format")),
+            length=_get_element_string(_find_element(response_data, "length")),
+            label=_get_element_string(_find_element(response_data, "label")),
+        )
+    # Parse fixed question (i.e. with choises)
+    elif response_type == "fixed":
+        # Parse choices
+        choices = {
+            _get_element_string(_find_element(category, "value")): (
+                _get_element_string(_find_element(category, "label"))
+            )
+            for category in response_data.findall("category")
         }
+        parsed_response.update(choices=choices)
+
+        # Parse contingent question
+        contingent_questions = list(response_data.iterdescendants("contingentQuestion"))
+        if contingent_questions:
+            assert (
+                len(contingent_questions) == 1
+            ), f"Too many 'contingentQuestion's for response {_element_repr(response)}"
+            contingent_question = contingent_questions[0]
+
+            contingent_response = {
+                "name": contingent_question.attrib["varName"],
+                "text": _get_element_string(_find_element(contingent_question, "text")),
+                "length": _get_element_string(
+                    _find_element(contingent_question, "length")
+                ),
+                "format": _get_element_string(
+                    _find_element(contingent_question, "format")
+                ),
+                "contingent_of_name": parsed_response["name"],
+                "contingent_of_choice": _get_element_string(
+                    _find_element(contingent_question.getparent(), "value")
+                ),
+            }
+    else:
+        raise AssertionError(
+            f"Unexpected response format {_element_repr(response)}. Unknown response type."
+        )
+
+    return (parsed_response, contingent_response)
+
+
+def _parse_section_element(section: etree._Element) -> Dict:
+    """Parse questionnaire section with lxml
+
+    The lxml counterpart of `_parse_section`, see it for the details.
     """
+    # Get section ID
+    section_id = section.attrib.get("id", None)
+    if section_id is None:
+        raise AssertionError(
+            "Unexpected section structure."
+            f" No id attribute found for section {_element_repr(section)}"
+        )
+    else:
+        section_id = int(section_id)
+
+    # Parse <sectionInfo> tags
+    section_info = ""
+    section_title = None
+    for info in section.iterdescendants("sectionInfo"):
+        position = _get_element_string(_find_element(info, "position"))
+        if position == "title":
+            section_title = _get_element_string(
+                _find_element(_find_element(section, "sectionInfo"), "text")
+            )
+        elif position in ("before", "after"):
+            current_text = " ".join(
+                [
+                    _get_element_string(description)
+                    for description in info.iterdescendants("text")
+                ]
+            )
+            section_info = f"{section_info} {current_text}".strip()
+        else:
+            raise AssertionError(
+                "Unexpected section structure."
+                f" Unexpected sectionInfo position '{position}' for section {_element_repr(section)}"
+            )
+
+    if section_title is None:
+        raise AssertionError(
+            f"Unexpected section structure. No title found for section {_element_repr(section)}"
+        )
+
+    return {
+        "id": section_id,
+        "title": section_title,
+        "info": section_info,
+    }
+
+
+def _element_repr(element: etree._Element) -> str:
+    """Serialize lxml element for error messages"""
+    return etree.tostring(element, encoding="unicode")
+
+
+def _read_structure_lxml(filepath: str) -> dict[str, list[dict]]:
+    """Read LimeSurvey XML structure file with lxml streaming parser
+
+    Walks the file with `lxml.etree.iterparse`, so only the current
+    <section> is kept in memory. Each <question> is parsed as soon as
+    it is closed and then cleared.
+    """
+    result_sections = list()
+    result_questions = list()
+    # Parsed columns of the current section waiting for its section_id
+    section_questions = list()
+    for event, element in etree.iterparse(
+        filepath, events=("start", "end"), tag=("section", "question")
+    ):
+        if event == "start":
+            if element.tag == "section":
+                section_questions = list()
+            continue
+
+        if element.tag == "question":
+            # Get columns description for the question
+            section_questions += _parse_question_element(element)
+            element.clear(keep_tail=True)
+        else:
+            section_dict = _parse_section_element(element)
+            result_sections.append(section_dict)
+            # Add section_id to the columns descriptions
+            result_questions += [
+                {**column, "section_id": section_dict["id"]}
+                for column in section_questions
+            ]
+            # Drop the parsed section and everything before it
+            element.clear(keep_tail=True)
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+
+    return {"sections": result_sections, "questions": result_questions}
+
+
+def _read_structure_bs4(filepath: str) -> dict[str, list[dict]]:
+    """Read LimeSurvey XML structure file with BeautifulSoup"""
 
     # Read the structure file
     with open(filepath, "r", encoding="utf8") as fp:
@@ -469,3 +786,115 @@ def read_lime_questionnaire_structure(filepath: str) -> dict[str, list[dict]]:
             result_questions += question_columns_list
 
     return {"sections": result_sections, "questions": result_questions}
+
+
+def _iter_section_xml(filepath: str) -> Iterator[bytes]:
+    """Yield serialized <section> elements of an XML structure file in order"""
+    for _, element in etree.iterparse(filepath, tag="section"):
+        yield etree.tostring(element)
+        # Drop the section and everything before it
+        element.clear(keep_tail=True)
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+
+
+def _parse_section_xml(
+    section_xml: bytes, parser: str
+) -> Tuple[Dict, List[Dict], List[Tuple[str, type]]]:
+    """Parse a serialized <section> element with its questions
+
+    Runs in a worker process of `read_lime_questionnaire_structure`.
+
+    Args:
+        section_xml (bytes): Serialized <section> element
+        parser (str): "lxml" or "bs4", see `read_lime_questionnaire_structure`
+
+    Returns:
+        tuple[dict, list[dict], list[tuple[str, type]]]: Parsed section,
+          its data columns, and (message, category) of raised warnings
+    """
+    with warnings.catch_warnings(record=True) as caught_warnings:
+        warnings.simplefilter("always")
+        if parser == "lxml":
+            section = etree.fromstring(section_xml)
+            section_dict = _parse_section_element(section)
+            questions = [
+                column
+                for question in section.iter("question")
+                for column in _parse_question_element(question)
+            ]
+        else:
+            section = BeautifulSoup(section_xml, "xml").find("section")
+            section_dict = _parse_section(section)
+            questions = [
+                column
+                for question in section.find_all("question")
+                for column in _parse_question(question)
+            ]
+
+    questions = [{**column, "section_id": section_dict["id"]} for column in questions]
+    caught_warnings = [
+        (str(warning.message), warning.category) for warning in caught_warnings
+    ]
+    return section_dict, questions, caught_warnings
+
+
+def _read_structure_parallel(
+    filepath: str, parser: str, workers: int
+) -> dict[str, list[dict]]:
+    """Read LimeSurvey XML structure file parsing sections in a process pool"""
+    result_sections = list()
+    result_questions = list()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # `map` yields results in the order of sections in the document
+        for section_dict, questions, caught_warnings in executor.map(
+            _parse_section_xml,
+            _iter_section_xml(filepath),
+            itertools.repeat(parser),
+        ):
+            for message, category in caught_warnings:
+                warn(message, category)
+            result_sections.append(section_dict)
+            result_questions += questions
+
+    return {"sections": result_sections, "questions": result_questions}
+
+
+def read_lime_questionnaire_structure(
+    filepath: str, parser: str = "lxml", workers: Optional[int] = None
+) -> dict[str, list[dict]]:
+    """Read LimeSurvey XML structure file
+
+    Args:
+        filepath (str): Path to the XML structure file
+        parser (str, optional): "lxml" for the streaming `lxml.etree.iterparse`
+          based parser, or "bs4" for the BeautifulSoup one. Both give the
+          same result. Defaults to "lxml".
+        workers (int, optional): Number of processes to parse <section>
+          elements in parallel. The result is the same as of the serial
+          parsing. By default (or if 1), sections are parsed one by one
+          in the current process.
+
+    Raises:
+        ValueError: Unknown parser or invalid number of workers
+
+    Returns:
+        dict[str, list[dict]]: A dictionary
+        {
+            "sections": [...] - list of sections (see _parse_section)
+            "questions": [...] - list of data columns (see _parse_question)
+        }
+    """
+    if parser not in STRUCTURE_PARSERS:
+        raise ValueError(
+            f"Unknown parser '{parser}'. Supported parsers: {STRUCTURE_PARSERS}"
+        )
+    if workers is not None and workers < 1:
+        raise ValueError(f"Number of workers must be positive, got {workers}")
+
+    if workers is not None and workers > 1:
+        return _read_structure_parallel(filepath, parser, workers)
+    elif parser == "lxml":
+        return _read_structure_lxml(filepath)
+    else:
+        return _read_structure_bs4(filepath)
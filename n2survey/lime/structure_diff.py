@@ -0,0 +1,222 @@
+"""Comparison of questionnaire structure revisions
+
+The module contains helper functions for fingerprinting <question>
+elements of LimeSurvey XML structure files, comparing two revisions
+of a structure file, and `IncrementalStructureReader` which parses
+only questions that changed since the previously read revision.
+"""
+
+import hashlib
+import os
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from lxml import etree
+
+from n2survey.lime.structure import (
+    _get_question_group_name,
+    _parse_question_element,
+    _parse_section_element,
+)
+
+__all__ = [
+    "StructureDiff",
+    "IncrementalStructureReader",
+    "get_question_fingerprints",
+    "diff_lime_questionnaire_structures",
+]
+
+
+class StructureDiff(NamedTuple):
+    """Difference between two revisions of a structure file
+
+    Questions are identified by their question group names, e.g. "A3".
+    Lists are in the order of questions in the respective revision.
+    """
+
+    added: List[str]
+    removed: List[str]
+    changed: List[str]
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+def _get_question_fingerprint(question: etree._Element) -> str:
+    """Get SHA-1 hex digest of a canonical serialization of a <question>"""
+    return hashlib.sha1(
+        etree.tostring(question, method="c14n", with_tail=False)
+    ).hexdigest()
+
+
+def _get_question_key(question: etree._Element, position: int) -> str:
+    """Get a name identifying a <question> element between revisions
+
+    The question group name is used (see `_get_question_group_name`).
+    If no <response> has a varName, the <subQuestion> names are used
+    instead, or the position of the question in the file as a last resort.
+    """
+    names = [
+        response.attrib.get("varName") for response in question.findall("response")
+    ]
+    if not names or None in names:
+        names = [
+            subquestion.attrib.get("varName")
+            for subquestion in question.findall("subQuestion")
+        ]
+    if not names or None in names:
+        return f"question{position}"
+    return _get_question_group_name([({"name": name}, None) for name in names])
+
+
+def _iter_questions(
+    filepath: str,
+) -> Iterator[Tuple[str, Optional[etree._Element], Optional[etree._Element]]]:
+    """Walk <question> and <section> elements of an XML structure file
+
+    Yields ("question", question, None) for each closed <question> and
+    ("section", None, section) for each closed <section> (with its
+    questions already cleared). Elements are dropped after yielding.
+    """
+    for _, element in etree.iterparse(filepath, tag=("section", "question")):
+        if element.tag == "question":
+            yield "question", element, None
+            element.clear(keep_tail=True)
+        else:
+            yield "section", None, element
+            # Drop the section and everything before it
+            element.clear(keep_tail=True)
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+
+
+def _make_unique(key: str, seen: Dict[str, int]) -> str:
+    """Add an occurrence number to repeated question keys, e.g. "G2Q9#2" """
+    seen[key] = seen.get(key, 0) + 1
+    return key if seen[key] == 1 else f"{key}#{seen[key]}"
+
+
+def get_question_fingerprints(filepath: str) -> Dict[str, str]:
+    """Get fingerprints of all <question> elements of a structure file
+
+    The file is only scanned, questions are not parsed.
+
+    Args:
+        filepath (str): Path to the XML structure file
+
+    Returns:
+        dict[str, str]: Question key (i.e. question group name) -> content
+          hash, in the file order
+    """
+    fingerprints = {}
+    seen = {}
+    for kind, question, _ in _iter_questions(filepath):
+        if kind == "question":
+            key = _make_unique(_get_question_key(question, len(fingerprints)), seen)
+            fingerprints[key] = _get_question_fingerprint(question)
+    return fingerprints
+
+
+def _diff_fingerprints(old: Dict[str, str], new: Dict[str, str]) -> StructureDiff:
+    """Compare two question fingerprint dicts"""
+    return StructureDiff(
+        added=[key for key in new if key not in old],
+        removed=[key for key in old if key not in new],
+        changed=[key for key in new if key in old and new[key] != old[key]],
+    )
+
+
+def diff_lime_questionnaire_structures(old_file: str, new_file: str) -> StructureDiff:
+    """Compare questions of two revisions of a structure file
+
+    Args:
+        old_file (str): Path to the old XML structure file
+        new_file (str): Path to the new XML structure file
+
+    Returns:
+        StructureDiff: Added, removed, and changed questions
+    """
+    return _diff_fingerprints(
+        get_question_fingerprints(old_file), get_question_fingerprints(new_file)
+    )
+
+
+class IncrementalStructureReader:
+    """Reader of structure files reusing parse results of unchanged questions
+
+    Parsed columns of each <question> are cached by the question
+    fingerprint, so reading another revision of a structure file parses
+    only added and changed questions. The result is the same as of
+    `read_lime_questionnaire_structure`, except that warnings are
+    not repeated for questions taken from the cache.
+
+    Attributes:
+        filepath (Optional[str]): Absolute path of the last read file
+        fingerprints (dict[str, str]): Question fingerprints of the last read file
+        last_diff (Optional[StructureDiff]): Difference between the last
+          two read files, None after the first read
+        parsed_count (int): Number of questions parsed in the last read
+        reused_count (int): Number of questions taken from the cache in the last read
+    """
+
+    def __init__(self) -> None:
+        self.filepath: Optional[str] = None
+        self.fingerprints: Dict[str, str] = {}
+        self.last_diff: Optional[StructureDiff] = None
+        self.parsed_count = 0
+        self.reused_count = 0
+        self._columns: Dict[str, List[Dict]] = {}
+        self._has_read = False
+
+    def read(self, filepath: str) -> dict[str, list[dict]]:
+        """Read an XML structure file
+
+        Args:
+            filepath (str): Path to the XML structure file
+
+        Returns:
+            dict[str, list[dict]]: A dictionary with "sections" and "questions",
+              see `read_lime_questionnaire_structure`
+        """
+        result_sections = list()
+        result_questions = list()
+        section_questions = list()
+        fingerprints = {}
+        seen = {}
+        columns_cache = {}
+        self.parsed_count = 0
+        self.reused_count = 0
+        for kind, question, section in _iter_questions(filepath):
+            if kind == "question":
+                fingerprint = _get_question_fingerprint(question)
+                key = _make_unique(_get_question_key(question, len(fingerprints)), seen)
+                fingerprints[key] = fingerprint
+                if fingerprint in self._columns:
+                    columns = self._columns[fingerprint]
+                    self.reused_count += 1
+                else:
+                    columns = _parse_question_element(question)
+                    self.parsed_count += 1
+                columns_cache[fingerprint] = columns
+                section_questions += columns
+            else:
+                section_dict = _parse_section_element(section)
+                result_sections.append(section_dict)
+                # Add section_id to the columns descriptions
+                result_questions += [
+                    {**column, "section_id": section_dict["id"]}
+                    for column in section_questions
+                ]
+                section_questions = list()
+
+        # Keep parse results of the last read revision only
+        self._columns = columns_cache
+        self.last_diff = (
+            _diff_fingerprints(self.fingerprints, fingerprints)
+            if self._has_read
+            else None
+        )
+        self.fingerprints = fingerprints
+        self.filepath = os.path.abspath(filepath)
+        self._has_read = True
+
+        return {"sections": result_sections, "questions": result_questions}
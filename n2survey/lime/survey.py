@@ -1,16 +1,66 @@
 import copy
+import csv
+import functools
+import importlib.util
 import os
 import re
 import string
 import warnings
-from typing import Optional, Union
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
+from n2survey.lime.answer_index import AnswerIndex
+from n2survey.lime.arrow import read_csv_arrow
+from n2survey.lime.bitmatrix import BitMatrix, invert_mask, pack_mask, unpack_mask
+from n2survey.lime.cache import (
+    read_responses_cache,
+    read_structure_cache,
+    write_responses_cache,
+    write_structure_cache,
+)
+from n2survey.lime.code_matrix import CodeMatrix
+from n2survey.lime.filters import AllOf, Answer, AnyOf, Filter, Missing, NoneOf
+from n2survey.lime.label_index import LabelIndex
+from n2survey.lime.lss import read_lime_lss_structure
+from n2survey.lime.query import Compare, parse_query, quote_identifier
+from n2survey.lime.question_index import QuestionIndex
+from n2survey.lime.question_registry import QuestionRecord, QuestionRegistry
+from n2survey.lime.sqlite_store import SQLiteColumnLoader, SQLiteResponsesWriter
+from n2survey.lime.storage import (
+    FrameColumnLoader,
+    ResponsesStoreWriter,
+    StoreColumnLoader,
+    ViewColumnLoader,
+    _concat_frames,
+    read_responses_store,
+    read_responses_store_metadata,
+)
 from n2survey.lime.structure import read_lime_questionnaire_structure
+from n2survey.lime.structure_diff import (
+    IncrementalStructureReader,
+    StructureDiff,
+    _diff_fingerprints,
+    get_question_fingerprints,
+)
 from n2survey.lime.transformations import (
+    MENTAL_HEALTH_LABELS,
+    RANGE_LABELS,
+    SATISFACTION_LABEL,
     calculate_duration,
     range_to_numerical,
     rate_mental_health,
@@ -28,7 +78,13 @@ from n2survey.plot import (
 )
 from n2survey.plot.color_schemes import ColorSchemes
 
-__all__ = ["LimeSurvey", "DEFAULT_THEME", "QUESTION_TYPES"]
+__all__ = [
+    "LimeSurvey",
+    "DEFAULT_THEME",
+    "QUESTION_TYPES",
+    "MetadataCacheInfo",
+    "MemoryReport",
+]
 
 
 DEFAULT_THEME = {
@@ -49,6 +105,8 @@ QUESTION_TYPES = (
     "single-choice",
     "multiple-choice",
 )
+# Question types with answers in the answer index, see `get_answer_index`
+_INDEXED_QUESTION_TYPES = ("single-choice", "multiple-choice", "array")
 
 
 # PLOT_KINDS_ = [
@@ -102,6 +160,141 @@ def deep_dict_update(source: dict, update_dict: dict) -> dict:
     return source
 
 
+class _ResponsesSchema(NamedTuple):
+    """Columns of a responses CSV file and their dtypes"""
+
+    index_name: str
+    columns: pd.Index
+    renamed_columns: pd.Index
+    dtype: dict
+    datetime_columns: list
+
+
+class MetadataCacheInfo(NamedTuple):
+    """Statistics of the question metadata cache"""
+
+    hits: int
+    misses: int
+    currsize: int
+
+
+class MemoryReport(NamedTuple):
+    """Memory usage of a survey in bytes, see `LimeSurvey.memory_report`"""
+
+    total: int
+    tables: pd.Series
+    questions: pd.DataFrame
+    sections: pd.DataFrame
+
+
+def _is_timing_column(column: str) -> bool:
+    """Whether a LimeSurvey system info column holds timings"""
+    return (
+        column == "interviewtime"
+        or column.startswith("groupTime")
+        or column.endswith("Time")
+    )
+
+
+def _categorize_strings(
+    frame: pd.DataFrame, max_category_ratio: float, exclude: Iterable[str] = ()
+) -> pd.DataFrame:
+    """Convert string columns with few distinct values to categories
+
+    Args:
+        frame (pd.DataFrame): Columns to convert
+        max_category_ratio (float): Maximal number of distinct values per
+          value of converted columns
+        exclude (Iterable[str], optional): Columns not to convert
+
+    Returns:
+        pd.DataFrame: Converted DataFrame, `frame` if nothing is converted
+    """
+    exclude = set(exclude)
+    dtypes = {}
+    for column in frame.columns[frame.dtypes == object]:
+        if column in exclude:
+            continue
+        values = frame[column].dropna()
+        if not values.map(type).eq(str).all():
+            continue
+        if len(values) and values.nunique() <= max_category_ratio * len(values):
+            dtypes[column] = "category"
+    return frame.astype(dtypes) if dtypes else frame
+
+
+def _fingerprint_column(values: pd.Series) -> tuple:
+    """Get a checksum of the values of a response column
+
+    Category codes are checked directly, values of other dtypes by their
+    hashes, see `pd.util.hash_pandas_object`.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        data = values.array.codes
+        categories = tuple(values.cat.categories)
+    else:
+        data = pd.util.hash_pandas_object(values, index=False).to_numpy()
+        categories = None
+    return (
+        len(values),
+        str(values.dtype),
+        zlib.crc32(np.ascontiguousarray(data)),
+        hash(categories),
+    )
+
+
+def _fingerprint_questions(questions: pd.DataFrame) -> tuple:
+    """Get a checksum of the questions table
+
+    Values are compared as strings, so edits of choices dicts are seen too.
+    """
+    data = pd.util.hash_pandas_object(questions.astype(str), index=True).to_numpy()
+    return (
+        questions.shape,
+        tuple(questions.columns),
+        zlib.crc32(np.ascontiguousarray(data)),
+    )
+
+
+def _memoize_question_metadata(method):
+    """Memoize a question metadata accessor per question code
+
+    Results are stored in `LimeSurvey._metadata_cache`, which is dropped
+    whenever `LimeSurvey.questions` may change.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, question):
+        self._check_questions_edited()
+        try:
+            key = (method.__name__, question)
+            result = self._metadata_cache[key]
+        except TypeError:
+            # Unhashable question code
+            return method(self, question)
+        except KeyError:
+            self._metadata_cache_misses += 1
+            result = method(self, question)
+            self._metadata_cache[key] = result
+        else:
+            self._metadata_cache_hits += 1
+        return result
+
+    return wrapper
+
+
+def _filter_rows(method):
+    """Add a `where` argument, a `Filter` of rows to call the method on"""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, where: Filter = None, **kwargs):
+        if where is not None:
+            return method(self[where], *args, **kwargs)
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
 rng = np.random.default_rng()
 
 
@@ -111,6 +304,30 @@ class LimeSurvey:
     na_label: str = "No Answer"
     theme: dict = None
     output_folder: str = None
+    cache_dir: str = None
+    _questions: pd.DataFrame = None
+    _registry: QuestionRegistry = None
+    _question_index: QuestionIndex = None
+    _structure_reader: IncrementalStructureReader = None
+    _label_index: LabelIndex = None
+    _questions_handed_out: bool = False
+    # Checksum of the handed out questions table, see `_check_questions_edited`
+    _questions_fingerprint: tuple = None
+    # Whether `responses` were handed out and may be edited in place
+    _responses_handed_out: bool = False
+    # Checksums of response columns read by caches, see `_check_responses_edited`
+    _response_fingerprints: dict = None
+    _responses: pd.DataFrame = None
+    _responses_loader: Union[
+        StoreColumnLoader, FrameColumnLoader, SQLiteColumnLoader, ViewColumnLoader
+    ] = None
+    _system_info: pd.DataFrame = None
+    _system_info_loader: Union[StoreColumnLoader, SQLiteColumnLoader] = None
+    _transformation_questions: dict = None
+    _multiple_choice_bits: dict = None
+    _code_matrix: CodeMatrix = None
+    _answer_index: AnswerIndex = None
+    _filter_masks: dict = None
     supported_orgs = ["MPS", "Helmholtz", "Leibniz", "TUM", "N2"]
     additional_questions = {
         "state_anxiety_score": {
@@ -258,11 +475,13 @@ class LimeSurvey:
         theme: Optional[dict] = None,
         output_folder: Optional[str] = None,
         org: str = None,
+        cache_dir: Optional[str] = None,
     ) -> None:
         """Get an instance of the Survey
 
         Args:
             structure_file (str, optional): Path to the structure XML file
+              or .lss survey archive
             theme (Optional[dict], optional): seaborn theme parameters.
               See `seaborn.set_theme` for the details. By default,
               `n2survey.DEFAULT_THEME` is used.
@@ -270,8 +489,28 @@ class LimeSurvey:
             i.e. plots, repotrs, etc. will be saved. By default, current woring
             directory is used.
             org (str, optional): Name of the organization.
+            cache_dir (Optional[str], optional): A path to a folder for caching
+              parsed files. If not given, nothing is cached.
         """
 
+        # Store path to cache folder
+        self.cache_dir = cache_dir
+
+        # Memoized results of question metadata accessors
+        self._metadata_cache = {}
+        self._metadata_cache_hits = 0
+        self._metadata_cache_misses = 0
+
+        # Transformations of responses, repeated for appended responses
+        self._transformation_questions = {}
+
+        # Multiple-choice columns packed to bits, see `get_multiple_choice_bits`
+        self._multiple_choice_bits = {}
+
+        # Packed masks of row filters, see `get_filter_mask`
+        self._filter_masks = {}
+        self._response_fingerprints = {}
+
         # Store path to structure file
         if structure_file:
             self.structure_file = os.path.abspath(structure_file)
@@ -319,71 +558,1394 @@ class LimeSurvey:
                 f"Only the following organizations are supported: {self.supported_orgs}"
             )
 
-    def read_structure(self, structure_file: str) -> None:
-        """Read structure XML file
+    @property
+    def questions(self) -> pd.DataFrame:
+        """Questions structure table, one row per data column
+
+        The table is built from the question registry on first access and
+        may be edited in place. The next lookup after an access compares a
+        checksum of the table and, only if it changed, rebuilds the registry,
+        the question index and memoized question metadata. Edits of a table
+        kept from an earlier access are seen after the next access. Methods
+        of the survey use `_get_questions_frame`, which does not hand the
+        table out.
+        """
+        questions = self._get_questions_frame()
+        if self._questions_fingerprint is None:
+            self._questions_fingerprint = _fingerprint_questions(questions)
+        self._questions_handed_out = True
+        return questions
+
+    @questions.setter
+    def questions(self, questions: pd.DataFrame) -> None:
+        self._questions = questions
+        self._questions_handed_out = False
+        self._questions_fingerprint = None
+        self._registry = None
+        self._invalidate_question_metadata()
+
+    def _get_questions_frame(self) -> pd.DataFrame:
+        """Get the questions table without invalidating the registry"""
+        if self._questions is None:
+            if self._registry is None:
+                raise AttributeError("Survey structure is not read yet")
+            self._questions = self._registry.to_frame()
+        return self._questions
+
+    def _check_questions_edited(self) -> None:
+        """Drop question metadata if the handed out table was edited"""
+        if self._questions_handed_out:
+            self._questions_handed_out = False
+            fingerprint = _fingerprint_questions(self._questions)
+            if fingerprint != self._questions_fingerprint:
+                self._questions_fingerprint = fingerprint
+                self._registry = None
+                self._invalidate_question_metadata()
+
+    def _get_registry(self) -> QuestionRegistry:
+        """Get the question registry, build it from the table if needed"""
+        self._check_questions_edited()
+        if self._registry is None:
+            self._registry = QuestionRegistry.from_frame(self._get_questions_frame())
+        return self._registry
+
+    def _set_registry(self, registry: QuestionRegistry) -> None:
+        """Replace the question structure with a registry"""
+        self._registry = registry
+        self._questions = None
+        self._questions_handed_out = False
+        self._questions_fingerprint = None
+        self._invalidate_question_metadata()
+
+    @property
+    def responses(self) -> pd.DataFrame:
+        """Responses table, one row per respondent
+
+        In lazy mode (see `read_responses_store`), the table holds only
+        columns requested so far, e.g. by `get_responses`. Accessing the
+        whole table loads all remaining columns and keeps them, which ends
+        lazy mode and undoes moving free text by `optimize_memory`.
+
+        Methods of the survey load the columns they need only, or, if they
+        need all of them (e.g. `export_to_file`, `save_responses_cache`,
+        `deepcopy` and queries pandas has to evaluate on all columns), load
+        them without keeping them. Only `append_responses` replaces lazy
+        responses by the whole table, as it changes the rows.
+
+        The table may be edited in place. Once it is accessed, caches of
+        responses (e.g. `get_multiple_choice_bits`) check checksums of
+        the columns they use and are built again if the columns changed.
+        """
+        if self._responses_loader is not None:
+            self._responses = self._get_full_responses()
+            self._responses_loader = None
+            # Caches may have used columns not loaded before, without checksums
+            self._drop_response_caches()
+        self._responses_handed_out = True
+        return self._responses
+
+    @responses.setter
+    def responses(self, responses: pd.DataFrame) -> None:
+        self._responses = responses
+        self._responses_loader = None
+        self._drop_response_caches()
+
+    def _drop_response_caches(self) -> None:
+        """Drop packed bits, codes, indexes and masks of responses"""
+        self._responses_handed_out = False
+        # Do not clear the dict in place, it may be shared with a copy
+        self._multiple_choice_bits = {}
+        self._code_matrix = None
+        self._answer_index = None
+        self._filter_masks = {}
+        self._response_fingerprints = {}
+
+    def _record_response_fingerprints(self, columns: Iterable[str]) -> None:
+        """Keep checksums of loaded response columns read by a cache"""
+        fingerprints = self._response_fingerprints
+        for column in columns:
+            if column not in fingerprints and column in self._responses.columns:
+                fingerprints[column] = _fingerprint_column(self._responses[column])
+
+    def _check_responses_edited(self, columns: Iterable[str]) -> None:
+        """Drop caches of responses if handed out columns were edited
+
+        Only columns with a checksum, i.e. read by a cache, are checked.
+        Columns not loaded cannot be edited, see `responses`.
+
+        Args:
+            columns (Iterable[str]): Names of columns a cache is used for
+        """
+        if not self._responses_handed_out:
+            return
+        fingerprints = self._response_fingerprints
+        for column in columns:
+            fingerprint = fingerprints.get(column)
+            if (
+                fingerprint is not None
+                and column in self._responses.columns
+                and _fingerprint_column(self._responses[column]) != fingerprint
+            ):
+                # The table is still handed out, keep checking it
+                self._drop_response_caches()
+                self._responses_handed_out = True
+                return
+
+    @property
+    def lime_system_info(self) -> pd.DataFrame:
+        """LimeSurvey system info table, e.g. dates and timings of responses
+
+        In lazy mode, the table is loaded on first access.
+        """
+        if self._system_info_loader is not None:
+            loader = self._system_info_loader
+            self._system_info = loader.load(loader.columns)
+            self._system_info_loader = None
+        return self._system_info
+
+    @lime_system_info.setter
+    def lime_system_info(self, system_info: pd.DataFrame) -> None:
+        self._system_info = system_info
+        self._system_info_loader = None
+
+    def _get_full_responses(self) -> pd.DataFrame:
+        """Get all columns of responses without keeping loaded ones
+
+        Returns:
+            pd.DataFrame: Responses in the stored column order, added columns
+              go last. The table itself if nothing is left to load.
+        """
+        loader = self._responses_loader
+        if loader is None:
+            return self._responses
+        loaded = set(self._responses.columns)
+        responses = pd.concat(
+            [
+                self._responses,
+                loader.load(
+                    [column for column in loader.columns if column not in loaded]
+                ),
+            ],
+            axis=1,
+            copy=False,
+        )
+        added = self._responses.columns.difference(loader.columns, sort=False)
+        return responses.reindex(columns=loader.columns.append(added), copy=False)
+
+    def _get_response_columns(self, columns: list) -> pd.DataFrame:
+        """Get responses of given columns, loading them first in lazy mode
+
+        Args:
+            columns (list): Names of columns
+
+        Returns:
+            pd.DataFrame: A copy of the responses of the columns
+        """
+        loader = self._responses_loader
+        if loader is None:
+            return self._responses.loc[:, columns]
+
+        loaded = set(self._responses.columns)
+        missing = [
+            column
+            for column in columns
+            if column not in loaded and column in loader.columns
+        ]
+        if not missing:
+            return self._responses.loc[:, columns]
+        responses = pd.concat(
+            [self._responses, loader.load(missing)], axis=1, copy=False
+        )
+        # Free text moved by `optimize_memory` stays in its compact form
+        if not isinstance(loader, FrameColumnLoader):
+            # Do not modify the table in place, it may be shared with a copy
+            self._responses = responses
+        return responses.loc[:, columns]
+
+    def _get_multiple_choice_bits(self, columns: list) -> BitMatrix:
+        """Get checked boxes of multiple-choice columns packed to bits
+
+        Packed columns are a cache kept in addition to the responses until
+        responses are replaced or the columns are edited.
+
+        Args:
+            columns (list): Names of multiple-choice columns
+
+        Returns:
+            BitMatrix: Whether boxes are checked, i.e. not empty
+        """
+        self._check_responses_edited(columns)
+        key = tuple(columns)
+        if key not in self._multiple_choice_bits:
+            self._multiple_choice_bits[key] = BitMatrix.from_frame(
+                self._get_response_columns(columns).notnull()
+            )
+            self._record_response_fingerprints(columns)
+        return self._multiple_choice_bits[key]
+
+    def get_multiple_choice_bits(self, question: str) -> BitMatrix:
+        """Get checked boxes of a multiple-choice question packed to bits
+
+        Counts, co-occurrence and row masks of any or all checked boxes
+        are calculated on bits, one per respondent and box, see `BitMatrix`.
+        Contingent columns (i.e. "other") are not included. Bits speed up
+        counting; they are kept in addition to the responses, so they add
+        to the memory used (see `memory_report`).
+
+        Args:
+            question (str): Name of a multiple-choice question or subquestion
+
+        Raises:
+            ValueError: Question is not a multiple-choice question
+
+        Returns:
+            BitMatrix: Whether boxes are checked, columns are named as in
+              `self.responses`
+        """
+        question_type = self.get_question_type(question)
+        if question_type != "multiple-choice":
+            raise ValueError(
+                f"Question '{question}' is {question_type}, not multiple-choice"
+            )
+        return self._get_multiple_choice_bits(
+            self._get_question_columns(question, drop_other=True)
+        )
+
+    def get_code_matrix(self) -> CodeMatrix:
+        """Get category codes of single-choice and array responses
+
+        Categorical columns of single-choice and array questions are kept
+        as small integer codes in one matrix until responses are replaced,
+        see `CodeMatrix`. Labels of codes are the choices of the questions.
+
+        Returns:
+            CodeMatrix: Codes of the columns in the order of `self.questions`
+        """
+        if self._code_matrix is not None:
+            self._check_responses_edited(self._code_matrix.columns)
+        if self._code_matrix is None:
+            registry = self._get_registry()
+            available = set(self._responses.columns)
+            if self._responses_loader is not None:
+                available.update(self._responses_loader.columns)
+            responses = self._get_response_columns(
+                [
+                    record.name
+                    for record in registry
+                    if record.get("type") in ("single-choice", "array")
+                    and record.name in available
+                ]
+            ).select_dtypes("category")
+            choices = {
+                column: registry.get(column).get("choices")
+                for column in responses.columns
+            }
+            self._code_matrix = CodeMatrix.from_frame(
+                responses,
+                {
+                    column: column_choices
+                    for column, column_choices in choices.items()
+                    if isinstance(column_choices, dict)
+                },
+            )
+            self._record_response_fingerprints(responses.columns)
+        return self._code_matrix
+
+    def get_answer_index(self, columns: Optional[Iterable[str]] = None) -> AnswerIndex:
+        """Get rows by answer of single-choice, multiple-choice and array columns
+
+        Each answer of an indexed column is mapped to the rows with the
+        answer as a mask packed to bits, see `AnswerIndex`. Columns are
+        indexed on first request and kept until responses are replaced.
+        `query` and `filter_responses` evaluate comparisons of answers on
+        the index.
+
+        Args:
+            columns (Iterable[str], optional): Names of columns to index.
+              Defaults to None, i.e. all categorical columns of
+              single-choice, multiple-choice and array questions.
+
+        Raises:
+            ValueError: A column is not a categorical response column of a
+              single-choice, multiple-choice or array question
+
+        Returns:
+            AnswerIndex: Index with the columns
+        """
+        registry = self._get_registry()
+        if columns is None:
+            columns = [
+                record.name
+                for record in registry
+                if record.get("type") in _INDEXED_QUESTION_TYPES
+                and self._has_response_column(record.name)
+            ]
+            strict = False
+        else:
+            columns = list(columns)
+            strict = True
+        self._check_responses_edited(columns)
+        if self._answer_index is None:
+            self._answer_index = AnswerIndex(len(self._responses))
+        index = self._answer_index
+
+        missing = []
+        for column in columns:
+            if column in index:
+                continue
+            record = registry.get(column)
+            if (
+                record is None
+                or record.get("type") not in _INDEXED_QUESTION_TYPES
+                or not self._has_response_column(column)
+            ):
+                raise ValueError(
+                    f"Column '{column}' is not a response column of a "
+                    "single-choice, multiple-choice or array question"
+                )
+            # Reuse codes of the code matrix, if it is built already
+            if self._code_matrix is not None and column in self._code_matrix.columns:
+                index.add_column(
+                    column,
+                    self._code_matrix.get_codes(column),
+                    self._code_matrix.categories[column],
+                )
+            else:
+                missing.append(column)
+
+        for column, values in self._get_response_columns(missing).items():
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                index.add_column(column, values.array.codes, values.cat.categories)
+            elif strict:
+                raise ValueError(
+                    f"Column '{column}' is {values.dtype}, not categorical"
+                )
+        self._record_response_fingerprints(missing)
+        return index
+
+    def memory_report(self) -> MemoryReport:
+        """Get memory usage of the survey
+
+        Only loaded columns are counted, e.g. in lazy mode (see
+        `read_responses_store`). Columns moved out of `responses` by
+        `optimize_memory` are counted with their question. Timing columns
+        of `lime_system_info` are counted with their question or section.
+        Surveys filtered from this one hold their own responses, which are
+        not counted.
+
+        Returns:
+            MemoryReport: Named tuple of (total, tables, questions, sections):
+              * total: Bytes used by all tables
+              * tables: Bytes per table, i.e. "responses", "lime_system_info",
+                "questions", "free_text" moved out of responses and
+                "packed" caches of responses kept in addition to them, see
+                `get_multiple_choice_bits`, `get_code_matrix` and
+                `get_answer_index`
+              * questions: Bytes per question group with columns "section_id",
+                "responses", "lime_system_info" and "total"
+              * sections: Bytes per section with columns "title",
+                "responses", "lime_system_info" and "total"
+        """
+        registry = self._get_registry()
+
+        responses_usage = pd.Series(dtype="int64")
+        if self._responses is not None:
+            responses_usage = self._responses.memory_usage(deep=True, index=False)
+        free_text_usage = pd.Series(dtype="int64")
+        if isinstance(self._responses_loader, FrameColumnLoader):
+            free_text_usage = self._responses_loader.memory_usage()
+        system_info_usage = pd.Series(dtype="int64")
+        if self._system_info is not None and self._system_info_loader is None:
+            system_info_usage = self._system_info.memory_usage(deep=True, index=False)
+        packed = sum(bits.nbytes for bits in self._multiple_choice_bits.values())
+        if self._code_matrix is not None:
+            packed += self._code_matrix.nbytes
+        if self._answer_index is not None:
+            packed += self._answer_index.nbytes
+
+        tables = pd.Series(
+            {
+                "responses": responses_usage.sum(),
+                "lime_system_info": system_info_usage.sum(),
+                "questions": self._get_questions_frame().memory_usage(deep=True).sum(),
+                "free_text": free_text_usage.sum(),
+                "packed": packed,
+            },
+            dtype="int64",
+        )
+
+        # Assign columns to question groups and sections
+        records = []
+        for column, nbytes in pd.concat([responses_usage, free_text_usage]).items():
+            record = registry.get(column)
+            group = record.get("question_group") if record is not None else column
+            records.append((group, "responses", nbytes))
+        for column, nbytes in system_info_usage.items():
+            if column.startswith("groupTime"):
+                records.append((f"section {column[9:]}", "lime_system_info", nbytes))
+            elif column.endswith("Time") and registry.get(column[:-4]) is not None:
+                group = registry.get(column[:-4]).get("question_group")
+                records.append((group, "lime_system_info", nbytes))
+        usage = pd.DataFrame(records, columns=["question", "table", "bytes"])
+
+        questions = usage.pivot_table(
+            index="question", columns="table", values="bytes", aggfunc="sum"
+        ).reindex(columns=["responses", "lime_system_info"])
+        questions = questions.fillna(0).astype("int64")
+        questions["total"] = questions.sum(axis=1)
+        # Group times are counted for sections only
+        section_times = questions.index.str.startswith("section ")
+        group_sections = {}
+        for record in registry:
+            group_sections.setdefault(
+                record.get("question_group"), record.get("section_id")
+            )
+        section_ids = [
+            int(question[8:]) if is_section else group_sections.get(question)
+            for question, is_section in zip(questions.index, section_times)
+        ]
+        sections = (
+            questions.assign(section_id=section_ids)
+            .dropna(subset=["section_id"])
+            .astype({"section_id": "int64"})
+            .groupby("section_id")
+            .sum()
+        )
+        if getattr(self, "sections", None) is not None:
+            sections.insert(0, "title", self.sections["title"].reindex(sections.index))
+        questions = questions.loc[~section_times]
+        questions.insert(
+            0,
+            "section_id",
+            pd.array(
+                [group_sections.get(group) for group in questions.index], dtype="Int64"
+            ),
+        )
+
+        return MemoryReport(int(tables.sum()), tables, questions, sections)
+
+    def optimize_memory(
+        self,
+        downcast_timings: bool = True,
+        categorize_strings: bool = True,
+        move_free_text: bool = True,
+        max_category_ratio: float = 0.5,
+    ) -> pd.DataFrame:
+        """Reduce memory usage of responses
+
+        Args:
+            downcast_timings (bool, optional): Keep timings of
+              `lime_system_info` as float32, i.e. with about 7 significant
+              digits. Defaults to True.
+            categorize_strings (bool, optional): Convert string columns, except
+              free-text responses, with at most `max_category_ratio` distinct
+              values per value to categories. Defaults to True.
+            move_free_text (bool, optional): Move free-text responses out of
+              `responses` into compact Arrow strings (requires pyarrow,
+              otherwise skipped). Columns are converted for the methods
+              requesting them, e.g. `get_responses`, and stay moved, also
+              when responses are appended or copied. Only accessing the whole
+              `responses` table moves them back. Defaults to True.
+            max_category_ratio (float, optional): see `categorize_strings`.
+              Defaults to 0.5.
+
+        Returns:
+            pd.DataFrame: Bytes per table (see `memory_report`) in columns
+              "before", "after" and "saved"
+        """
+        before = self.memory_report().tables
+        registry = self._get_registry()
+
+        # In lazy mode, only loaded columns are optimized
+        if self._system_info is not None and self._system_info_loader is None:
+            system_info = self._system_info
+            if downcast_timings:
+                system_info = system_info.astype(
+                    {
+                        column: "float32"
+                        for column, dtype in system_info.dtypes.items()
+                        if dtype == "float64" and _is_timing_column(column)
+                    }
+                )
+            if categorize_strings:
+                system_info = _categorize_strings(system_info, max_category_ratio)
+            self.lime_system_info = system_info
+
+        # Responses to free and contingent (i.e. "other") questions
+        free_text_columns = [
+            column
+            for column, dtype in self._responses.dtypes.items()
+            if dtype == object
+            and registry.get(column) is not None
+            and (
+                registry.get(column).get("type") == "free"
+                or registry.get(column).get("is_contingent") is True
+            )
+        ]
+        # Edits of a handed out table must be seen before it is replaced
+        self._check_responses_edited(list(self._response_fingerprints))
+        responses = self._responses
+        if categorize_strings:
+            responses = _categorize_strings(
+                responses, max_category_ratio, exclude=free_text_columns
+            )
+            if responses is not self._responses:
+                # Converted columns may be codes of single-choice questions
+                self._code_matrix = None
+                self._answer_index = None
+        if responses is not self._responses:
+            # Values of multiple-choice responses are not changed, keep their
+            # bits, and checksum the new table, which is not handed out
+            self._responses = responses
+            self._responses_handed_out = False
+            columns = list(self._response_fingerprints)
+            self._response_fingerprints = {}
+            self._record_response_fingerprints(columns)
+        # Columns of a responses store are loaded from it anyway
+        if (
+            move_free_text
+            and free_text_columns
+            and self._responses_loader is None
+            and importlib.util.find_spec("pyarrow")
+        ):
+            self._move_to_arrow(free_text_columns)
+
+        after = self.memory_report().tables
+        return pd.DataFrame({"before": before, "after": after, "saved": before - after})
+
+    def _move_to_arrow(self, columns: list) -> None:
+        """Move columns of in-memory responses to a `FrameColumnLoader`"""
+        responses = self._responses
+        self._responses_loader = FrameColumnLoader(
+            responses.loc[:, columns], responses.columns
+        )
+        self._responses = responses.drop(columns=columns)
+
+    def _invalidate_question_metadata(self) -> None:
+        """Drop the question indices and memoized question metadata"""
+        self._question_index = None
+        self._label_index = None
+        # Do not clear the dict in place, it may be shared with a copy
+        self._metadata_cache = {}
+
+    def metadata_cache_info(self) -> MetadataCacheInfo:
+        """Get statistics of memoized question metadata
+
+        `get_question_type`, `get_label` and `get_choices` results are
+        memoized per question code until `self.questions` changes.
+
+        Returns:
+            MetadataCacheInfo: Named tuple of (hits, misses, currsize)
+        """
+        return MetadataCacheInfo(
+            self._metadata_cache_hits,
+            self._metadata_cache_misses,
+            len(self._metadata_cache),
+        )
+
+    def _get_question_index(self) -> QuestionIndex:
+        """Get the question index, build it if needed"""
+        self._check_questions_edited()
+        if self._question_index is None:
+            self._question_index = QuestionIndex(self._get_registry())
+        return self._question_index
+
+    def _get_label_index(self) -> LabelIndex:
+        """Get the full-text index of question texts, build it if needed"""
+        self._check_questions_edited()
+        if self._label_index is None:
+            self._label_index = LabelIndex(self._get_registry())
+        return self._label_index
+
+    def find_questions(
+        self,
+        text: str,
+        fields: Optional[list] = None,
+        case_sensitive: bool = False,
+        columns: bool = False,
+    ) -> list:
+        """Find questions by a text in their labels, descriptions or choices
+
+        Args:
+            text (str): Text to look for, e.g. "interest or pleasure"
+            fields (list, optional): Fields to search in, any of "label",
+              "question_label", "question_description", and "choices".
+              By default, all of them.
+            case_sensitive (bool, optional): Whether to match the case.
+              Defaults to False.
+            columns (bool, optional): Return names of matching columns
+              (e.g. "D3_SQ001") instead of question groups (e.g. "D3").
+              Defaults to False.
+
+        Returns:
+            list: Names of matching questions in the table order
+        """
+        label_index = self._get_label_index()
+        if columns:
+            return label_index.find_columns(
+                text, fields=fields, case_sensitive=case_sensitive
+            )
+        return label_index.find_groups(
+            text, fields=fields, case_sensitive=case_sensitive
+        )
+
+    def _find_label_phrase(
+        self, question: str, phrases: Iterable[str]
+    ) -> Optional[str]:
+        """Get the first phrase in the label of a question, see `get_label`
+
+        The label of a known question is checked directly, use
+        `find_questions` to look up questions with a phrase.
 
         Args:
-            structure_file (str): Path to the structure XML file
+            question (str): Name of a question
+            phrases (Iterable[str]): Case-sensitive phrases to look for
+
+        Returns:
+            Optional[str]: The phrase, None if the label has none of them
+        """
+        label = self.get_label(question)
+        for phrase in phrases:
+            if phrase in label:
+                return phrase
+        return None
+
+    def read_structure(self, structure_file: str, refresh_cache: bool = False) -> None:
+        """Read structure XML file or .lss survey archive
+
+        The file type is recognized by the extension, .lss files are read
+        with `read_lime_lss_structure`, all other files are expected to be
+        questionnaire XML files.
+
+        If `self.cache_dir` is set, parsed tables are taken from the cache
+        as long as the structure file did not change.
+
+        Args:
+            structure_file (str): Path to the structure XML or .lss file
+            refresh_cache (bool, optional): Parse the file even if there
+              is a valid cache for it, and update the cache. Defaults to False.
         """
 
-        # Parse XML structure file
         self.structure_file = os.path.abspath(structure_file)
-        structure_dict = read_lime_questionnaire_structure(structure_file)
 
-        # Get pandas.DataFrame table for the structure
+        cached = None
+        if self.cache_dir and not refresh_cache:
+            cached = read_structure_cache(self.structure_file, self.cache_dir)
+
+        if cached is not None:
+            section_df, question_df = cached
+            self.sections = section_df
+            self.questions = question_df
+        else:
+            # Parse structure file
+            if os.path.splitext(structure_file)[1].lower() == ".lss":
+                structure_dict = read_lime_lss_structure(structure_file)
+            else:
+                structure_dict = read_lime_questionnaire_structure(structure_file)
+
+            self._set_structure(structure_dict, write_cache=bool(self.cache_dir))
+
+        for question, info in self.additional_questions.items():
+            self.add_question(question, **info)
+
+    def _set_structure(self, structure_dict: dict, write_cache: bool = False) -> None:
+        """Set sections and questions from a parsed structure file
+
+        Args:
+            structure_dict (dict): Parsed structure, see
+              `read_lime_questionnaire_structure`
+            write_cache (bool, optional): Store the tables in `self.cache_dir`
+        """
+        # Get pandas.DataFrame table for sections and a registry for questions
         section_df = pd.DataFrame(structure_dict["sections"])
         section_df = section_df.set_index("id")
-        question_df = pd.DataFrame(structure_dict["questions"])
-        question_df = question_df.set_index("name")
-        question_df["is_contingent"] = question_df.contingent_of_name.notnull()
+        registry = QuestionRegistry.from_columns(structure_dict["questions"])
+
+        if write_cache:
+            write_structure_cache(
+                self.structure_file,
+                self.cache_dir,
+                section_df,
+                registry.to_frame(),
+            )
+
         self.sections = section_df
-        self.questions = question_df
+        self._set_registry(registry)
+
+    def reload_structure(self, structure_file: Optional[str] = None) -> StructureDiff:
+        """Read a revision of the structure XML file re-parsing changed questions only
+
+        Parse results of questions are kept between reloads, so reading
+        a slightly edited structure file only parses added and changed
+        <question> elements. The first reload parses the whole file.
+
+        Args:
+            structure_file (str, optional): Path to the structure XML file.
+              By default, the current structure file is read again.
+
+        Raises:
+            ValueError: The file is not a questionnaire XML file
+
+        Returns:
+            StructureDiff: Added, removed, and changed questions compared
+              to the previously read structure file
+        """
+        structure_file = os.path.abspath(structure_file or self.structure_file)
+        if os.path.splitext(structure_file)[1].lower() == ".lss":
+            raise ValueError("Only questionnaire XML files can be reloaded")
+
+        if self._structure_reader is None:
+            self._structure_reader = IncrementalStructureReader()
+        reader = self._structure_reader
+
+        # Fingerprints of the current structure, without parsing it
+        if reader.fingerprints and reader.filepath == self.structure_file:
+            old_fingerprints = reader.fingerprints
+        else:
+            old_fingerprints = get_question_fingerprints(self.structure_file)
 
+        structure_dict = reader.read(structure_file)
+        self.structure_file = structure_file
+        self._set_structure(structure_dict, write_cache=bool(self.cache_dir))
         for question, info in self.additional_questions.items():
             self.add_question(question, **info)
 
+        return _diff_fingerprints(old_fingerprints, reader.fingerprints)
+
     def read_responses(
         self,
         responses_file: str,
         transformation_questions: dict = {},
         org: str = None,
+        engine: str = "c",
+        refresh_cache: bool = False,
     ) -> None:
         """Read responses CSV file
 
+        If `self.cache_dir` is set and pyarrow is installed, read responses
+        are taken from the cache as long as neither the responses file nor
+        the structure file changed. Transformations are not cached.
+
         Args:
             responses_file (str): Path to the responses CSV file
             transformation_questions (dict, optional): Dict of questions
                 requiring transformation of raw data, e.g. {'depression': 'D3'}
                 or {'supervision': ['E7a', 'E7b']}
             org (str): organization name
+            engine (str, optional): CSV parser, "c" for the pandas C parser or
+                "pyarrow" for multithreaded `pyarrow.csv` (requires pyarrow).
+                Both give the same responses. Defaults to "c".
+            refresh_cache (bool, optional): Parse the file even if there
+                is a valid cache for it, and update the cache. Defaults to False.
+
+        Raises:
+            ValueError: Unknown engine
+
+        """
+
+        if engine not in ("c", "pyarrow"):
+            raise ValueError(f"Unknown engine '{engine}', use 'c' or 'pyarrow'")
+
+        question_responses, system_info, file_org = self._read_responses_file(
+            responses_file, org=org, engine=engine, refresh_cache=refresh_cache
+        )
+        # Organization is only read from previously processed data
+        if file_org is not None:
+            self.set_org(file_org)
+
+        self.responses = question_responses
+        self.lime_system_info = system_info
+
+        self._transform_responses(transformation_questions)
+
+    @classmethod
+    def read_organizations(
+        cls,
+        structure_file: str,
+        responses_files: Dict[str, str],
+        transformation_questions: dict = {},
+        engine: str = "c",
+        max_workers: Optional[int] = None,
+        **kwargs,
+    ) -> "LimeSurvey":
+        """Read responses of several organizations into one survey
+
+        Files are read concurrently in a thread pool with the shared survey
+        structure. Responses are concatenated in the order of `responses_files`
+        with an "organization" single-choice column added in front, so
+        responses of an organization are consecutive rows and can be
+        selected without copying, see `select_organization`.
+
+        Ids of responses in different files may be the same, so responses
+        are numbered again from 1 in this order. Ids in the files are kept
+        in the "original_id" column of `lime_system_info`.
+
+        Args:
+            structure_file (str): Path to the structure file of all organizations
+            responses_files (dict[str, str]): Organization name -> path to its
+                responses CSV file, e.g. {"MPS": "mps.csv", "TUM": "tum.csv"}
+            transformation_questions (dict, optional): Dict of questions
+                requiring transformation of raw data, see `read_responses`.
+                Transformations are done on combined responses.
+            engine (str, optional): CSV parser, see `read_responses`.
+                Defaults to "c".
+            max_workers (Optional[int], optional): Number of threads. By default,
+                all files are read at once.
+            **kwargs: Other arguments of `LimeSurvey`, e.g. `cache_dir`.
+                The organization of the survey defaults to "N2".
+
+        Raises:
+            ValueError: No responses files or unknown engine
+            AssertionError: Organization is not supported
+
+        Returns:
+            LimeSurvey: Survey with responses of all organizations
+        """
+        if not responses_files:
+            raise ValueError("No responses files given")
+        if engine not in ("c", "pyarrow"):
+            raise ValueError(f"Unknown engine '{engine}', use 'c' or 'pyarrow'")
+
+        survey = cls(structure_file=structure_file, **{"org": "N2", **kwargs})
+        for org in responses_files:
+            survey._validate_org(org)
+        # Build the registry once before reading files concurrently
+        survey._get_registry()
+
+        with ThreadPoolExecutor(
+            max_workers=max_workers or len(responses_files)
+        ) as executor:
+            results = list(
+                executor.map(
+                    functools.partial(survey._read_responses_file, engine=engine),
+                    responses_files.values(),
+                    responses_files.keys(),
+                )
+            )
+
+        # Files have no organization column, add the question after reading them
+        survey.add_question(
+            "organization",
+            label="Organization",
+            type="single-choice",
+            choices={org: org for org in responses_files},
+        )
+        organizations = pd.CategoricalDtype(list(responses_files))
+        responses_parts = []
+        system_info_parts = []
+        n_responses = 0
+        for code, (question_responses, system_info, _) in enumerate(results):
+            # Previously processed data may have an organization column
+            if "organization" in question_responses.columns:
+                question_responses = question_responses.drop(columns="organization")
+            question_responses.insert(
+                0,
+                "organization",
+                pd.Categorical.from_codes(
+                    np.full(len(question_responses), code), dtype=organizations
+                ),
+            )
+            # Keep rows of system info aligned with responses
+            if system_info.shape[1] == 0:
+                system_info = pd.DataFrame(index=question_responses.index)
+            # Ids of files of different organizations may be the same
+            system_info.insert(0, "original_id", question_responses.index.to_numpy())
+            ids = pd.RangeIndex(
+                n_responses + 1,
+                n_responses + len(question_responses) + 1,
+                name=question_responses.index.name,
+            )
+            question_responses.index = ids
+            system_info.index = ids
+            n_responses += len(question_responses)
+            responses_parts.append(question_responses)
+            system_info_parts.append(system_info)
+
+        survey.responses = _concat_frames(responses_parts)
+        survey.lime_system_info = _concat_frames(system_info_parts)
+
+        survey._transform_responses(transformation_questions)
+
+        return survey
+
+    def select_organization(self, org: str) -> "LimeSurvey":
+        """Get responses of one organization of a combined survey
+
+        Responses of an organization read by `read_organizations` are
+        consecutive rows, so they are selected as a slice of the combined
+        table and are not copied.
+
+        Args:
+            org (str): Organization name
+
+        Raises:
+            ValueError: Responses have no organization column
 
+        Returns:
+            LimeSurvey: A copy of LimeSurvey instance with responses of
+              the organization
         """
+        self._validate_org(org)
+        if not self._has_response_column("organization"):
+            raise ValueError(
+                "Responses have no organization column, see `read_organizations`"
+            )
+
+        organizations = self._get_response_columns(["organization"])["organization"]
+        positions = np.flatnonzero((organizations == org).to_numpy())
+        if len(positions) and positions[-1] - positions[0] + 1 == len(positions):
+            rows = slice(positions[0], positions[-1] + 1)
+        else:
+            rows = positions
 
-        # Read 1st line of the csv file
-        response = pd.read_csv(responses_file, nrows=1, index_col=0)
+        if self._responses_loader is None:
+            subset = self.__copy__()
+            subset.responses = self._responses.iloc[rows]
+        else:
+            # Columns of lazy responses are loaded when requested, see `_view_rows`
+            subset = self._view_rows(positions)
+        if len(self.lime_system_info) == len(organizations):
+            subset.lime_system_info = self.lime_system_info.iloc[rows]
+        subset.set_org(org)
+
+        return subset
+
+    def _read_responses_file(
+        self,
+        responses_file: str,
+        org: str = None,
+        engine: str = "c",
+        refresh_cache: bool = False,
+    ) -> Tuple[pd.DataFrame, pd.DataFrame, Optional[str]]:
+        """Read responses CSV file without changing the survey
+
+        The survey structure is only read, so several files can be read
+        concurrently, see `read_organizations`.
+
+        Args:
+            responses_file (str): Path to the responses CSV file
+            org (str): organization name
+            engine (str, optional): CSV parser, see `read_responses`
+            refresh_cache (bool, optional): Parse the file even if there
+              is a valid cache for it, see `read_responses`
+
+        Returns:
+            tuple[pd.DataFrame, pd.DataFrame, Optional[str]]: Triple of
+              (question responses, system info, organization). The organization
+              is None for unprocessed data.
+        """
+        cached = None
+        if self.cache_dir and not refresh_cache:
+            cached = read_responses_cache(
+                responses_file, self.cache_dir, self.structure_file
+            )
 
-        # Prepare dtype info
-        columns = response.columns
+        if cached is not None:
+            question_responses, system_info, cached_org = cached
+            if cached_org is not None and org is not None:
+                self._validate_org(org)
+                cached_org = org
+            return question_responses, system_info, cached_org
+
+        schema = self._get_responses_schema(responses_file)
+
+        # Read entire csv once with final column names and dtypes,
+        # so categorical columns get their categories while parsing
+        if engine == "pyarrow":
+            responses = read_csv_arrow(
+                responses_file,
+                names=[schema.index_name, *schema.renamed_columns],
+                dtype=schema.dtype,
+                parse_dates=schema.datetime_columns,
+            )
+        else:
+            responses = self._read_responses_csv(responses_file, schema)
+
+        question_responses, system_info, file_org = self._prepare_responses(
+            responses, schema, org
+        )
+
+        if self.cache_dir:
+            write_responses_cache(
+                responses_file,
+                self.cache_dir,
+                self.structure_file,
+                question_responses,
+                system_info,
+                org=file_org,
+            )
+
+        return question_responses, system_info, file_org
+
+    def ingest_responses(
+        self,
+        responses_file: str,
+        store_dir: str,
+        chunksize: int = 10000,
+        org: str = None,
+        backend: str = "feather",
+    ) -> int:
+        """Read responses CSV file in chunks into a responses store
+
+        Each chunk is parsed and prepared as in `read_responses` and
+        written to the store (see `ResponsesStoreWriter`), so the memory
+        needed is bound by the chunk size and not by the file size.
+        Responses are not kept in the survey, read them with
+        `read_responses_store`.
+
+        With the "sqlite" backend, responses are written into an SQLite
+        database with an index on each single-choice column (see
+        `SQLiteResponsesWriter`). Surveys reading such a store filter and
+        count responses in the database, so responses do not need to fit
+        into memory.
+
+        Args:
+            responses_file (str): Path to the responses CSV file
+            store_dir (str): Path to the store folder, a previous store
+              in it is replaced
+            chunksize (int, optional): Number of responses per chunk.
+              Defaults to 10000.
+            org (str): organization name
+            backend (str, optional): "feather" or "sqlite". Defaults to "feather".
+
+        Raises:
+            ValueError: Unknown backend
+
+        Returns:
+            int: Number of responses
+        """
+        if backend == "feather":
+            writer = ResponsesStoreWriter(store_dir)
+        elif backend == "sqlite":
+            writer = SQLiteResponsesWriter(
+                store_dir,
+                indexed_columns=[
+                    record.name
+                    for record in self._get_registry()
+                    if record.get("type") == "single-choice"
+                ],
+            )
+        else:
+            raise ValueError(f"Unknown responses store backend '{backend}'")
+        schema = self._get_responses_schema(responses_file)
+
+        with writer:
+            for chunk in self._read_responses_csv(
+                responses_file, schema, chunksize=chunksize
+            ):
+                question_responses, system_info, chunk_org = self._prepare_responses(
+                    chunk, schema, org, warn=writer.rows == 0
+                )
+                # Organization of processed data is taken from the first chunk
+                if chunk_org is not None:
+                    org = chunk_org
+                writer.write(question_responses, system_info)
+            writer.metadata["org"] = org
+            writer.metadata["source"] = os.path.abspath(responses_file)
+
+        if org is not None:
+            self.set_org(org)
+
+        return writer.rows
+
+    def append_responses(self, responses_file: str, org: str = None) -> int:
+        """Read new and updated responses from a newer export of responses
+
+        Responses with ids not read before are appended, responses with a
+        changed "submitdate" or "datestamp" (date of the last action) replace
+        the ones read before. Only these rows of the file are parsed, and
+        transformations given to `read_responses` are calculated for them only.
+
+        If `self.cache_dir` is set and the survey then has the same responses
+        as the file, the cache of the file is updated, see `read_responses`.
+
+        Args:
+            responses_file (str): Path to the responses CSV file
+            org (str): organization name
+
+        Raises:
+            ValueError: Responses have duplicated ids or ids numbered again
+              by `read_organizations`
+
+        Returns:
+            int: Number of new and updated responses
+        """
+        if not self._responses.index.is_unique:
+            raise ValueError("Responses with duplicated ids cannot be updated")
+        if "original_id" in self.lime_system_info.columns:
+            raise ValueError(
+                "Responses of `read_organizations` have new ids and cannot be "
+                "updated, read the organizations again"
+            )
+
+        schema = self._get_responses_schema(responses_file)
+        # Compare dates of previous and new responses to find updated ones
+        key_columns = [
+            column
+            for column in ("submitdate", "datestamp")
+            if column in schema.columns and column in self.lime_system_info.columns
+        ]
+        keys = pd.read_csv(
+            responses_file,
+            usecols=[schema.index_name, *key_columns],
+            index_col=0,
+            parse_dates=key_columns,
+            infer_datetime_format=True,
+        )
+
+        is_new = ~keys.index.isin(self._responses.index)
+        is_changed = is_new.copy()
+        if key_columns:
+            new_keys = keys.loc[~is_new, key_columns]
+            old_keys = self.lime_system_info.loc[new_keys.index, key_columns]
+            is_changed[~is_new] = ~(
+                old_keys.eq(new_keys) | (old_keys.isnull() & new_keys.isnull())
+            ).all(axis=1)
+        rows = np.flatnonzero(is_changed)
+        if not len(rows):
+            return 0
+
+        # Parse changed rows only, the header is row 0
+        selected = set((rows + 1).tolist())
+        responses = self._read_responses_csv(
+            responses_file, schema, skiprows=lambda row: row > 0 and row not in selected
+        )
+        question_responses, system_info, file_org = self._prepare_responses(
+            responses, schema, org, warn=False
+        )
+        read_columns = question_responses.columns
+
+        if self._transformation_questions:
+            delta = self.__copy__()
+            delta.responses = question_responses
+            delta.lime_system_info = system_info
+            delta._transform_responses(self._transformation_questions)
+            question_responses = delta.responses
+
+        # Put updated responses in place of previous ones, new responses last
+        n_responses = len(self._responses)
+        positions = self._responses.index.get_indexer(question_responses.index)
+        is_updated = positions >= 0
+        take = np.arange(n_responses + np.count_nonzero(~is_updated))
+        take[positions[is_updated]] = n_responses + np.flatnonzero(is_updated)
+        take[n_responses:] = n_responses + np.flatnonzero(~is_updated)
+
+        # Rows change, so lazy responses are replaced by the whole table
+        loader = self._responses_loader
+        self.responses = _concat_frames(
+            [self._get_full_responses(), question_responses]
+        ).iloc[take]
+        if isinstance(loader, FrameColumnLoader):
+            # Keep free text moved by `optimize_memory`
+            self._move_to_arrow(loader.moved_columns)
+        if system_info.shape[1]:
+            self.lime_system_info = _concat_frames(
+                [self.lime_system_info, system_info]
+            ).iloc[take]
+
+        # Without responses removed from the file, the survey has its responses
+        if self.cache_dir and len(self._responses) == len(keys):
+            write_responses_cache(
+                responses_file,
+                self.cache_dir,
+                self.structure_file,
+                self._get_response_columns(read_columns),
+                self.lime_system_info,
+                org=file_org,
+            )
+
+        return len(rows)
+
+    def save_responses_cache(self, path: str, memory_map: bool = False) -> None:
+        """Save responses, e.g. with transformations, to be opened with `load`
+
+        Args:
+            path (str): Path to a folder for the responses store, a previous
+              store in it is replaced
+            memory_map (bool, optional): Write uncompressed Arrow IPC files,
+              which `load(path, memory_map=True)` maps without copying.
+              Defaults to False.
+        """
+        with ResponsesStoreWriter(
+            path, compression=None if memory_map else "zstd"
+        ) as writer:
+            writer.write(self._get_full_responses(), self.lime_system_info)
+            writer.metadata.update(
+                {"structure_file": self.structure_file, "org": self.org}
+            )
+
+    @classmethod
+    def load(
+        cls, path: str, memory_map: bool = False, lazy: bool = False, **kwargs
+    ) -> "LimeSurvey":
+        """Get a survey with responses saved by `save_responses_cache`
+
+        The structure file the responses were read with must still exist.
+
+        Args:
+            path (str): Path to the folder with saved responses
+            memory_map (bool, optional): Memory map the saved files, see
+              `read_responses_store`. Defaults to False.
+            lazy (bool, optional): Load columns on first access, see
+              `read_responses_store`. Defaults to False.
+            **kwargs: Other arguments of `LimeSurvey`, e.g. `cache_dir`
+
+        Returns:
+            LimeSurvey: Survey with the saved responses
+        """
+        metadata = read_responses_store_metadata(path)
+        survey = cls(structure_file=metadata["structure_file"], **kwargs)
+        survey.read_responses_store(path, memory_map=memory_map, lazy=lazy)
+        return survey
+
+    def read_responses_store(
+        self,
+        store_dir: str,
+        transformation_questions: dict = {},
+        memory_map: bool = False,
+        lazy: bool = False,
+    ) -> None:
+        """Read responses from a store written by `ingest_responses`
+
+        With `memory_map`, numeric columns without missing values of
+        uncompressed stores (see `save_responses_cache`) stay read-only
+        views of the memory mapped files, which all processes opening
+        the store share.
+
+        With `lazy`, only the schema and the index are read. Columns of
+        a question are loaded when first requested, e.g. by `get_responses`,
+        `count` or `plot`, and kept afterwards. `lime_system_info` is
+        loaded on first access.
+
+        Stores with the "sqlite" backend (see `ingest_responses`) are always
+        read lazily, and `memory_map` does not apply. Filters of `query`,
+        `filter_na` and `__getitem__` are evaluated in the database, and
+        `count` counts the filtered rows there.
+
+        Args:
+            store_dir (str): Path to the store folder
+            transformation_questions (dict, optional): Dict of questions
+                requiring transformation of raw data, see `read_responses`
+            memory_map (bool, optional): Whether to memory map the store files.
+                Defaults to False.
+            lazy (bool, optional): Whether to load columns on first access.
+                Defaults to False.
+        """
+        metadata = read_responses_store_metadata(store_dir)
+        if metadata.get("org") is not None:
+            self.set_org(metadata["org"])
+
+        if metadata.get("backend") == "sqlite":
+            responses_loader = SQLiteColumnLoader(store_dir, "responses")
+            self.responses = responses_loader.load([])
+            self._responses_loader = responses_loader
+            self._system_info_loader = SQLiteColumnLoader(store_dir, "system_info")
+        elif lazy:
+            responses_loader = StoreColumnLoader(store_dir, "responses", memory_map)
+            self.responses = responses_loader.load([])
+            self._responses_loader = responses_loader
+            self._system_info_loader = StoreColumnLoader(
+                store_dir, "system_info", memory_map
+            )
+        else:
+            responses, system_info = read_responses_store(
+                store_dir, memory_map=memory_map
+            )
+            self.responses = responses
+            self.lime_system_info = system_info
+
+        self._transform_responses(transformation_questions)
+
+    def _get_responses_schema(self, responses_file: str) -> _ResponsesSchema:
+        """Get column names and dtypes of a responses CSV file
+
+        Args:
+            responses_file (str): Path to the responses CSV file
+
+        Returns:
+            _ResponsesSchema: Columns of the file and their dtypes
+        """
+        # Read the header of the csv file
+        with open(responses_file, "r", encoding="utf-8-sig", newline="") as fp:
+            header = next(csv.reader(fp))
+
+        # Prepare dtype info, the first column is the index
+        columns = pd.Index(header[1:])
         renamed_columns = (
             columns.str.replace("[", "_", regex=False)
             .str.replace("]", "", regex=False)
             .str.replace("_other", "other", regex=False)
         )
-        dtype_dict, datetime_columns = self._get_dtype_info(columns, renamed_columns)
+        dtype_dict, datetime_columns = self._get_dtype_info(renamed_columns)
+
+        return _ResponsesSchema(
+            index_name=header[0],
+            columns=columns,
+            renamed_columns=renamed_columns,
+            dtype=dtype_dict,
+            datetime_columns=datetime_columns,
+        )
+
+    def _read_responses_csv(
+        self,
+        responses_file: str,
+        schema: _ResponsesSchema,
+        chunksize: Optional[int] = None,
+        skiprows: Optional[Callable[[int], bool]] = None,
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+        """Read responses CSV file with the pandas C parser
+
+        Args:
+            responses_file (str): Path to the responses CSV file
+            schema (_ResponsesSchema): Columns of the file and their dtypes
+            chunksize (int, optional): Number of rows per chunk. Defaults
+              to None, i.e. read the entire file.
+            skiprows (Callable[[int], bool], optional): Whether to skip a row
+              by its number, the header is row 0. Defaults to None.
 
-        # Read entire csv with optimal dtypes
-        responses = pd.read_csv(
+        Returns:
+            Union[pd.DataFrame, Iterator[pd.DataFrame]]: Responses or
+              an iterator of chunks if chunksize is given
+        """
+        return pd.read_csv(
             responses_file,
+            header=0,
+            names=[schema.index_name, *schema.renamed_columns],
             index_col=0,
-            dtype=dtype_dict,
-            parse_dates=datetime_columns,
+            dtype=schema.dtype,
+            parse_dates=schema.datetime_columns,
             infer_datetime_format=True,
+            chunksize=chunksize,
+            skiprows=skiprows,
         )
-        responses = responses.rename(columns=dict(zip(columns, renamed_columns)))
 
+    def _prepare_responses(
+        self,
+        responses: pd.DataFrame,
+        schema: _ResponsesSchema,
+        org: str = None,
+        warn: bool = True,
+    ) -> Tuple[pd.DataFrame, pd.DataFrame, Optional[str]]:
+        """Split read responses into question responses and system info
+
+        Args:
+            responses (pd.DataFrame): Responses read from CSV file
+            schema (_ResponsesSchema): Columns of the file and their dtypes
+            org (str): organization name
+            warn (bool, optional): Whether to warn about columns missing in the
+              structure or in the data. Defaults to True.
+
+        Returns:
+            tuple[pd.DataFrame, pd.DataFrame, Optional[str]]: Triple of
+              (question responses, system info, organization). For previously
+              processed data, the organization is `org` or taken from the data,
+              for unprocessed data it is None.
+        """
+        columns, renamed_columns = schema.columns, schema.renamed_columns
         if "datestamp" in columns:
             # CSV file is unprocessed data
             raw_data = True
+            org = None
 
             # Identify columns for survey questions
             first_question = columns.get_loc("datestamp") + 1
@@ -405,21 +1967,9 @@ class LimeSurvey:
                     raise ValueError(
                         "No organization name found in imported data. Please specify."
                     )
-                else:
-                    self.set_org(org)
-            else:
-                self.set_org(org)
-
-        # Set correct categories for categorical fields
-        for column in self.questions.index:
-            choices = self.questions.loc[column, "choices"]
-            if (column in question_responses.columns) and pd.notnull(choices):
-                question_responses.loc[:, column] = (
-                    question_responses.loc[:, column]
-                    # We expect all categorical column to be category dtype already
-                    # .astype("category")
-                    .cat.set_categories(choices.keys())
-                )
+            self._validate_org(org)
+
+        registry = self._get_registry()
 
         if raw_data:
             # Add missing columns for multiple-choice questions with contingent question
@@ -434,42 +1984,50 @@ class LimeSurvey:
             #     ...
             # For some reason, LimeSurvey does not export values for the parent <response> (B1T in this case).
             # So, here we add those columns artificially based on the contingent question values.
-            multiple_choice_questions = self.questions.index[
-                (self.questions["type"] == "multiple-choice")
-                & self.questions["contingent_of_name"].notnull()
+            multiple_choice_questions = [
+                record
+                for record in registry
+                if record.get("type") == "multiple-choice"
+                and pd.notnull(record.get("contingent_of_name"))
             ]
-            for question in multiple_choice_questions:
+            for record in multiple_choice_questions:
+                question = record.name
+                parent_choices = registry.get(record.contingent_of_name).get("choices")
                 question_responses.insert(
                     question_responses.columns.get_loc(question),
-                    self.questions.loc[question, "contingent_of_name"],
+                    record.contingent_of_name,
                     # Fill in new column based on "{question_id}other" column data
                     pd.Categorical(
                         question_responses[question].where(
                             question_responses[question].isnull(), "Y"
-                        )
+                        ),
+                        categories=(
+                            list(parent_choices) if pd.notnull(parent_choices) else None
+                        ),
                     ),
                 )
 
         # Validate data structure
         # Check for columns not listed in survey structure df
-        not_in_structure = list(
-            set(question_responses.columns) - set(self.questions.index)
-        )
+        not_in_structure = list(set(question_responses.columns) - set(registry.names))
         if not_in_structure:
-            warnings.warn(
-                f"The following columns in the data csv file are not found in the survey structure and are dropped:\n{not_in_structure}"
-            )
+            if warn:
+                warnings.warn(
+                    f"The following columns in the data csv file are not found in the survey structure and are dropped:\n{not_in_structure}"
+                )
             question_responses = question_responses.drop(not_in_structure, axis=1)
         # Ceheck for questions not listed in data csv
-        not_in_data = list(set(self.questions.index) - set(question_responses.columns))
-        if not_in_structure:
+        not_in_data = list(set(registry.names) - set(question_responses.columns))
+        if not_in_structure and warn:
             warnings.warn(
                 f"The following questions in the survey structure are not found in the data csv file:\n{not_in_data}"
             )
 
-        self.responses = question_responses
-        self.lime_system_info = system_info
+        return question_responses, system_info, org
 
+    def _transform_responses(self, transformation_questions: dict) -> None:
+        """Add responses of transformation questions, see `read_responses`"""
+        self._transformation_questions = dict(transformation_questions)
         for transform, questions in transformation_questions.items():
             if not isinstance(questions, list):
                 questions = [questions]
@@ -480,13 +2038,29 @@ class LimeSurvey:
         """Perform transformation on responses to given question
 
         Args:
-            question (str or tuple of str): Question(s) to transform
+            question (str or tuple of str): Question(s) to transform. For mental
+              health transforms, None can be given to find the question by its label.
             transform (str): Type of transform to perform
 
+        Raises:
+            ValueError: The question to transform is not found
+
         Returns:
             pd.DataFrame: Transformed DataFrame to be concatenated to self.responses
         """
 
+        if question is None:
+            if transform not in MENTAL_HEALTH_LABELS:
+                raise ValueError(f"Question must be specified for '{transform}'")
+            questions = self.find_questions(
+                MENTAL_HEALTH_LABELS[transform], fields=["label"], case_sensitive=True
+            )
+            if len(questions) != 1:
+                raise ValueError(
+                    f"Expected one question for '{transform}', found {questions}"
+                )
+            question = questions[0]
+
         transform_dict = {
             "state_anxiety": "mental_health",
             "trait_anxiety": "mental_health",
@@ -511,9 +2085,13 @@ class LimeSurvey:
                 choices=self.get_choices(question),
             )
         elif transform_dict.get(transform) == "range_to_numerical":
+            label = self._find_label_phrase(question, RANGE_LABELS)
+            if label is None:
+                raise ValueError("Question incompatible with specified condition type.")
             return range_to_numerical(
                 question_label=self.get_label(question),
                 responses=self.get_responses(question),
+                column=RANGE_LABELS[label],
             )
         elif transform_dict.get(transform) == "duration":
             # given in the form of ((start_month,start_year),(end_month,end_year))
@@ -527,6 +2105,8 @@ class LimeSurvey:
                 end_year_responses=self.get_responses(end_year, labels=True),
             )
         elif transform_dict.get(transform) == "satisfaction":
+            if self._find_label_phrase(question, [SATISFACTION_LABEL]) is None:
+                raise ValueError("Question incompatible with specified transformation.")
             return rate_satisfaction(
                 question_label=self.get_label(question),
                 responses=self.get_responses(question, labels=False),
@@ -553,7 +2133,14 @@ class LimeSurvey:
 
         survey_copy = LimeSurvey()
         survey_copy.__dict__.update(self.__dict__)
-        survey_copy.responses = copy.deepcopy(self.responses, memo_dict)
+        loader = self._responses_loader
+        if isinstance(loader, ViewColumnLoader):
+            # Views see changes of the viewed responses, copy their columns
+            survey_copy.responses = copy.deepcopy(self._get_full_responses(), memo_dict)
+        else:
+            # Stores and moved free text are not changed in place, share them
+            survey_copy.responses = copy.deepcopy(self._responses, memo_dict)
+            survey_copy._responses_loader = loader
 
         return survey_copy
 
@@ -580,7 +2167,7 @@ class LimeSurvey:
         question_group = self.get_question(question, drop_other=drop_other)
         question_type = self.get_question_type(question)
 
-        responses = self.responses.loc[:, question_group.index]
+        responses = self._get_response_columns(question_group.index)
 
         # convert multiple-choice responses
         if question_type == "multiple-choice":
@@ -590,9 +2177,10 @@ class LimeSurvey:
             # Left-hand-side slicing changed from .loc to __getitem__ to avoid categorical assignment error
             # Reason unclear, see: https://stackoverflow.com/questions/71905655/pandas-can-assign-1-column-
             # dataframe-to-series-but-not-to-dataframe-of-same-sha
-            responses[
-                question_group.index[~question_group.is_contingent]
-            ] = responses.loc[:, ~question_group.is_contingent].notnull()
+            checkbox_columns = question_group.index[~question_group.is_contingent]
+            responses[checkbox_columns] = self._get_multiple_choice_bits(
+                checkbox_columns
+            ).to_array()
 
         # replace labels
         if labels:
@@ -601,7 +2189,7 @@ class LimeSurvey:
                 if "SQ" in question:
                     question = question.split("_")[0]
                 # Get column labels for entire question group as dict
-                rename = self.get_choices(question)
+                rename = self._get_choices(question)
                 # Rename column names
                 responses = responses.rename(columns=rename)
 
@@ -622,13 +2210,17 @@ class LimeSurvey:
         return responses
 
     def __getitem__(
-        self, key: Union[pd.Series, pd.DataFrame, str, list, tuple]
+        self, key: Union[Filter, pd.Series, pd.DataFrame, str, list, tuple]
     ) -> "LimeSurvey":
         """Retrieve or slice the responses DataFrame
 
+        Row filters with a `Filter` or a boolean Series and column filters
+        return views of the responses (see `_view_rows`), which copy
+        columns only when they are requested.
+
         Args:
-            key (pd.Series, pd.DataFrame, str, list, or tuple): A key for
-                DataFrame slicing or get_responses method
+            key (Filter, pd.Series, pd.DataFrame, str, list, or tuple): A key
+                for DataFrame slicing or get_responses method
 
         Returns:
             LimeSurvey: A copy of LimeSurvey instance with filtered responses
@@ -636,10 +2228,18 @@ class LimeSurvey:
         """
         filtered_survey = self.__copy__()
 
+        # A filter, e.g. survey[Answer("A3", "A5") & ~Missing("B1")]
+        # is interpreted as a row filter, see `get_filter_mask`
+        if isinstance(key, Filter):
+            filtered_survey = self._view_rows(np.flatnonzero(self.get_filter_mask(key)))
         # A bool-valued Series, e.g. survey[survey.responses["A3"] == "A5"]
         # is interpreted as a row filter
-        if isinstance(key, (pd.Series, pd.DataFrame)):
-            filtered_survey.responses = filtered_survey.responses[key]
+        elif isinstance(key, (pd.Series, pd.DataFrame)):
+            mask = self._get_row_mask(key)
+            if mask is not None:
+                filtered_survey = self._view_rows(np.flatnonzero(mask))
+            else:
+                filtered_survey.responses = self._get_full_responses()[key]
         # A question id as string, e.g. survey["A3"]
         # is interpreted as a column filter
         elif isinstance(key, str):
@@ -650,9 +2250,14 @@ class LimeSurvey:
             columns = [
                 column
                 for question in key
-                for column in filtered_survey.get_question(question).index.to_list()
+                for column in filtered_survey._get_question_columns(question)
             ]
-            filtered_survey.responses = filtered_survey.responses[columns]
+            if isinstance(self._responses_loader, SQLiteColumnLoader):
+                filtered_survey.responses = filtered_survey._get_response_columns(
+                    columns
+                )
+            else:
+                filtered_survey = self._view_columns(columns)
         # Two args, e.g. survey[survey.responses["A3"] == "A5", "B1"]
         # or survey[1:10, ["B1", "C1_SQ001"]]
         # is interpreted as (row filter, column filter)
@@ -663,8 +2268,9 @@ class LimeSurvey:
         else:
             raise SyntaxError(
                 """
-                Input must be of type pd.Series, pd.DataFrame, str, list, or tuple.
+                Input must be of type Filter, pd.Series, pd.DataFrame, str, list, or tuple.
                 Examples:
+                    Filter: survey[Answer("A3", "A5") & ~Missing("B1")]
                     pd.Series or pd.DataFrame: survey[survey.responses["A3"] == "A5"]
                     str: survey["A3"]
                     list of str: survey[["C3_SQ001", "C3_Sq002"]]
@@ -677,6 +2283,18 @@ class LimeSurvey:
     def query(self, expr: str) -> "LimeSurvey":
         """Filter responses DataFrame with a boolean expression
 
+        For responses of an SQLite store (see `read_responses_store`),
+        comparisons of columns of the store with values, combined with
+        `&`, `|` and `~`, are evaluated in the database. Otherwise "==",
+        "!=", "in" and "not in" comparisons of answers to single-choice,
+        multiple-choice and array questions are evaluated on the answer
+        index, see `get_answer_index`.
+
+        Responses selected on the answer index are a view of this survey:
+        columns are copied from it when first requested. Until then, the
+        view sees changes of `self.responses` made in place, but not
+        responses replaced afterwards, e.g. by `add_responses`.
+
         Args:
             expr (str): Condition str for pd.DataFrame.query().
                 E.g. "A6 == 'A3' & "B2 == 'A5'"
@@ -684,11 +2302,42 @@ class LimeSurvey:
         Returns:
             LimeSurvey: LimeSurvey with filtered responses
         """
+        try:
+            node = parse_query(expr)
+        except ValueError:
+            node = None
+        loader = self._get_database_loader([])
+        if loader is not None and node is not None:
+            condition = loader.translate(node)
+            if condition is not None:
+                return self._filter_in_database(loader, *condition)
+
+        # Combine masks of answers of the answer index
+        if node is not None:
+            try:
+                index = self.get_answer_index(node.columns)
+            except ValueError:
+                index = None
+            if index is not None and index.supports(node):
+                return self._view_rows(
+                    np.flatnonzero(unpack_mask(index.evaluate(node), index.n_rows))
+                )
+
+        # Evaluate the query on the columns it refers to only
+        if node is not None and all(
+            self._has_response_column(column) for column in node.columns
+        ):
+            responses = self._get_response_columns(sorted(node.columns))
+        else:
+            responses = self._get_full_responses()
+        mask = self._get_row_mask(responses.eval(expr))
+        if mask is not None:
+            return self._view_rows(np.flatnonzero(mask))
 
         # Make copy of LimeSurvey instance
         filtered_survey = self.__copy__()
         # Filter responses DataFrame
-        filtered_survey.responses = self.responses.query(expr)
+        filtered_survey.responses = self._get_full_responses().query(expr)
 
         return filtered_survey
 
@@ -696,22 +2345,352 @@ class LimeSurvey:
         """Filter out entries in responses DataFrame with no answer
         to specified question.
 
+        Unless responses are read from an SQLite store, the filtered survey
+        is a view of this one: columns are copied from it when first
+        requested. Until then, the view sees changes of `self.responses`
+        made in place, but not responses replaced afterwards, e.g. by
+        `add_responses`.
+
         Args:
             question (str): Question to which the entries are filtered.
 
         returns:
             LimeSurvey: LimeSurvey with filtered responses.
         """
+        loader = self._get_database_loader([question])
+        if loader is not None:
+            return self._filter_in_database(
+                loader, f"{quote_identifier(question)} IS NOT NULL"
+            )
 
-        # Make copy of LimeSurvey instance
+        return self._view_rows(
+            np.flatnonzero(self._get_response_columns([question])[question].notna())
+        )
+
+    def get_filter_mask(self, where: Filter) -> np.ndarray:
+        """Get rows selected by a filter
+
+        Masks of filters and of their operands are kept until responses are
+        replaced, so a filter used by `__getitem__`, `count` and `plot` is
+        evaluated once. Answers of single-choice, multiple-choice and array
+        columns are looked up in the answer index, see `get_answer_index`.
+
+        Args:
+            where (Filter): Row filter, e.g. `Answer("A6", "A3") & ~Missing("B2")`
+
+        Raises:
+            ValueError: A question of `Answer` has more than one column
+
+        Returns:
+            np.ndarray: Boolean mask of rows
+        """
+        return unpack_mask(self._get_filter_bits(where), len(self._responses))
+
+    def _get_filter_columns(self, where: Filter) -> list:
+        """Get names of response columns a filter selects rows by"""
+        if isinstance(where, Answer):
+            return [self._get_answer_column(where)]
+        if isinstance(where, Missing):
+            return self._get_missing_columns(where)
+        return [
+            column
+            for operand in where.filters
+            for column in self._get_filter_columns(operand)
+        ]
+
+    def _get_answer_column(self, where: Answer) -> str:
+        """Get the response column of an `Answer` filter"""
+        column = where.question
+        if not self._has_response_column(column):
+            columns = self._get_question_columns(column, drop_other=True)
+            if len(columns) != 1:
+                raise ValueError(
+                    f"Question '{column}' has columns {columns}, select "
+                    "answers of one column, e.g. of a subquestion"
+                )
+            column = columns[0]
+        return column
+
+    def _get_missing_columns(self, where: Missing) -> list:
+        """Get the response columns of a `Missing` filter"""
+        if self._has_response_column(where.question):
+            return [where.question]
+        return self._get_question_columns(where.question)
+
+    def _get_filter_bits(self, where: Filter) -> np.ndarray:
+        """Get rows selected by a filter as a packed mask, see `get_filter_mask`"""
+        if self._responses_handed_out and self._filter_masks:
+            self._check_responses_edited(self._get_filter_columns(where))
+        return self._evaluate_filter(where)
+
+    def _evaluate_filter(self, where: Filter) -> np.ndarray:
+        """Get a packed mask of a filter, evaluate it if it is not cached"""
+        bits = self._filter_masks.get(where)
+        if bits is not None:
+            return bits
+
+        n_rows = len(self._responses)
+        if isinstance(where, Answer):
+            column = self._get_answer_column(where)
+            node = Compare(column, "in", where.values)
+            try:
+                index = self.get_answer_index([column])
+            except ValueError:
+                index = None
+            if index is not None and index.supports(node):
+                bits = index.evaluate(node)
+            else:
+                values = self._get_response_columns([column])[column]
+                bits = pack_mask(values.isin(where.values).to_numpy())
+                self._record_response_fingerprints([column])
+        elif isinstance(where, Missing):
+            columns = self._get_missing_columns(where)
+            responses = self._get_response_columns(columns)
+            bits = pack_mask(responses.isna().all(axis=1).to_numpy())
+            self._record_response_fingerprints(columns)
+        elif isinstance(where, (AllOf, AnyOf, NoneOf)):
+            bits = np.zeros((n_rows + 7) // 8, dtype=np.uint8)
+            if isinstance(where, AllOf):
+                bits = invert_mask(bits, n_rows)
+                for operand in where.filters:
+                    bits &= self._evaluate_filter(operand)
+            else:
+                for operand in where.filters:
+                    bits |= self._evaluate_filter(operand)
+                if isinstance(where, NoneOf):
+                    bits = invert_mask(bits, n_rows)
+        else:
+            raise ValueError(f"Unexpected filter {where}")
+
+        self._filter_masks[where] = bits
+        return bits
+
+    def _has_response_column(self, column: str) -> bool:
+        """Whether responses have a column, loaded or not"""
+        loader = self._responses_loader
+        return column in self._responses.columns or (
+            loader is not None and column in loader.columns
+        )
+
+    def _get_row_mask(
+        self, key: Union[pd.Series, pd.DataFrame]
+    ) -> Optional[np.ndarray]:
+        """Get a boolean row filter as an array
+
+        Args:
+            key (Union[pd.Series, pd.DataFrame]): Row filter
+
+        Returns:
+            Optional[np.ndarray]: Boolean mask of rows, None if `key` is not
+              a boolean Series with the index of responses
+        """
+        if (
+            isinstance(key, pd.Series)
+            and pd.api.types.is_bool_dtype(key.dtype)
+            and key.index.equals(self._responses.index)
+        ):
+            return key.to_numpy(dtype=bool, na_value=False)
+        return None
+
+    def _view_rows(self, positions: np.ndarray) -> "LimeSurvey":
+        """Get a copy with a view of rows of responses
+
+        The copy holds positions of the rows only, columns are copied from
+        this survey when requested (see `ViewColumnLoader`). Filters of the
+        copy select positions among the rows of this survey directly. As
+        pandas views, the copy sees changes of responses made in place.
+
+        Args:
+            positions (np.ndarray): Increasing positions of rows
+
+        Returns:
+            LimeSurvey: LimeSurvey with filtered responses
+        """
         filtered_survey = self.__copy__()
-        # Filter responses DataFrame
-        filtered_survey.responses = filtered_survey.responses[
-            filtered_survey.responses[question].notna()
+        loader = self._responses_loader
+        if isinstance(loader, SQLiteColumnLoader):
+            # Rows of the database are selected by SQLite
+            filtered_survey.responses = self._responses.iloc[positions]
+            filtered_survey._responses_loader = loader.take(positions)
+            return filtered_survey
+
+        filtered_survey.responses = self._responses.iloc[positions, :0]
+        filtered_survey._responses_loader = self._get_view().take(positions)
+        return filtered_survey
+
+    def _view_columns(self, columns: list) -> "LimeSurvey":
+        """Get a copy with a view of columns of responses
+
+        Args:
+            columns (list): Names of columns
+
+        Raises:
+            KeyError: A column is not in responses
+
+        Returns:
+            LimeSurvey: LimeSurvey with the columns
+        """
+        missing = [
+            column for column in columns if not self._has_response_column(column)
         ]
+        if missing:
+            raise KeyError(f"{missing} not in index")
 
+        filtered_survey = self.__copy__()
+        filtered_survey.responses = self._responses.iloc[:, :0]
+        filtered_survey._responses_loader = self._get_view().select(columns)
         return filtered_survey
 
+    def _get_view(self) -> ViewColumnLoader:
+        """Get a view of all rows and columns of responses
+
+        Columns not loaded yet are loaded into this survey and kept, so
+        views of the survey (and the survey itself) share them. All
+        columns, e.g. for `responses` of a view, are loaded without keeping
+        them, as by `_get_full_responses`.
+        """
+        loader = self._responses_loader
+        # Columns of a view are loaded from the viewed responses, unless
+        # columns were added to this survey
+        if isinstance(loader, ViewColumnLoader) and all(
+            column in loader.columns for column in self._responses.columns
+        ):
+            return loader
+        if loader is None:
+            return ViewColumnLoader(self._responses)
+        return ViewColumnLoader(
+            self._responses,
+            loader=loader,
+            load=functools.partial(self._load_view_columns, loader),
+        )
+
+    def _load_view_columns(self, loader, columns: list) -> pd.DataFrame:
+        """Load columns for views of responses, see `_get_view`
+
+        Args:
+            loader: Loader of responses when the view was created
+            columns (list): Names of columns
+
+        Returns:
+            pd.DataFrame: Responses of the columns
+        """
+        # Responses replaced since, e.g. with other rows, are not viewed
+        if self._responses_loader is not loader:
+            return loader.load(columns)
+        # Like `_get_full_responses`, loading all columns does not keep them
+        requested = set(columns) | set(self._responses.columns)
+        if all(column in requested for column in loader.columns):
+            return loader.load(columns)
+        return self._get_response_columns(columns)
+
+    def _get_database_loader(
+        self, columns: Iterable[str]
+    ) -> Optional[SQLiteColumnLoader]:
+        """Get the loader of responses read from an SQLite store
+
+        Args:
+            columns (Iterable[str]): Names of columns that must be in the store
+
+        Returns:
+            Optional[SQLiteColumnLoader]: None if responses are not read from
+              an SQLite store or a column is not in it, e.g. a transformation
+        """
+        loader = self._responses_loader
+        if not isinstance(loader, SQLiteColumnLoader):
+            return None
+        if any(column not in loader.dtypes for column in columns):
+            return None
+        return loader
+
+    def _filter_in_database(
+        self, loader: SQLiteColumnLoader, condition: str, params: Sequence = ()
+    ) -> "LimeSurvey":
+        """Filter responses of an SQLite store with an SQL condition
+
+        Args:
+            loader (SQLiteColumnLoader): Loader of the responses
+            condition (str): SQL condition
+            params (Sequence, optional): Parameters of the condition. Defaults
+              to (), i.e. none.
+
+        Returns:
+            LimeSurvey: LimeSurvey with filtered responses
+        """
+        filtered_survey = self.__copy__()
+        # Loaded and added columns are filtered in memory
+        filtered_survey.responses = self._responses[loader.mask(condition, params)]
+        filtered_survey._responses_loader = loader.filter(condition, params)
+        return filtered_survey
+
+    def _count_in_database(
+        self,
+        loader: SQLiteColumnLoader,
+        question: str,
+        question_type: str,
+        labels: bool,
+        dropna: bool,
+    ) -> Optional[Tuple[pd.DataFrame, int]]:
+        """Count responses of an SQLite store in the database, see `count`
+
+        Multiple-choice questions and categorical columns of single-choice
+        and array questions are counted, counts are formatted as by `count`.
+
+        Returns:
+            Optional[tuple[pd.DataFrame, int]]: Pair of (counts, number of
+              responses), None if the question is not counted in the database
+        """
+        question_group = self.get_question(question, drop_other=True)
+        columns = list(question_group.index)
+        if question_type == "multiple-choice" and len(columns) > 1:
+            counts = loader.count_non_null(columns).rename_axis(
+                question_group.index.name
+            )
+            if labels:
+                counts = counts.rename(self._get_choices(question))
+            counts_df = pd.DataFrame(counts, columns=[self.get_label(question)])
+            return counts_df, loader.count_rows()
+        if question_type not in ("single-choice", "array") or not all(
+            isinstance(loader.dtypes[column], pd.CategoricalDtype) for column in columns
+        ):
+            return None
+
+        column_counts = {}
+        for column in columns:
+            dtype = loader.dtypes[column]
+            values = dict(loader.count_values(column))
+            n_missing = values.pop(None, 0)
+            counts = [values.get(category, 0) for category in dtype.categories]
+            choices = question_group.loc[column, "choices"]
+            name = question_group.loc[column, "label"] if labels else column
+            # As in `get_responses`, missing values are labeled
+            if labels and pd.notnull(choices):
+                categories = [
+                    choices.get(category, category) for category in dtype.categories
+                ]
+                categories.append(self.na_label)
+                counts.append(n_missing)
+                index = pd.CategoricalIndex(
+                    categories, categories=categories, ordered=dtype.ordered
+                )
+            elif dropna or not n_missing:
+                index = pd.CategoricalIndex(dtype.categories, dtype=dtype)
+            else:
+                index = pd.CategoricalIndex([*dtype.categories, np.nan], dtype=dtype)
+                counts.append(n_missing)
+            column_counts[name] = pd.Series(counts, index=index, name=name)
+
+        n_responses = loader.count_rows()
+        if len(columns) == 1:
+            counts_df = pd.DataFrame(next(iter(column_counts.values())))
+        elif len(column_counts) == len(columns) and n_responses:
+            counts_df = pd.DataFrame(column_counts)
+        else:
+            # Columns with the same label or no responses, which pandas
+            # counts differently
+            return None
+        return counts_df, n_responses
+
+    @_filter_rows
     def count(
         self,
         question: str,
@@ -734,6 +2713,9 @@ class LimeSurvey:
             percents (bool, optional): Output percents instead of counts.
               Calculted with respent to the total number of repondents.
               Defaults to False.
+            where (Filter, optional): Count responses of rows selected by the
+              filter only, e.g. `Answer("A6", "A3")`, see `get_filter_mask`.
+              Defaults to None.
 
         Raises:
             AssertionError: Unexpected question type
@@ -750,13 +2732,38 @@ class LimeSurvey:
               and one additional row. Both called "Total" and contains totals or, if
               total count contains misleading data, NA
         """
+        counts_df = None
         if responses is None:
             question_type = self.get_question_type(question)
-            responses = self.get_responses(question, labels=labels, drop_other=True)
-        else:
-            responses = responses
-
-        if responses.shape[1] == 1:
+            columns = self._get_question_columns(question, drop_other=True)
+            loader = self._get_database_loader(columns)
+            counted = None
+            if loader is not None:
+                counted = self._count_in_database(
+                    loader, question, question_type, labels, dropna
+                )
+            if counted is not None:
+                # Responses of an SQLite store counted in the database
+                counts_df, n_responses = counted
+            elif question_type == "multiple-choice" and len(columns) > 1:
+                # Count checked boxes on packed bits
+                bits = self._get_multiple_choice_bits(columns)
+                counts = bits.count().rename_axis(
+                    self._get_questions_frame().index.name
+                )
+                if labels:
+                    counts = counts.rename(self._get_choices(question))
+                counts_df = pd.DataFrame(counts, columns=[self.get_label(question)])
+                n_responses = bits.n_rows
+            else:
+                responses = self.get_responses(question, labels=labels, drop_other=True)
+        if counts_df is None:
+            n_responses = responses.shape[0]
+
+        if counts_df is not None:
+            # Question counted in the database or on bits
+            pass
+        elif responses.shape[1] == 1:
             # If it consist of only one column, i.e. free, single choice, or
             # single column
             counts_df = pd.DataFrame(
@@ -794,7 +2801,7 @@ class LimeSurvey:
             # Correct for each question type
             if question_type == "multiple-choice":
                 # Sums by row should be equal to number of responses
-                counts_df.iloc[:, -1] = responses.shape[0]
+                counts_df.iloc[:, -1] = n_responses
                 # Sums by column do not make sense, so we replace them by NA
                 counts_df.iloc[-1, :] = pd.NA
             elif question_type == "array":
@@ -809,19 +2816,20 @@ class LimeSurvey:
         # to make it consistent between different question types and
         # function argument values
         if percents:
-            counts_df = np.round(100 * counts_df / responses.shape[0], 1)
+            counts_df = np.round(100 * counts_df / n_responses, 1)
 
         return counts_df
 
-    def _get_dtype_info(self, columns, renamed_columns):
+    def _get_dtype_info(self, columns):
         """Get dtypes for columns in data csv
 
         Args:
-            columns (list): List of column names from data csv
-            renamed_columns (list): List of column names modified to match self.questions entries
+            columns (list): List of column names from data csv modified
+              to match self.questions entries
 
         Returns:
-            dict: Dictionary of column names and dtypes
+            dict: Dictionary of column names and dtypes. Columns with answer
+              options get `pd.CategoricalDtype` with the final categories.
             list: List of datetime columns
         """
 
@@ -829,14 +2837,23 @@ class LimeSurvey:
         dtype_dict = {}
         # Compile list of datetime columns (because pd.read_csv takes this as separate arg)
         datetime_columns = []
+        # Choices dicts are shared between columns, so are their dtypes
+        categorical_dtypes = {}
 
-        for column, renamed_column in zip(columns, renamed_columns):
+        registry = self._get_registry()
+        for column in columns:
             # First try to infer dtype from XML structure information
-            if renamed_column in self.questions.index:
-                response_format = self.questions.loc[renamed_column, "format"]
+            record = registry.get(column)
+            if record is not None:
+                response_format = record.get("format")
+                choices = record.get("choices")
                 # Categorical dtype for all questions with answer options
-                if pd.notnull(self.questions.loc[renamed_column, "choices"]):
-                    dtype_dict[column] = "category"
+                if pd.notnull(choices):
+                    if id(choices) not in categorical_dtypes:
+                        categorical_dtypes[id(choices)] = pd.CategoricalDtype(
+                            list(choices.keys())
+                        )
+                    dtype_dict[column] = categorical_dtypes[id(choices)]
                 elif response_format == "date":
                     dtype_dict[column] = "str"
                     datetime_columns.append(column)
@@ -875,6 +2892,7 @@ class LimeSurvey:
 
         return dtype_dict, datetime_columns
 
+    @_filter_rows
     def plot(
         self,
         question,
@@ -972,6 +2990,8 @@ class LimeSurvey:
                 x-Axis and answers to 'compare_with' on the y-Axis.
                 size of the bubbles depends on overleap percentage and the
                 base-value given in bubble_size or on the float given.
+            'where': plot responses of rows selected by a filter only, e.g.
+                Answer("A6", "A3") & ~Missing("B2"), see `get_filter_mask`
         """
         if kind is not None:
             raise NotImplementedError(
@@ -1036,7 +3056,7 @@ class LimeSurvey:
             counts_df = self.count(
                 question, labels=True, percents=True, add_totals=True
             )
-            counts_df.loc[:, "Total"] = self.responses.shape[0]
+            counts_df.loc[:, "Total"] = len(self._get_response_columns([]))
             counts_df.iloc[-1, :] = np.nan
             counts_df.iloc[:, 0] = counts_df.iloc[:, 0].astype("float64")
             fig, ax = multiple_choice_bar_plot(
@@ -1050,7 +3070,7 @@ class LimeSurvey:
                 percents=False,
                 add_totals=True,
             )
-            counts_df.loc["Total", "Total"] = self.responses.shape[0]
+            counts_df.loc["Total", "Total"] = len(self._get_response_columns([]))
             fig, ax = likert_bar_plot(
                 counts_df,
                 theme=theme,
@@ -1266,7 +3286,7 @@ class LimeSurvey:
                     "Comparison plot is only implemented for single-choice non-numeric questions."
                     f"{key} is either not a single-choice question or a numeric question."
                 )
-            possible_answers = list(self.questions.loc[key, "choices"])
+            possible_answers = list(self._get_choices(key))
             if "-oth-" in possible_answers:
                 possible_answers.remove("-oth-")
             # If `all` is specified {"A6": "all"}/{"A6": ["all"]}, use all answer possibilities
@@ -1306,7 +3326,7 @@ class LimeSurvey:
                     # Skip comparisons if filtered DataFrame has no counts of valid answers
                     # Last entry corresponds to 'No Answer'
                     if counts_df[:-1].sum(axis=0)[0] > 0:
-                        list_of_labels.append(self.get_choices(key)[value])
+                        list_of_labels.append(self._get_choices(key)[value])
                         list_of_counts_df.append(counts_df)
                         list_of_responses.append(filtered_responses)
 
@@ -1337,9 +3357,9 @@ class LimeSurvey:
                     # Last entry corresponds to 'No Answer'
                     if counts_df[:-1].sum(axis=0)[0] > 0:
                         list_of_labels.append(
-                            self.get_choices(first_key)[first_value]
+                            self._get_choices(first_key)[first_value]
                             + " + "
-                            + self.get_choices(second_key)[second_value]
+                            + self._get_choices(second_key)[second_value]
                         )
                         list_of_counts_df.append(counts_df)
                         list_of_responses.append(filtered_responses)
@@ -1376,8 +3396,23 @@ class LimeSurvey:
             filtered_responses (DataFrame): Dataframe of filtered response dataframe
             countes_filtered_responses (DataFrame): Dataframe of counts of filtered response dataframe
         """
+        filter_columns = [
+            self._get_question_columns(key, drop_other=True) for key, _ in args
+        ]
+        index = None
+        if all(len(columns) == 1 for columns in filter_columns):
+            try:
+                index = self.get_answer_index(columns[0] for columns in filter_columns)
+            except ValueError:
+                pass
+        if index is not None:
+            # Combine masks of answers, built once for all filter values
+            bits = index.select(
+                (columns[0], value) for columns, (_, value) in zip(filter_columns, args)
+            )
+            indices = np.flatnonzero(unpack_mask(bits, index.n_rows))
         # Simple filtering
-        if len(args) == 1:
+        elif len(args) == 1:
             key, value = args[0]
             indices, _ = np.where(
                 self.get_responses(key, labels=False, drop_other=True) == value
@@ -1569,18 +3604,28 @@ class LimeSurvey:
             pd.DataFrame: Subset from `self.questions` with corresponding rows
         """
 
-        questions_subdf = self.questions[
-            (self.questions["question_group"] == question)
-            | (self.questions.index == question)
-        ]
-
-        if questions_subdf.empty:
+        question_index = self._get_question_index()
+        if question not in question_index:
             raise ValueError(f"Unexpected question code '{question}'")
 
-        if drop_other:
-            questions_subdf = questions_subdf[~questions_subdf.is_contingent]
+        positions = question_index.get_positions(question, drop_other=drop_other)
 
-        return questions_subdf
+        return self._get_questions_frame().iloc[positions]
+
+    def _get_question_columns(self, question: str, drop_other: bool = False) -> list:
+        """Get column names of a question or subquestion
+
+        Same as `self.get_question(question, drop_other).index.to_list()`,
+        but without slicing `self.questions`.
+
+        Raises:
+            ValueError: There is no such question or subquestion
+        """
+        question_index = self._get_question_index()
+        if question not in question_index:
+            raise ValueError(f"Unexpected question code '{question}'")
+
+        return question_index.get_columns(question, drop_other=drop_other)
 
     def add_question(
         self, name: str, responses: Union[pd.Series, pd.DataFrame] = None, **kwargs
@@ -1600,8 +3645,8 @@ class LimeSurvey:
         if not kwargs.get("is_contingent"):
             kwargs["is_contingent"] = False
 
-        self.questions = pd.concat(
-            [self.questions, pd.DataFrame([kwargs], index=[name])]
+        self._set_registry(
+            self._get_registry().extended([QuestionRecord(name, **kwargs)])
         )
 
         # Add responses to self.responses if given
@@ -1637,8 +3682,11 @@ class LimeSurvey:
             if isinstance(responses, pd.Series):
                 responses.name = question[0]
 
-        self.responses = pd.concat([self.responses, responses], axis=1)
+        # In lazy mode, columns not loaded yet stay with the loader
+        self._responses = pd.concat([self._responses, responses], axis=1)
+        self._drop_response_caches()
 
+    @_memoize_question_metadata
     def get_question_type(self, question: str) -> str:
         """Get question type and validate it
 
@@ -1653,8 +3701,10 @@ class LimeSurvey:
             str: Question type like "single-choice", "array", etc.
         """
 
-        question_group = self.get_question(question)
-        question_types = question_group.type.unique()
+        question_index = self._get_question_index()
+        if question not in question_index:
+            raise ValueError(f"Unexpected question code '{question}'")
+        question_types = question_index.get_types(question)
 
         if len(question_types) > 1:
             raise AssertionError(
@@ -1667,6 +3717,7 @@ class LimeSurvey:
 
         return question_type
 
+    @_memoize_question_metadata
     def get_label(self, question: str) -> str:
         """Get label for the corresponding column or group of colums
 
@@ -1677,14 +3728,11 @@ class LimeSurvey:
             str: question label/title
         """
 
-        question_info = self.get_question(question)
-
-        if question_info.shape[0] > 1:
-            label = question_info.question_label[0]
-        else:
-            label = question_info.label[0]
+        question_index = self._get_question_index()
+        if question not in question_index:
+            raise ValueError(f"Unexpected question code '{question}'")
 
-        return label
+        return question_index.label_by_group[question]
 
     def get_choices(self, question: str) -> dict:
         """Get choices of a question
@@ -1699,24 +3747,23 @@ class LimeSurvey:
             question (str): Name of question or subquestion to retrieve
 
         Returns:
-            dict: dict of choices mappings
+            dict: A copy of the choices mapping, which may be modified
         """
+        choices = self._get_choices(question)
+        return None if choices is None else dict(choices)
 
-        question_info = self.get_question(question)
-        question_info = question_info[~question_info.is_contingent]
-        question_type = self.get_question_type(question)
+    @_memoize_question_metadata
+    def _get_choices(self, question: str) -> Optional[dict]:
+        """Get choices of a question, see `get_choices`
 
-        # If set of multiple-choice questions
-        if (question_info.shape[0] > 1) and (question_type == "multiple-choice"):
-            # Flatten nested dict and get choice text directly for multiple-choice
-            choices_dict = {
-                index: row.choices["Y"] for index, row in question_info.iterrows()
-            }
-        # If single-choice, free, individual subquestion, or array
-        else:
-            choices_dict = question_info.choices[0]
+        The dict is memoized and may be shared by questions with the same
+        choices, do not modify it.
+        """
 
-        return choices_dict
+        # Validate question type
+        self.get_question_type(question)
+
+        return self._get_question_index().get_choices(question)
 
     def export_to_file(
         self,
@@ -1745,7 +3792,7 @@ class LimeSurvey:
         if not directory:
             directory = os.getcwd()
 
-        data = self.responses.copy()
+        data = self._get_full_responses().copy()
         columns_to_drop = []
         # Drop user specified questions
         if drop_columns:
@@ -1758,10 +3805,11 @@ class LimeSurvey:
                 )
             columns_to_drop = columns_to_drop + drop_columns
         # Drop questions with free input
-        columns_to_drop = (
-            columns_to_drop
-            + self.questions[self.questions["format"] == "longtext"].index.to_list()
-        )
+        columns_to_drop = columns_to_drop + [
+            record.name
+            for record in self._get_registry()
+            if record.get("format") == "longtext"
+        ]
 
         data.drop(columns=columns_to_drop, inplace=True)
         new_data = data.copy()
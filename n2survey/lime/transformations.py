@@ -4,6 +4,9 @@ import numpy as np
 import pandas as pd
 
 __all__ = [
+    "MENTAL_HEALTH_LABELS",
+    "RANGE_LABELS",
+    "SATISFACTION_LABEL",
     "rate_supervision",
     "rate_mental_health",
     "range_to_numerical",
@@ -11,6 +14,27 @@ __all__ = [
     "rate_satisfaction",
 ]
 
+# Label phrases of questions for each mental health condition
+MENTAL_HEALTH_LABELS = {
+    "state_anxiety": "I feel calm",
+    "trait_anxiety": "calm, cool and collected",
+    "depression": "interest or pleasure",
+}
+
+# Label phrases of questions with ranges and names of their numerical columns
+RANGE_LABELS = {
+    "For how long have you been working on your PhD without pay": "noincome_duration",
+    "Right now, what is your monthly net income for your work at your research organization": "income_amount",
+    "How much do you pay for your rent and associated living costs per month in euros": "costs_amount",
+    "What was or is the longest duration of your contract or stipend related to your PhD project": "contract_duration",
+    "How many holidays per year can you take according to your contract or stipend": "holiday_amount",
+    "On average, how many hours do you typically work per week in total": "hours_amount",
+    "How many days did you take off (holiday) in the past year": "holidaytaken_amount",
+}
+
+# Label phrase of satisfaction questions
+SATISFACTION_LABEL = "satisfied"
+
 
 def rate_supervision(
     question_label: str,
@@ -130,18 +154,20 @@ def rate_mental_health(
 
     # Infer condition type if not provided
     if condition is None:
-        if "I feel calm" in question_label:
-            condition = "state_anxiety"
-        elif "calm, cool and collected" in question_label:
-            condition = "trait_anxiety"
-        elif "interest or pleasure" in question_label:
-            condition = "depression"
-        else:
+        condition = next(
+            (
+                condition
+                for condition, label in MENTAL_HEALTH_LABELS.items()
+                if label in question_label
+            ),
+            None,
+        )
+        if condition is None:
             raise ValueError("Question incompatible with any supported condition type.")
 
     # Set up condition-specific parameters
     if condition == "state_anxiety":
-        if "I feel calm" not in question_label:
+        if MENTAL_HEALTH_LABELS["state_anxiety"] not in question_label:
             raise ValueError("Question incompatible with specified condition type.")
         num_subquestions = 6
         base_score = 10 / 3
@@ -152,7 +178,7 @@ def rate_mental_health(
         choice_codes = ["A1", "A2", "A3"]
 
     elif condition == "trait_anxiety":
-        if "calm, cool and collected" not in question_label:
+        if MENTAL_HEALTH_LABELS["trait_anxiety"] not in question_label:
             raise ValueError("Question incompatible with specified condition type.")
         num_subquestions = 8
         base_score = 5 / 2
@@ -171,7 +197,7 @@ def rate_mental_health(
         classes = ["no or low anxiety", "moderate anxiety", "high anxiety"]
         choice_codes = ["A1", "A2", "A3"]
     elif condition == "depression":
-        if "interest or pleasure" not in question_label:
+        if MENTAL_HEALTH_LABELS["depression"] not in question_label:
             raise ValueError("Question incompatible with specified condition type.")
         num_subquestions = 8
         base_score = 1
@@ -272,32 +298,28 @@ def strRange_to_intRange(strAnswer: str) -> int:
         return np.NaN  # Handy when computing mean, median,... using numpy
 
 
-def range_to_numerical(question_label: str, responses: pd.DataFrame) -> pd.DataFrame:
+def range_to_numerical(
+    question_label: str, responses: pd.DataFrame, column: str = None
+) -> pd.DataFrame:
 
     """Get numerical values from responses with ranges in a non-numerical datatype.
 
     Args:
         question_label (str): Question label to use for transformation type inference
         responses (pd.DataFrame): DataFrame containing responses data
+        column (str, optional): Name of the numerical column, one of the values
+            of `RANGE_LABELS`. By default, it is inferred from `question_label`.
 
     Returns:
         pd.DataFrame: Numerical values for each range
     """
 
-    check_condition = {
-        "For how long have you been working on your PhD without pay": "noincome_duration",
-        "Right now, what is your monthly net income for your work at your research organization": "income_amount",
-        "How much do you pay for your rent and associated living costs per month in euros": "costs_amount",
-        "What was or is the longest duration of your contract or stipend related to your PhD project": "contract_duration",
-        "How many holidays per year can you take according to your contract or stipend": "holiday_amount",
-        "On average, how many hours do you typically work per week in total": "hours_amount",
-        "How many days did you take off (holiday) in the past year": "holidaytaken_amount",
-    }
-
     # Assign new question label
-    for label in check_condition:
-        if label in question_label:
-            new_question_label = check_condition[label]
+    new_question_label = column
+    if new_question_label is None:
+        for label in RANGE_LABELS:
+            if label in question_label:
+                new_question_label = RANGE_LABELS[label]
 
     # Check if correct question has been chosen
     if new_question_label is None:
@@ -421,7 +443,7 @@ def rate_satisfaction(
         pd.DataFrame: Rounded satisfaction ratings and classifications
     """
     # Infer labels from question
-    if "satisfied" in question_label:
+    if SATISFACTION_LABEL in question_label:
         label = "satisfaction"
     else:
         raise ValueError("Question incompatible with specified transformation.")
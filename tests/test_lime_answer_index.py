@@ -0,0 +1,157 @@
+"""Test the inverted index of answers to rows"""
+import copy
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from n2survey.lime.answer_index import AnswerIndex
+from n2survey.lime.bitmatrix import unpack_mask
+from n2survey.lime.query import parse_query
+from tests.common import BaseTestCase, BaseTestLimeSurvey2021WithResponsesCase
+
+
+class TestAnswerIndex(BaseTestCase):
+    """Test AnswerIndex on a small DataFrame"""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.frame = pd.DataFrame(
+            {
+                "A6": pd.Categorical(
+                    ["A2", None, "A1", "A2", "A3", None, "A1", "A3", "A2"],
+                    categories=["A1", "A2", "A3"],
+                ),
+                "C3_SQ001": pd.Categorical(
+                    ["Y", "Y", None, None, "Y", None, None, None, "Y"]
+                ),
+            }
+        )
+        self.index = AnswerIndex(len(self.frame))
+        for column, values in self.frame.items():
+            self.index.add_column(column, values.array.codes, values.cat.categories)
+
+    def unpack(self, bits: np.ndarray) -> list:
+        return unpack_mask(bits, self.index.n_rows).tolist()
+
+    def test_masks(self):
+        """Test masks of answers are built once per column"""
+        self.assertEqual(self.index.columns, ["A6", "C3_SQ001"])
+        self.assertEqual(self.index.nbytes, 0)
+        self.assertEqual(
+            self.unpack(self.index.get_mask("A6", "A2")),
+            (self.frame["A6"] == "A2").tolist(),
+        )
+        self.assertEqual(
+            self.unpack(self.index.get_missing("A6")), self.frame["A6"].isna().tolist()
+        )
+        self.assertFalse(any(self.unpack(self.index.get_mask("A6", "A5"))))
+        # Three answers and missing values of 9 rows in 2 bytes each
+        self.assertEqual(self.index.nbytes, 8)
+        with self.assertRaises(KeyError):
+            self.index.get_mask("B2", "A1")
+        with self.assertRaises(ValueError):
+            self.index.add_column("B2", np.zeros(3, dtype=np.int8), ["A1"])
+
+    def test_evaluate(self):
+        """Test queries select the same rows as pandas"""
+        for expr in [
+            "A6 == 'A2'",
+            "A6 != 'A2'",
+            "A6 in ['A1', 'A3'] & C3_SQ001 == 'Y'",
+            "~(A6 == 'A1') | C3_SQ001 not in ['Y']",
+            "A6 == 'A5' or not C3_SQ001 != 'Y'",
+        ]:
+            with self.subTest(expr=expr):
+                self.assertEqual(
+                    self.unpack(self.index.evaluate(parse_query(expr))),
+                    self.frame.eval(expr).tolist(),
+                )
+        self.assertEqual(
+            self.unpack(self.index.select([("A6", "A2"), ("C3_SQ001", "Y")])),
+            [True, False, False, False, False, False, False, False, True],
+        )
+
+        for expr in ["A6 > 'A1'", "B2 == 'A1'", "A6 in ['A1', None]"]:
+            self.assertFalse(self.index.supports(parse_query(expr)))
+        with self.assertRaises(ValueError):
+            self.index.evaluate(parse_query("B2 == 'A1'"))
+
+
+class TestSurveyAnswerIndex(BaseTestLimeSurvey2021WithResponsesCase):
+    """Test filtering survey responses on the answer index"""
+
+    def test_get_answer_index(self):
+        """Test answers of single-choice, multiple-choice and array columns"""
+        array_column = self.survey.get_question(self.array_column).index[0]
+        multiple_choice_column = self.survey.get_question(
+            self.multiple_choice_column, drop_other=True
+        ).index[0]
+        index = self.survey.get_answer_index(
+            [self.single_choice_column, array_column, multiple_choice_column]
+        )
+        responses = self.survey.responses
+        for column in [self.single_choice_column, array_column, multiple_choice_column]:
+            value = responses[column].dropna().iloc[0]
+            self.assertEqual(
+                unpack_mask(index.get_mask(column, value), index.n_rows).tolist(),
+                (responses[column] == value).tolist(),
+            )
+        self.assertIs(self.survey.get_answer_index(), index)
+        self.assertNotIn(self.free_column, index)
+        with self.assertRaises(ValueError):
+            self.survey.get_answer_index([self.free_column])
+
+    def test_filters(self):
+        """Test query and filter_responses select rows on the index"""
+        expr = f"{self.single_choice_column} == 'A3' & B2 != 'A5'"
+        filtered = self.survey.query(expr)
+        self.assertIn("B2", self.survey._answer_index)
+        self.assertEqual(filtered.responses, self.survey.responses.query(expr))
+
+        responses = self.survey.get_responses("B2", labels=True, drop_other=True)
+        filtered_responses, _ = self.survey.filter_responses(
+            "B2", responses, [self.single_choice_column, "A3"], ["A3", "A1"]
+        )
+        self.assertEqual(
+            filtered_responses,
+            responses[
+                (self.survey.responses[self.single_choice_column] == "A3")
+                & (self.survey.responses["A3"] == "A1")
+            ],
+        )
+
+    def test_edited_responses(self):
+        """Test the index is kept on reads and built again on edits"""
+        survey = copy.deepcopy(self.survey)
+        index = survey.get_answer_index()
+        # Reading the table keeps the index
+        survey.responses.shape
+        survey[survey.responses[self.single_choice_column] == "A3"]
+        self.assertIs(survey.get_answer_index(), index)
+
+        # Editing an indexed column in place builds it again
+        responses = survey.responses
+        row = responses.index[0]
+        value = "A1" if responses.loc[row, self.single_choice_column] != "A1" else "A2"
+        responses.loc[row, self.single_choice_column] = value
+        edited_index = survey.get_answer_index()
+        self.assertIsNot(edited_index, index)
+        self.assertEqual(
+            unpack_mask(
+                edited_index.get_mask(self.single_choice_column, value),
+                edited_index.n_rows,
+            ).tolist(),
+            (responses[self.single_choice_column] == value).tolist(),
+        )
+
+    def test_replaced_responses(self):
+        """Test replaced responses are indexed again"""
+        survey = copy.copy(self.survey)
+        survey.responses = survey.responses.iloc[:5]
+        self.assertIsNone(survey._answer_index)
+        self.assertEqual(survey.get_answer_index().n_rows, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""Test boolean matrices packed to bits"""
+import copy
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from n2survey.lime.bitmatrix import BitMatrix, count_bits, invert_mask, unpack_mask
+from tests.common import BaseTestCase, BaseTestLimeSurvey2021WithResponsesCase
+
+
+class TestBitMatrix(BaseTestCase):
+    """Test BitMatrix operations against boolean DataFrames"""
+
+    def setUp(self) -> None:
+        super().setUp()
+        rng = np.random.default_rng(0)
+        # Number of rows is not a multiple of 8 to test padding bits
+        self.frame = pd.DataFrame(
+            rng.random((21, 3)) > 0.5, columns=["SQ001", "SQ002", "SQ003"]
+        )
+        self.matrix = BitMatrix.from_frame(self.frame)
+
+    def test_round_trip(self):
+        """Test unpacked matrix equals the packed frame"""
+        self.assertEqual(self.matrix.bits.shape, (3, 3))
+        np.testing.assert_array_equal(self.matrix.to_array(), self.frame.to_numpy())
+
+    def test_count_and_cooccurrence(self):
+        """Test counts of set bits per column and per pair of columns"""
+        self.assertEqual(self.matrix.count(), self.frame.sum(axis=0))
+
+        values = self.frame.to_numpy().astype(int)
+        self.assertEqual(
+            self.matrix.cooccurrence(),
+            pd.DataFrame(
+                values.T @ values, index=self.frame.columns, columns=self.frame.columns
+            ),
+        )
+
+    def test_any_all_and_invert(self):
+        """Test combined and inverted row masks"""
+        n_rows = len(self.frame)
+        np.testing.assert_array_equal(
+            unpack_mask(self.matrix.any(), n_rows), self.frame.any(axis=1)
+        )
+        np.testing.assert_array_equal(
+            unpack_mask(self.matrix.all(["SQ001", "SQ003"]), n_rows),
+            self.frame["SQ001"] & self.frame["SQ003"],
+        )
+
+        inverted = invert_mask(self.matrix.any(), n_rows)
+        self.assertEqual(count_bits(inverted), (~self.frame.any(axis=1)).sum())
+        self.assertEqual(count_bits(invert_mask(self.matrix.all([]), n_rows)), 0)
+
+        with self.assertRaises(KeyError):
+            self.matrix.any(["SQ004"])
+
+
+class TestSurveyMultipleChoiceBits(BaseTestLimeSurvey2021WithResponsesCase):
+    """Test multiple-choice questions packed to bits"""
+
+    def test_get_multiple_choice_bits(self):
+        """Test bits of a multiple-choice question equal its responses"""
+        bits = self.survey.get_multiple_choice_bits(self.multiple_choice_column)
+        responses = self.survey.get_responses(
+            self.multiple_choice_column, labels=False, drop_other=True
+        )
+
+        self.assertEqual(list(bits.columns), list(responses.columns))
+        np.testing.assert_array_equal(bits.to_array(), responses.to_numpy(dtype=bool))
+        self.assertEqual(
+            bits.count().to_list(),
+            self.survey.count(self.multiple_choice_column, labels=False)
+            .iloc[:, 0]
+            .to_list(),
+        )
+        # Packed columns are kept until responses change
+        self.assertIs(
+            self.survey.get_multiple_choice_bits(self.multiple_choice_column), bits
+        )
+
+    def test_edited_responses(self):
+        """Test bits are packed again after responses are edited in place"""
+        survey = copy.deepcopy(self.survey)
+        survey.get_multiple_choice_bits(self.multiple_choice_column)
+        column = survey.get_question(
+            self.multiple_choice_column, drop_other=True
+        ).index[0]
+        survey.responses[column] = np.nan
+        self.assertEqual(
+            survey.get_multiple_choice_bits(self.multiple_choice_column)
+            .count()
+            .loc[column],
+            0,
+        )
+        self.assertEqual(
+            survey.count(self.multiple_choice_column, labels=False).loc[column].iloc[0],
+            0,
+        )
+
+    def test_not_multiple_choice(self):
+        """Test bits are only available for multiple-choice questions"""
+        with self.assertRaises(ValueError):
+            self.survey.get_multiple_choice_bits(self.single_choice_column)
+
+
+if __name__ == "__main__":
+    unittest.main()
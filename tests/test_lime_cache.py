@@ -0,0 +1,149 @@
+"""Test caching of parsed LimeSurvey files"""
+import importlib.util
+import os
+import shutil
+import tempfile
+import unittest
+import warnings
+from unittest import mock
+
+from n2survey.lime import LimeSurvey
+from n2survey.lime.cache import (
+    get_file_fingerprint,
+    read_responses_cache,
+    read_structure_cache,
+)
+from n2survey.lime.structure import read_lime_questionnaire_structure
+from tests.common import (
+    BaseTestLimeSurvey2021Case,
+    BaseTestLimeSurvey2021WithResponsesCase,
+)
+
+
+class TestStructureCache(BaseTestLimeSurvey2021Case):
+    """Test on-disk cache for parsed structure files"""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, "cache")
+        # Work on a copy to be able to modify the structure file
+        self.structure_copy = os.path.join(self.tmp_dir, "structure.xml")
+        shutil.copyfile(self.structure_file, self.structure_copy)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmp_dir)
+
+    def test_cached_structure_is_equal(self):
+        """Test structure read from cache equals the parsed one"""
+        LimeSurvey(structure_file=self.structure_copy, cache_dir=self.cache_dir)
+        with mock.patch(
+            "n2survey.lime.survey.read_lime_questionnaire_structure"
+        ) as parse_mock:
+            survey = LimeSurvey(
+                structure_file=self.structure_copy, cache_dir=self.cache_dir
+            )
+            parse_mock.assert_not_called()
+
+        self.assertEqual(survey.sections, self.survey.sections)
+        self.assertEqual(survey.questions, self.survey.questions)
+
+    def test_refresh_cache(self):
+        """Test refresh_cache forces parsing the structure file"""
+        survey = LimeSurvey(
+            structure_file=self.structure_copy, cache_dir=self.cache_dir
+        )
+        with mock.patch(
+            "n2survey.lime.survey.read_lime_questionnaire_structure",
+            wraps=read_lime_questionnaire_structure,
+        ) as parse_mock:
+            survey.read_structure(self.structure_copy, refresh_cache=True)
+            parse_mock.assert_called_once()
+
+    def test_changed_file_invalidates_cache(self):
+        """Test cache is not used after the structure file changed"""
+        LimeSurvey(structure_file=self.structure_copy, cache_dir=self.cache_dir)
+        self.assertIsNotNone(read_structure_cache(self.structure_copy, self.cache_dir))
+
+        with open(self.structure_copy, "a", encoding="utf8") as fp:
+            fp.write("\n")
+        self.assertIsNone(read_structure_cache(self.structure_copy, self.cache_dir))
+
+    def test_touched_file_keeps_cache(self):
+        """Test cache is used if only modification time of the file changed"""
+        LimeSurvey(structure_file=self.structure_copy, cache_dir=self.cache_dir)
+        fingerprint = get_file_fingerprint(self.structure_copy, content_hash=False)
+        os.utime(
+            self.structure_copy,
+            ns=(fingerprint["mtime_ns"] + 10**9, fingerprint["mtime_ns"] + 10**9),
+        )
+        self.assertIsNotNone(read_structure_cache(self.structure_copy, self.cache_dir))
+
+
+@unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is missing")
+class TestResponsesCache(BaseTestLimeSurvey2021WithResponsesCase):
+    """Test on-disk cache for read responses"""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, "cache")
+        # Work on a copy to be able to modify the responses file
+        self.responses_copy = os.path.join(self.tmp_dir, "responses.csv")
+        shutil.copyfile(self.responses_file, self.responses_copy)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmp_dir)
+
+    def _read_responses(self):
+        """Read responses of the copy with the cache folder"""
+        survey = LimeSurvey(
+            structure_file=self.structure_file, cache_dir=self.cache_dir
+        )
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            survey.read_responses(self.responses_copy)
+        return survey
+
+    def test_cached_responses_are_equal(self):
+        """Test responses read from cache equal the parsed ones"""
+        self._read_responses()
+        with mock.patch.object(LimeSurvey, "_read_responses_csv") as parse_mock:
+            survey = self._read_responses()
+            parse_mock.assert_not_called()
+
+        self.assertEqual(survey.responses, self.survey.responses)
+        self.assertEqual(survey.lime_system_info, self.survey.lime_system_info)
+
+    def test_changed_file_invalidates_cache(self):
+        """Test cache is not used after the responses file changed"""
+        self._read_responses()
+        self.assertIsNotNone(
+            read_responses_cache(
+                self.responses_copy, self.cache_dir, self.structure_file
+            )
+        )
+
+        with open(self.responses_copy, "a", encoding="utf8") as fp:
+            fp.write("\n")
+        self.assertIsNone(
+            read_responses_cache(
+                self.responses_copy, self.cache_dir, self.structure_file
+            )
+        )
+
+    def test_save_and_load(self):
+        """Test survey saved with transformed responses is loaded back"""
+        survey = self._read_responses()
+        survey.add_responses(survey.transform_question("D3", "depression"))
+        path = os.path.join(self.tmp_dir, "saved")
+        survey.save_responses_cache(path)
+
+        loaded = LimeSurvey.load(path)
+        self.assertEqual(loaded.structure_file, survey.structure_file)
+        self.assertEqual(loaded.responses, survey.responses)
+        self.assertEqual(loaded.lime_system_info, survey.lime_system_info)
+
+
+if __name__ == "__main__":
+    unittest.main()
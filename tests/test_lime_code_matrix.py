@@ -0,0 +1,84 @@
+"""Test integer codes of categorical responses"""
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from n2survey.lime.code_matrix import MISSING_CODE, CodeMatrix
+from tests.common import BaseTestCase, BaseTestLimeSurvey2021WithResponsesCase
+
+
+class TestCodeMatrix(BaseTestCase):
+    """Test CodeMatrix on a small DataFrame"""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.frame = pd.DataFrame(
+            {
+                "A6": pd.Categorical(["A2", None, "A1", "A2"], categories=["A1", "A2"]),
+                "B2": pd.Categorical(["A3", "A1", None, None], categories=["A1", "A3"]),
+            }
+        )
+        self.matrix = CodeMatrix.from_frame(
+            self.frame, choices={"A6": {"A1": "Yes", "A2": "No"}}
+        )
+
+    def test_codes(self):
+        """Test codes are small integers in one column-major array"""
+        self.assertEqual(self.matrix.codes.dtype, np.int8)
+        self.assertTrue(self.matrix.codes.flags.f_contiguous)
+        np.testing.assert_array_equal(
+            self.matrix.get_codes("A6"), [1, MISSING_CODE, 0, 1]
+        )
+        self.assertEqual(self.matrix.encode("B2", "A3"), 1)
+        self.assertEqual(self.matrix.encode("B2", "A2"), MISSING_CODE)
+
+    def test_mask_count_and_decode(self):
+        """Test filtering, counting and labels of codes"""
+        np.testing.assert_array_equal(
+            self.matrix.mask("A6", "A2"), self.frame["A6"] == "A2"
+        )
+        self.assertFalse(self.matrix.mask("A6", "A5").any())
+
+        self.assertEqual(
+            self.matrix.count("A6", labels=True),
+            pd.Series([1, 2], index=["Yes", "No"], name="A6"),
+        )
+        self.assertEqual(
+            self.matrix.count("B2"),
+            pd.Series([1, 1], index=pd.Index(["A1", "A3"]), name="B2"),
+        )
+        self.assertEqual(
+            list(self.matrix.decode("A6", self.matrix.get_codes("A6"))),
+            ["No", None, "Yes", "No"],
+        )
+
+
+class TestSurveyCodeMatrix(BaseTestLimeSurvey2021WithResponsesCase):
+    """Test codes of survey responses"""
+
+    def test_get_code_matrix(self):
+        """Test codes of single-choice and array columns match responses"""
+        matrix = self.survey.get_code_matrix()
+        array_columns = self.survey.get_question(self.array_column).index
+
+        self.assertIn(self.single_choice_column, matrix.columns)
+        self.assertTrue(set(array_columns) <= set(matrix.columns))
+        self.assertNotIn(self.free_column, matrix.columns)
+        for column in [self.single_choice_column, *array_columns]:
+            np.testing.assert_array_equal(
+                matrix.get_codes(column),
+                self.survey.responses[column].cat.codes.to_numpy(),
+            )
+
+        self.assertEqual(
+            matrix.count(self.single_choice_column, labels=True).to_list(),
+            self.survey.count(self.single_choice_column, labels=True)
+            .iloc[:-1, 0]
+            .to_list(),
+        )
+        self.assertIs(self.survey.get_code_matrix(), matrix)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+"""Test composable row filters"""
+import copy
+import unittest
+
+import numpy as np
+
+from n2survey.lime.filters import AllOf, Answer, AnyOf, Missing, NoneOf
+from tests.common import BaseTestCase, BaseTestLimeSurvey2021WithResponsesCase
+
+
+class TestFilter(BaseTestCase):
+    """Test combining filters"""
+
+    def test_operators(self):
+        """Test filters are combined to flat, hashable values"""
+        flt = Answer("A6", "A3") & ~Missing("B2") & Answer("B2", ["A1", "A2"])
+        self.assertEqual(
+            flt,
+            AllOf(
+                (
+                    Answer("A6", "A3"),
+                    NoneOf((Missing("B2"),)),
+                    Answer("B2", ("A1", "A2")),
+                )
+            ),
+        )
+        self.assertEqual(hash(flt), hash(AllOf(flt.filters)))
+        self.assertEqual(
+            Answer("A6", "A3") | Missing("A6") | Missing("B2"),
+            AnyOf((Answer("A6", "A3"), Missing("A6"), Missing("B2"))),
+        )
+        self.assertNotEqual(AllOf(flt.filters), AnyOf(flt.filters))
+        self.assertEqual(~~Missing("B2"), Missing("B2"))
+        self.assertEqual(Answer("B2", "A1").values, ("A1",))
+        with self.assertRaises(TypeError):
+            Answer("A6", "A3") & "B2 == 'A1'"
+
+
+class TestSurveyFilters(BaseTestLimeSurvey2021WithResponsesCase):
+    """Test filtering survey responses with filters"""
+
+    def test_get_filter_mask(self):
+        """Test masks of filters select the same rows as pandas"""
+        responses = self.survey.responses
+        multiple_choice_columns = self.survey._get_question_columns(
+            self.multiple_choice_column
+        )
+        for flt, expected in [
+            (
+                Answer(self.single_choice_column, "A3") & ~Missing("B2"),
+                (responses[self.single_choice_column] == "A3") & responses.B2.notna(),
+            ),
+            (
+                Answer(self.free_column, ["x", "y"])
+                | Missing(self.multiple_choice_column),
+                responses[self.free_column].isin(["x", "y"])
+                | responses[multiple_choice_columns].isna().all(axis=1),
+            ),
+            (
+                ~(Answer("B2", "A1") | Answer("C3_SQ001", "Y")),
+                ~((responses.B2 == "A1") | (responses.C3_SQ001 == "Y")),
+            ),
+        ]:
+            with self.subTest(flt=flt):
+                self.assertEqual(
+                    self.survey.get_filter_mask(flt).tolist(), expected.tolist()
+                )
+                self.assertIn(flt, self.survey._filter_masks)
+        with self.assertRaises(ValueError):
+            self.survey.get_filter_mask(Answer(self.multiple_choice_column, "Y"))
+
+    def test_edited_responses(self):
+        """Test masks are kept on reads and evaluated again on edits"""
+        survey = copy.deepcopy(self.survey)
+        flt = Missing("B2")
+        mask = survey._get_filter_bits(flt)
+        survey.responses.shape
+        self.assertIs(survey._get_filter_bits(flt), mask)
+
+        survey.responses["B2"] = np.nan
+        self.assertTrue(survey.get_filter_mask(flt).all())
+
+    def test_where(self):
+        """Test filtered responses are counted and plotted"""
+        flt = Answer(self.single_choice_column, ["A1", "A3"]) & ~Missing("B2")
+        mask = self.survey.responses[self.single_choice_column].isin(["A1", "A3"]) & (
+            self.survey.responses.B2.notna()
+        )
+        self.assertEqual(self.survey[flt].responses, self.survey[mask].responses)
+        for question in [
+            self.single_choice_column,
+            self.multiple_choice_column,
+            self.array_column,
+        ]:
+            self.assertEqual(
+                self.survey.count(question, add_totals=True, where=flt),
+                self.survey[mask].count(question, add_totals=True),
+            )
+        # The mask is evaluated once and shared
+        bits = self.survey._filter_masks[flt]
+        self.survey.plot(self.single_choice_column, where=flt)
+        self.assertIs(self.survey._filter_masks[flt], bits)
+
+
+if __name__ == "__main__":
+    unittest.main()
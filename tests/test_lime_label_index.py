@@ -0,0 +1,115 @@
+"""Test full-text index of question texts"""
+import unittest
+
+from n2survey.lime.label_index import LabelIndex
+from n2survey.lime.question_registry import QuestionRecord, QuestionRegistry
+from tests.common import (
+    BaseTestCase,
+    BaseTestLimeSurvey2021Case,
+    BaseTestLimeSurvey2021WithResponsesCase,
+)
+
+
+class TestLabelIndex(BaseTestCase):
+    """Test LabelIndex search"""
+
+    def setUp(self) -> None:
+        super().setUp()
+        choices = {"A1": "Very satisfied", "A2": "Not satisfied"}
+        self.index = LabelIndex(
+            QuestionRegistry(
+                [
+                    QuestionRecord(
+                        "X1_SQ001",
+                        label="I feel calm",
+                        question_group="X1",
+                        choices=choices,
+                    ),
+                    QuestionRecord(
+                        "X1_SQ002",
+                        label="I feel tense",
+                        question_group="X1",
+                        choices=choices,
+                    ),
+                    QuestionRecord("X2", label="Are you calmer now?"),
+                ]
+            )
+        )
+
+    def test_phrase(self):
+        """Test whole phrase must match"""
+        self.assertEqual(self.index.find_columns("I feel calm"), ["X1_SQ001"])
+        self.assertEqual(self.index.find_columns("feel tense"), ["X1_SQ002"])
+        self.assertEqual(self.index.find_columns("calm I feel"), [])
+
+    def test_partial_words(self):
+        """Test words at the ends of the text may be parts of longer words"""
+        self.assertEqual(self.index.find_columns("calm"), ["X1_SQ001", "X2"])
+        self.assertEqual(self.index.find_columns("feel ca"), ["X1_SQ001"])
+        self.assertEqual(self.index.find_columns("alme"), ["X2"])
+
+    def test_fields_and_case(self):
+        """Test search in selected fields and case sensitive search"""
+        self.assertEqual(self.index.find_groups("satisfied"), ["X1"])
+        self.assertEqual(self.index.find_groups("satisfied", fields=["label"]), [])
+        self.assertEqual(self.index.find_groups("i feel", case_sensitive=True), [])
+        with self.assertRaises(ValueError):
+            self.index.find_groups("calm", fields=["format"])
+        with self.assertRaises(ValueError):
+            self.index.find_groups(" ,")
+
+
+class TestLimeSurveyFindQuestions(BaseTestLimeSurvey2021Case):
+    """Test LimeSurvey.find_questions"""
+
+    def test_find_questions(self):
+        """Test questions are found by label"""
+        self.assertEqual(self.survey.find_questions("interest or pleasure"), ["D3"])
+        self.assertEqual(
+            self.survey.find_questions("I feel calm", columns=True), ["D1_SQ001"]
+        )
+
+
+class TestTransformDetection(BaseTestLimeSurvey2021WithResponsesCase):
+    """Test questions of transforms are found by label"""
+
+    def test_mental_health(self):
+        """Test mental health questions are detected"""
+        for transform, question in [
+            ("state_anxiety", "D1"),
+            ("trait_anxiety", "D2"),
+            ("depression", "D3"),
+        ]:
+            with self.subTest(transform=transform):
+                self.assertEqual(
+                    self.survey.transform_question(None, transform),
+                    self.survey.transform_question(question, transform),
+                )
+
+    def test_range_and_satisfaction(self):
+        """Test range and satisfaction questions are detected by label"""
+        self.assertEqual(
+            list(self.survey.transform_question("B2", "range").columns),
+            ["income_amount"],
+        )
+        self.assertEqual(
+            list(self.survey.transform_question("C4", "range").columns),
+            ["hours_amount"],
+        )
+        self.assertIn(
+            "satisfaction_score",
+            self.survey.transform_question("C1", "satisfaction").columns,
+        )
+        with self.assertRaises(ValueError):
+            self.survey.transform_question(self.single_choice_column, "range")
+        with self.assertRaises(ValueError):
+            self.survey.transform_question("B2", "satisfaction")
+
+    def test_question_required(self):
+        """Test question must be given for transforms without detection"""
+        with self.assertRaises(ValueError):
+            self.survey.transform_question(None, "supervision")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""Test reading LimeSurvey .lss survey archives"""
+import os
+import shutil
+import tempfile
+import unittest
+import warnings
+
+from lxml import etree
+
+from n2survey.lime import LimeSurvey
+from n2survey.lime.lss import read_lime_lss_structure
+from n2survey.lime.structure import _parse_question_element, _parse_section_element
+from tests.common import BaseTestCase
+
+
+class TestLssStructure(BaseTestCase):
+    """Test read_lime_lss_structure"""
+
+    lss_file = "data/test_survey_structure.lss"
+    xml_file = "data/test_survey_structure.xml"
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.structure = read_lime_lss_structure(self.lss_file)
+
+    def _read_xml_structure(self):
+        """Parse questions of the XML export that the XML parser supports"""
+        sections = []
+        columns = {}
+        for _, section in etree.iterparse(self.xml_file, tag="section"):
+            section_dict = _parse_section_element(section)
+            sections.append(section_dict)
+            for question in section.iter("question"):
+                try:
+                    with warnings.catch_warnings():
+                        warnings.simplefilter("ignore")
+                        question_columns = _parse_question_element(question)
+                except (KeyError, AssertionError):
+                    # Dual scale arrays and questions without data columns
+                    continue
+                for column in question_columns:
+                    columns[column["name"]] = {
+                        **column,
+                        "section_id": section_dict["id"],
+                    }
+        return sections, columns
+
+    def test_same_as_xml(self):
+        """Test .lss gives the same structure as the questionnaire XML file"""
+        xml_sections, xml_columns = self._read_xml_structure()
+        lss_columns = {column["name"]: column for column in self.structure["questions"]}
+
+        self.assertEqual(self.structure["sections"], xml_sections)
+        for name, column in xml_columns.items():
+            self.assertEqual(lss_columns[name], column)
+        # Columns are in the same order
+        self.assertEqual(
+            [name for name in lss_columns if name in xml_columns], list(xml_columns)
+        )
+
+    def test_dual_scale_array(self):
+        """Test dual scale array has a column per subquestion and scale"""
+        columns = [
+            column
+            for column in self.structure["questions"]
+            if column["question_group"] == "G2Q9"
+        ]
+        self.assertEqual(
+            [column["name"] for column in columns],
+            ["G2Q9_SQ001#0", "G2Q9_SQ002#0", "G2Q9_SQ001#1", "G2Q9_SQ002#1"],
+        )
+        self.assertTrue(all(column["type"] == "array" for column in columns))
+
+    def test_language(self):
+        """Test only texts in the requested language are used"""
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            # Add German copies of all rows with texts
+            tree = etree.parse(self.lss_file)
+            for rows in tree.getroot().iter("rows"):
+                for row in list(rows):
+                    if row.find("language") is None:
+                        continue
+                    german_row = etree.fromstring(etree.tostring(row))
+                    german_row.find("language").text = "de"
+                    if german_row.find("question") is not None:
+                        german_row.find("question").text = "Deutsch"
+                    rows.append(german_row)
+            lss_file = os.path.join(tmp_dir, "survey.lss")
+            tree.write(lss_file, encoding="UTF-8")
+
+            english = read_lime_lss_structure(lss_file)
+            german = read_lime_lss_structure(lss_file, language="de")
+        finally:
+            shutil.rmtree(tmp_dir)
+
+        self.assertEqual(english, self.structure)
+        self.assertEqual(
+            {column["question_label"] for column in german["questions"]}, {"Deutsch"}
+        )
+        self.assertEqual(len(german["questions"]), len(english["questions"]))
+
+    def test_survey_from_lss(self):
+        """Test LimeSurvey reads .lss files"""
+        survey = LimeSurvey(structure_file=self.lss_file)
+        self.assertEqual(survey.get_question_type("G1Q3"), "single-choice")
+        self.assertEqual(
+            survey.get_choices("G1Q3"),
+            {"A1": "Option 1", "A2": "Option 2", "A3": "Option 3"},
+        )
+        self.assertEqual(survey.get_question_type("G5Q1"), "multiple-choice")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+"""Test parsing of row filter expressions"""
+import sqlite3
+import unittest
+
+import pandas as pd
+
+from n2survey.lime.query import (
+    And,
+    Compare,
+    Not,
+    Or,
+    iter_comparisons,
+    parse_query,
+    quote_identifier,
+    to_sql,
+)
+from tests.common import BaseTestCase
+
+
+class TestParseQuery(BaseTestCase):
+    """Test queries are parsed and translated as pandas evaluates them"""
+
+    def test_parse(self):
+        """Test precedence of operators and normalized comparisons"""
+        self.assertEqual(
+            parse_query("A6 == 'A3' & B2 != 'A5' | ~(B3 in ['A1'])"),
+            Or(
+                (
+                    And((Compare("A6", "==", "A3"), Compare("B2", "!=", "A5"))),
+                    Not(Compare("B3", "in", ("A1",))),
+                )
+            ),
+        )
+        self.assertEqual(parse_query("'A3' == A6"), Compare("A6", "==", "A3"))
+        self.assertEqual(parse_query("A6 != ['A3']"), Compare("A6", "not in", ("A3",)))
+        self.assertEqual(parse_query("1 < x < 3").columns, frozenset(["x"]))
+        self.assertNotEqual(And(()), Or(()))
+        self.assertEqual(
+            list(iter_comparisons(parse_query("A6 == 'A3' | ~(B2 != 'A5')"))),
+            [Compare("A6", "==", "A3"), Compare("B2", "!=", "A5")],
+        )
+        self.assertEqual(quote_identifier('A "6"'), '"A ""6"""')
+
+        for expr in ["A6 == @value", "x + 1 > 2", "A6 ==", "A6.isnull()"]:
+            with self.assertRaises(ValueError):
+                parse_query(expr)
+
+    def test_to_sql(self):
+        """Test SQL conditions select the same rows as pandas"""
+        frame = pd.DataFrame(
+            {
+                "A6": ["A1", "A2", None, "A3", "A2"],
+                "x": [1.0, None, 3.0, 4.0, 5.5],
+                # Missing values of nullable dtypes are pd.NA
+                "n": pd.array([1, None, 3, None, 2], dtype="Int32"),
+            }
+        )
+        connection = sqlite3.connect(":memory:")
+        connection.execute("CREATE TABLE responses (A6, x, n)")
+        connection.executemany(
+            "INSERT INTO responses VALUES (?, ?, ?)",
+            frame.astype(object).where(frame.notna(), None).itertuples(index=False),
+        )
+        for expr in [
+            "A6 == 'A2'",
+            "A6 != 'A2'",
+            "A6 not in ['A1', 'A3']",
+            "A6 in ('A1', 'A3') or x >= 5",
+            "~(x > 2) & A6 != 'A1'",
+            "not 1 < x <= 4",
+            "n != 1",
+            "~(n == 3) | A6 == 'A2'",
+            "n not in [1] & x > 2",
+            "not (n > 1 and x < 5)",
+        ]:
+            condition, params = to_sql(parse_query(expr), na_columns=["n"])
+            selected = connection.execute(
+                f"SELECT rowid - 1 FROM responses WHERE {condition}", params
+            ).fetchall()
+            self.assertEqual(
+                [row[0] for row in selected], list(frame.query(expr).index), expr
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
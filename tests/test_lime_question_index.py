@@ -0,0 +1,67 @@
+"""Test index of the survey questions table"""
+import unittest
+
+from n2survey.lime import LimeSurvey
+from n2survey.lime.question_index import QuestionIndex
+from n2survey.lime.question_registry import QuestionRegistry
+from tests.common import BaseTestLimeSurvey2021Case
+
+
+class TestQuestionIndex(BaseTestLimeSurvey2021Case):
+    """Test QuestionIndex lookups"""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.index = QuestionIndex(QuestionRegistry.from_frame(self.survey.questions))
+
+    def test_group_columns(self):
+        """Test group -> columns and column -> group mappings"""
+        questions = self.survey.questions
+        for group in ["A3", "C3", "B6"]:
+            columns = questions.index[questions.question_group == group].to_list()
+            self.assertEqual(self.index.columns_by_group[group], columns)
+            for column in columns:
+                self.assertEqual(self.index.group_by_column[column], group)
+
+    def test_drop_other(self):
+        """Test contingent columns are dropped on request"""
+        self.assertEqual(self.index.get_columns("A3"), ["A3", "A3other"])
+        self.assertEqual(self.index.get_columns("A3", drop_other=True), ["A3"])
+
+    def test_unknown_key(self):
+        """Test unknown key has no columns"""
+        self.assertNotIn("X2", self.index)
+        self.assertEqual(self.index.get_positions("X2"), [])
+
+
+class TestLimeSurveyQuestionIndex(BaseTestLimeSurvey2021Case):
+    """Test LimeSurvey keeps the question index consistent"""
+
+    def test_add_question(self):
+        """Test added question can be looked up"""
+        survey = LimeSurvey(structure_file=self.structure_file)
+        survey.get_question_type(self.single_choice_column)
+        survey.add_question(
+            "new_question",
+            label="New question",
+            type="single-choice",
+            choices={"A1": "Yes", "A2": "No"},
+        )
+
+        self.assertEqual(survey.get_question("new_question").shape[0], 1)
+        self.assertEqual(survey.get_question_type("new_question"), "single-choice")
+        self.assertEqual(survey.get_label("new_question"), "New question")
+        self.assertEqual(survey.get_choices("new_question"), {"A1": "Yes", "A2": "No"})
+
+    def test_questions_edit_in_place(self):
+        """Test edits of survey.questions are picked up"""
+        survey = LimeSurvey(structure_file=self.structure_file)
+        self.assertEqual(
+            survey.get_label(self.free_column), survey.questions.label[self.free_column]
+        )
+        survey.questions.loc[self.free_column, "label"] = "Edited label"
+        self.assertEqual(survey.get_label(self.free_column), "Edited label")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""Test compact registry of survey questions"""
+import unittest
+
+from n2survey.lime import LimeSurvey
+from n2survey.lime.question_registry import QuestionRecord, QuestionRegistry
+from n2survey.lime.structure import read_lime_questionnaire_structure
+from tests.common import BaseTestLimeSurvey2021Case
+
+
+class TestQuestionRegistry(BaseTestLimeSurvey2021Case):
+    """Test QuestionRegistry"""
+
+    def setUp(self) -> None:
+        super().setUp()
+        structure_dict = read_lime_questionnaire_structure(self.structure_file)
+        self.registry = QuestionRegistry.from_columns(structure_dict["questions"])
+
+    def test_record_fields(self):
+        """Test missing fields of a record are NA"""
+        record = QuestionRecord("X1", label="Label", custom="value")
+        self.assertEqual(record.get("label"), "Label")
+        self.assertEqual(record.get("custom"), "value")
+        self.assertIsNone(record.get("type", None))
+        self.assertEqual(record.to_dict(), {"label": "Label", "custom": "value"})
+
+    def test_frame_round_trip(self):
+        """Test table built from a registry equals the survey questions"""
+        questions = self.survey.questions
+        registry = QuestionRegistry.from_frame(questions)
+        self.assertEqual(registry.to_frame(), questions)
+
+    def test_choices_are_shared(self):
+        """Test identical choices are stored once"""
+        columns = self.survey.get_question(self.array_column).index
+        choices = [self.registry.get(column).choices for column in columns]
+        self.assertGreater(len(choices), 1)
+        for column_choices in choices[1:]:
+            self.assertIs(column_choices, choices[0])
+
+    def test_extended(self):
+        """Test extending a registry keeps the original one unchanged"""
+        extended = self.registry.extended([QuestionRecord("X1", label="Label")])
+        self.assertEqual(len(extended), len(self.registry) + 1)
+        self.assertIn("X1", extended)
+        self.assertNotIn("X1", self.registry)
+
+
+class TestLimeSurveyQuestionRegistry(BaseTestLimeSurvey2021Case):
+    """Test LimeSurvey keeps the registry and questions table consistent"""
+
+    def test_questions_setter(self):
+        """Test a new questions table replaces the registry"""
+        survey = LimeSurvey(structure_file=self.structure_file)
+        survey.questions = survey.questions.drop(index=self.free_column)
+        self.assertNotIn(self.free_column, survey._get_registry())
+        with self.assertRaises(ValueError):
+            survey.get_question(self.free_column)
+
+    def test_read_questions(self):
+        """Test reading the questions table keeps the registry"""
+        survey = LimeSurvey(structure_file=self.structure_file)
+        registry = survey._get_registry()
+        index = survey._get_question_index()
+        survey.questions.shape
+        self.assertIs(survey._get_registry(), registry)
+        self.assertIs(survey._get_question_index(), index)
+
+        survey.questions.loc[self.free_column, "label"] = "Edited"
+        self.assertIsNot(survey._get_registry(), registry)
+        self.assertEqual(survey._get_registry().get(self.free_column).label, "Edited")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+"""Test SQLite storage of survey responses"""
+import gc
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+import warnings
+
+import pandas as pd
+
+from n2survey.lime import LimeSurvey
+from n2survey.lime.sqlite_store import SQLiteColumnLoader, SQLiteResponsesWriter
+from n2survey.lime.storage import read_responses_store
+from tests.common import BaseTestCase, BaseTestLimeSurvey2021WithResponsesCase
+
+
+class TestSQLiteColumnLoader(BaseTestCase):
+    """Test writing and loading columns of an SQLite store"""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.store_dir = tempfile.mkdtemp()
+        self.responses = pd.DataFrame(
+            {
+                "A6": pd.Categorical(["A2", None, "A1", "A2"], categories=["A1", "A2"]),
+                "B12": ["text", None, "5", "more"],
+                "D1": pd.array([1, None, 3, 4], dtype="Int16"),
+                "date": pd.to_datetime(["2021-09-28 11:51:17", None, None, "2021"]),
+            },
+            index=pd.Index([4, 7, 9, 12], name="id"),
+        )
+        self.system_info = pd.DataFrame(
+            {"interviewtime": [1.5, 2.0, None, 3.0]}, index=self.responses.index
+        )
+        with SQLiteResponsesWriter(self.store_dir, indexed_columns=["A6"]) as writer:
+            writer.write(self.responses.iloc[:1], self.system_info.iloc[:1])
+            writer.write(self.responses.iloc[1:], self.system_info.iloc[1:])
+        self.loader = SQLiteColumnLoader(self.store_dir)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.store_dir)
+
+    def test_load(self):
+        """Test columns are loaded with their dtypes"""
+        self.assertEqual(list(self.loader.columns), list(self.responses.columns))
+        self.assertEqual(self.loader.load(self.loader.columns), self.responses)
+        self.assertTrue(self.loader.load([]).index.equals(self.responses.index))
+        self.assertEqual(
+            SQLiteColumnLoader(self.store_dir, "system_info").load(["interviewtime"]),
+            self.system_info,
+        )
+        with sqlite3.connect(os.path.join(self.store_dir, "responses.sqlite")) as db:
+            plan = db.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM responses WHERE A6 = 'A1'"
+            ).fetchall()
+        self.assertIn("USING INDEX", plan[0][-1])
+        with self.assertRaises(ValueError):
+            read_responses_store(self.store_dir)
+
+    def test_filter_and_count(self):
+        """Test rows are selected and counted in the database"""
+        loader = self.loader.filter('"A6" = ?', ["A2"])
+        self.assertEqual(loader.load(["B12"]), self.responses.loc[[4, 12], ["B12"]])
+        self.assertEqual(loader.count_rows(), 2)
+        self.assertEqual(
+            self.loader.mask('"D1" > ?', [2]).tolist(), [False, False, True, True]
+        )
+        self.assertEqual(
+            sorted(self.loader.count_values("A6"), key=str),
+            [("A1", 1), ("A2", 2), (None, 1)],
+        )
+        self.assertEqual(
+            self.loader.count_non_null(["A6", "D1"]),
+            pd.Series([3, 3], index=["A6", "D1"]),
+        )
+
+        taken = loader.take([1])
+        self.assertEqual(taken.load(["D1"]), self.responses.loc[[12], ["D1"]])
+        self.assertEqual(taken.filter('"D1" < 0').count_rows(), 0)
+        with self.assertRaises(ValueError):
+            loader.take([1, 0])
+
+    def test_connection_closed(self):
+        """Test the connection is closed with the last loader using it"""
+        connection = self.loader._connection
+        loader = self.loader.filter('"A6" = ?', ["A2"]).take([1])
+        del self.loader
+        gc.collect()
+        self.assertEqual(loader.count_rows(), 1)
+
+        del loader
+        gc.collect()
+        with self.assertRaises(sqlite3.ProgrammingError):
+            connection.execute("SELECT 1")
+
+
+class TestSurveySQLiteStore(BaseTestLimeSurvey2021WithResponsesCase):
+    """Test filtering and counting responses of an SQLite store"""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.store_dir = tempfile.mkdtemp()
+        self.store_survey = LimeSurvey(structure_file=self.structure_file)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            self.store_survey.ingest_responses(
+                self.responses_file, self.store_dir, chunksize=10, backend="sqlite"
+            )
+        self.store_survey.read_responses_store(self.store_dir)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.store_dir)
+
+    def assert_same_counts(self, store_survey, survey):
+        """Assert counts of questions of both surveys are equal"""
+        for question in [
+            self.single_choice_column,
+            self.multiple_choice_column,
+            self.array_column,
+        ]:
+            for labels in [True, False]:
+                self.assertEqual(
+                    store_survey.count(question, labels=labels, add_totals=True),
+                    survey.count(question, labels=labels, add_totals=True),
+                )
+
+    def test_read_store(self):
+        """Test responses of the store are the same as read from the file"""
+        self.assertEqual(self.store_survey._responses.shape[1], 0)
+        self.assert_same_counts(self.store_survey, self.survey)
+        self.assertEqual(
+            self.store_survey.get_responses(self.array_column),
+            self.survey.get_responses(self.array_column),
+        )
+        # Counted in the database, only requested columns are loaded
+        self.assertEqual(
+            set(self.store_survey._responses.columns),
+            set(self.survey.get_question(self.array_column).index),
+        )
+        self.assertEqual(
+            self.store_survey.lime_system_info, self.survey.lime_system_info
+        )
+        self.assertEqual(self.store_survey.responses, self.survey.responses)
+
+    def test_filters(self):
+        """Test filters are evaluated in the database"""
+        expr = f"{self.single_choice_column} == 'A3' | B2 in ['A1', 'A2']"
+        filtered = self.store_survey.query(expr)
+        self.assertIsInstance(filtered._responses_loader, SQLiteColumnLoader)
+        self.assert_same_counts(filtered, self.survey.query(expr))
+
+        filtered = filtered.filter_na(self.array_column + "_SQ001")
+        expected = self.survey.query(expr).filter_na(self.array_column + "_SQ001")
+        self.assertIsInstance(filtered._responses_loader, SQLiteColumnLoader)
+        self.assert_same_counts(filtered, expected)
+
+        mask = filtered.get_responses("B2", labels=False)["B2"] == "A2"
+        expected = expected[expected.responses.B2 == "A2"]
+        self.assertIsInstance(filtered[mask]._responses_loader, SQLiteColumnLoader)
+        self.assert_same_counts(filtered[mask], expected)
+        self.assertEqual(filtered[mask].responses, expected.responses)
+
+        # Missing values of nullable dtypes propagate as pd.NA
+        for expr in ["B9a != 1.0", "~(B9a == 1)", "C5_SQ001 != 1.0 | B9a == 1"]:
+            with self.subTest(expr=expr):
+                self.assertEqual(
+                    self.store_survey.query(expr).responses,
+                    self.survey.responses.query(expr),
+                )
+
+        # Unsupported queries are evaluated by pandas
+        self.assertEqual(
+            self.store_survey.query("B2 == B2").responses,
+            self.survey.query("B2 == B2").responses,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
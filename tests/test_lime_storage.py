@@ -0,0 +1,182 @@
+"""Test on-disk storage of survey responses"""
+import copy
+import importlib.util
+import os
+import shutil
+import tempfile
+import unittest
+import warnings
+from unittest import mock
+
+import pandas as pd
+
+from n2survey.lime import LimeSurvey
+from n2survey.lime.storage import (
+    StoreColumnLoader,
+    _concat_frames,
+    read_responses_store_metadata,
+    read_responses_tables,
+)
+from tests.common import BaseTestCase, BaseTestLimeSurvey2021WithResponsesCase
+
+
+class TestConcatFrames(BaseTestCase):
+    """Test concatenation of DataFrames read in parts"""
+
+    def test_categories_are_merged(self):
+        """Test categorical columns with different categories stay categorical"""
+        frames = [
+            pd.DataFrame({"lang": pd.Categorical(["en"])}),
+            pd.DataFrame({"lang": pd.Categorical(["de", None])}),
+        ]
+        result = _concat_frames(frames)
+
+        self.assertEqual(list(result["lang"].cat.categories), ["de", "en"])
+        self.assertEqual(list(result["lang"].astype(object)[:2]), ["en", "de"])
+
+    def test_bool_and_empty_parts(self):
+        """Test boolean column with an empty part becomes object"""
+        frames = [
+            pd.DataFrame({"flag": [True, False]}),
+            pd.DataFrame({"flag": [float("nan")]}),
+        ]
+        self.assertEqual(_concat_frames(frames)["flag"].dtype, object)
+
+
+@unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is missing")
+class TestResponsesStore(BaseTestLimeSurvey2021WithResponsesCase):
+    """Test chunked ingestion of responses into a store"""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.store_dir = os.path.join(self.tmp_dir, "store")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmp_dir)
+
+    def test_ingest_in_chunks(self):
+        """Test responses read in chunks are the same as read at once"""
+        survey = LimeSurvey(structure_file=self.structure_file)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            rows = survey.ingest_responses(
+                self.responses_file, self.store_dir, chunksize=12
+            )
+        self.assertEqual(rows, len(self.survey.responses))
+        self.assertEqual(
+            len(read_responses_store_metadata(self.store_dir)["parts"]),
+            -(-rows // 12),
+        )
+
+        survey.read_responses_store(self.store_dir)
+        self.assertEqual(survey.responses, self.survey.responses)
+        self.assertEqual(survey.lime_system_info, self.survey.lime_system_info)
+
+    def test_store_is_replaced(self):
+        """Test ingesting into an existing store removes its old parts"""
+        survey = LimeSurvey(structure_file=self.structure_file)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            survey.ingest_responses(self.responses_file, self.store_dir, chunksize=20)
+            survey.ingest_responses(self.responses_file, self.store_dir)
+
+        self.assertEqual(len(os.listdir(self.store_dir)), 3)
+        survey.read_responses_store(self.store_dir)
+        self.assertEqual(survey.responses, self.survey.responses)
+
+    def test_memory_map(self):
+        """Test uncompressed store is memory mapped without copying"""
+        import pyarrow
+
+        self.survey.save_responses_cache(self.store_dir, memory_map=True)
+
+        allocated = pyarrow.total_allocated_bytes()
+        responses, system_info = read_responses_tables(self.store_dir, memory_map=True)
+        self.assertEqual(pyarrow.total_allocated_bytes(), allocated)
+        self.assertEqual(responses.num_rows, len(self.survey.responses))
+
+        survey = LimeSurvey.load(self.store_dir, memory_map=True)
+        self.assertEqual(survey.responses, self.survey.responses)
+        self.assertEqual(survey.lime_system_info, self.survey.lime_system_info)
+        # Timing columns without missing values are views of the mapped file
+        self.assertFalse(
+            survey.lime_system_info["interviewtime"].to_numpy().flags.writeable
+        )
+
+    def test_lazy_loading(self):
+        """Test lazy survey loads columns of requested questions only"""
+        self.survey.save_responses_cache(self.store_dir)
+        survey = LimeSurvey.load(self.store_dir, lazy=True)
+        self.assertEqual(survey._responses.shape, (len(self.survey.responses), 0))
+
+        self.assertEqual(
+            survey.get_responses(self.array_column),
+            self.survey.get_responses(self.array_column),
+        )
+        self.assertEqual(
+            survey.count(self.multiple_choice_column),
+            self.survey.count(self.multiple_choice_column),
+        )
+        self.assertEqual(
+            set(survey._responses.columns),
+            set(survey.get_question(self.array_column).index)
+            | set(
+                survey.get_question(self.multiple_choice_column, drop_other=True).index
+            ),
+        )
+
+        self.assertEqual(survey.responses, self.survey.responses)
+        self.assertEqual(survey.lime_system_info, self.survey.lime_system_info)
+
+    def test_lazy_operations(self):
+        """Test operations on all responses do not end lazy mode"""
+        self.survey.save_responses_cache(self.store_dir)
+        survey = LimeSurvey.load(self.store_dir, lazy=True)
+        n_responses = len(self.survey.responses)
+
+        survey_copy = copy.deepcopy(survey)
+        self.assertEqual(survey_copy._responses.shape, (n_responses, 0))
+        self.assertEqual(survey_copy.responses, self.survey.responses)
+
+        filtered = survey.query(f"{self.free_column} == {self.free_column}")
+        self.assertEqual(
+            filtered.responses,
+            self.survey.responses.query(f"{self.free_column} == {self.free_column}"),
+        )
+        survey.save_responses_cache(os.path.join(self.tmp_dir, "copy"))
+        self.assertEqual(survey._responses.shape, (n_responses, 0))
+        self.assertIsNotNone(survey._responses_loader)
+
+    def test_lazy_views(self):
+        """Test columns of views are loaded from the store once"""
+        self.survey.save_responses_cache(self.store_dir)
+        survey = LimeSurvey.load(self.store_dir, lazy=True)
+        questions = [self.single_choice_column, self.free_column]
+        views = [survey.filter_na(question) for question in questions]
+
+        with mock.patch.object(
+            StoreColumnLoader, "load", autospec=True, side_effect=StoreColumnLoader.load
+        ) as load:
+            for question, view in zip(questions, views):
+                self.assertEqual(
+                    view.get_responses(self.array_column),
+                    self.survey.filter_na(question).get_responses(self.array_column),
+                )
+            # Columns loaded for views are kept by the viewed survey
+            self.assertEqual(
+                survey.get_responses(self.array_column),
+                self.survey.get_responses(self.array_column),
+            )
+        self.assertEqual(load.call_count, 1)
+
+    def test_missing_store(self):
+        """Test reading a folder without a store fails"""
+        with self.assertRaises(ValueError):
+            LimeSurvey(structure_file=self.structure_file).read_responses_store(
+                self.tmp_dir
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
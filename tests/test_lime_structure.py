@@ -3,7 +3,10 @@ import unittest
 
 from bs4 import BeautifulSoup
 
-from n2survey.lime.structure import (  # TODO: test _get_clean_string,; TODO: test _get_question_group_name,
+from n2survey.lime.structure import (  # TODO: test _get_question_group_name,
+    _clean_text,
+    _html_to_text,
+    _html_to_text_bs4,
     _parse_question,
     _parse_question_description,
     _parse_question_responses,
@@ -14,6 +17,42 @@ from n2survey.lime.structure import (  # TODO: test _get_clean_string,; TODO: te
 )
 
 
+class TestTextCleaning(unittest.TestCase):
+    """Test cleaning texts from HTML tags"""
+
+    def test_clean_text(self):
+        """Test HTML tags, entities and extra spaces are removed"""
+        self.assertEqual(
+            _clean_text(
+                '<p style="margin:0cm;">Do you&nbsp;agree?</p>\n\n'
+                "<p><b>Yes</b> &amp; no</p>  <br/>"
+            ),
+            "Do you agree? Yes & no",
+        )
+
+    def test_fast_path_matches_bs4(self):
+        """Test regex based cleaning gives the same result as BeautifulSoup"""
+        for text in [
+            "",
+            "plain text",
+            "<p>a</p ><b>b</b>",
+            "<a href='x>y'>link</a> text",
+            "a < b and c > d",
+            "<p>unclosed <b",
+            "&unknown; entity &amp",
+            "&#150; &#x27; &AMP;",
+            "a<!-- comment -->b",
+            "<script>x</script>y",
+            "&amp;lt;b&amp;gt;",
+            '</p<a href=">">',
+            '<b "<a href=">">',
+            "<p class=\"x\" id=y data-a = 'z'>a</p><br/>b",
+            '<a title="<b>">c</a>',
+        ]:
+            with self.subTest(text=text):
+                self.assertEqual(_html_to_text(text), _html_to_text_bs4(text))
+
+
 class TestXMLSectionParsing(unittest.TestCase):
     """Test parsing <section> tags in an XML structure file"""
 
@@ -518,6 +557,44 @@ class TestXMLQuestionnarieParsing(unittest.TestCase):
         self.assertEqual(len(structure["sections"]), 13)
         self.assertEqual(len(structure["questions"]), 550)
 
+    def test_parsers_give_same_structure(self):
+        """Test lxml and bs4 parsers give exactly the same result"""
+        for structure_file in [
+            "data/survey_structure.xml",
+            "data/survey_structure_2021.xml",
+            "data/survey_structure_2021_v2.xml",
+        ]:
+            self.assertEqual(
+                read_lime_questionnaire_structure(structure_file, parser="lxml"),
+                read_lime_questionnaire_structure(structure_file, parser="bs4"),
+            )
+
+    def test_parallel_parsing(self):
+        """Test parsing sections in worker processes gives the serial result"""
+        structure_file = "data/survey_structure_2021.xml"
+        for parser in ["lxml", "bs4"]:
+            with self.subTest(parser=parser):
+                self.assertEqual(
+                    read_lime_questionnaire_structure(
+                        structure_file, parser=parser, workers=2
+                    ),
+                    read_lime_questionnaire_structure(structure_file, parser=parser),
+                )
+
+    def test_invalid_workers(self):
+        """Test non-positive number of workers raises an error"""
+        with self.assertRaises(ValueError):
+            read_lime_questionnaire_structure(
+                "data/survey_structure_2021.xml", workers=0
+            )
+
+    def test_unknown_parser(self):
+        """Test unknown parser name raises an error"""
+        with self.assertRaises(ValueError):
+            read_lime_questionnaire_structure(
+                "data/survey_structure_2021.xml", parser="html"
+            )
+
 
 if __name__ == "__main__":
     unittest.main()
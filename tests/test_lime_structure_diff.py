@@ -0,0 +1,90 @@
+"""Test comparison of structure file revisions"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from lxml import etree
+
+from n2survey.lime import LimeSurvey
+from n2survey.lime.structure import read_lime_questionnaire_structure
+from n2survey.lime.structure_diff import (
+    IncrementalStructureReader,
+    StructureDiff,
+    diff_lime_questionnaire_structures,
+)
+from tests.common import BaseTestCase
+
+
+class TestStructureDiff(BaseTestCase):
+    """Test structure diff and incremental reading"""
+
+    old_file = "data/survey_structure_2021.xml"
+    new_file = "data/survey_structure_2021_v2.xml"
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmp_dir)
+
+    def test_diff(self):
+        """Test changed question is found"""
+        self.assertEqual(
+            diff_lime_questionnaire_structures(self.old_file, self.new_file),
+            StructureDiff(added=[], removed=[], changed=["B1b"]),
+        )
+        self.assertFalse(
+            diff_lime_questionnaire_structures(self.old_file, self.old_file)
+        )
+
+    def test_added_and_removed(self):
+        """Test removed question is reported as removed and back as added"""
+        tree = etree.parse(self.old_file)
+        question = tree.getroot().find("section").find("question")
+        question.getparent().remove(question)
+        edited_file = os.path.join(self.tmp_dir, "structure.xml")
+        tree.write(edited_file, encoding="UTF-8")
+
+        diff = diff_lime_questionnaire_structures(self.old_file, edited_file)
+        self.assertEqual(diff.added, [])
+        self.assertEqual(len(diff.removed), 1)
+        self.assertEqual(diff.changed, [])
+        self.assertEqual(
+            diff_lime_questionnaire_structures(edited_file, self.old_file).added,
+            diff.removed,
+        )
+
+    def test_incremental_read(self):
+        """Test only changed questions are parsed again"""
+        reader = IncrementalStructureReader()
+        self.assertEqual(
+            reader.read(self.old_file),
+            read_lime_questionnaire_structure(self.old_file),
+        )
+        self.assertEqual(reader.reused_count, 0)
+        self.assertIsNone(reader.last_diff)
+
+        self.assertEqual(
+            reader.read(self.new_file),
+            read_lime_questionnaire_structure(self.new_file),
+        )
+        self.assertEqual(reader.parsed_count, 1)
+        self.assertEqual(reader.last_diff.changed, ["B1b"])
+
+    def test_survey_reload_structure(self):
+        """Test LimeSurvey reloads a structure revision"""
+        survey = LimeSurvey(structure_file=self.old_file)
+        diff = survey.reload_structure(self.new_file)
+
+        self.assertEqual(diff.changed, ["B1b"])
+        self.assertEqual(survey.structure_file, os.path.abspath(self.new_file))
+        self.assertEqual(
+            survey.questions, LimeSurvey(structure_file=self.new_file).questions
+        )
+        self.assertFalse(survey.reload_structure())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,12 @@
 """Test functions related to Survey class"""
+import copy
+import csv
+import importlib.util
 import os
 import re
+import tempfile
 import unittest
+import warnings
 
 import numpy as np
 import pandas as pd
@@ -243,6 +248,204 @@ class TestLimeSurveyReadResponses(BaseTestLimeSurvey2021WithResponsesCase):
 
         self.assertEqual(bool(not_in_structure), False)
 
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is missing")
+    def test_pyarrow_engine(self):
+        """Test pyarrow engine gives the same responses as the pandas parser"""
+
+        survey = LimeSurvey(structure_file=self.structure_file)
+        survey.read_responses(responses_file=self.responses_file, engine="pyarrow")
+
+        self.assert_df_equal(
+            survey.responses, self.survey.responses, msg="Responses not equal."
+        )
+        self.assert_df_equal(
+            survey.lime_system_info,
+            self.survey.lime_system_info,
+            msg="System info not equal.",
+        )
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is missing")
+    def test_pyarrow_engine_non_iso_dates(self):
+        """Test pyarrow engine parses dates not in ISO format like pandas"""
+
+        with open(self.responses_file, encoding="utf-8-sig", newline="") as fp:
+            header, *rows = csv.reader(fp)
+        column = header.index("submitdate")
+        for row in rows:
+            if row[column]:
+                date, time = row[column].split(" ")
+                year, month, day = date.split("-")
+                row[column] = f"{month}/{day}/{year} {time}"
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            responses_file = os.path.join(tmp_dir, "responses.csv")
+            with open(responses_file, "w", encoding="utf-8", newline="") as fp:
+                csv.writer(fp).writerows([header, *rows])
+            surveys = {}
+            for engine in ["c", "pyarrow"]:
+                surveys[engine] = LimeSurvey(structure_file=self.structure_file)
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    surveys[engine].read_responses(responses_file, engine=engine)
+
+        submitdate = surveys["pyarrow"].lime_system_info["submitdate"]
+        self.assertTrue(pd.api.types.is_datetime64_dtype(submitdate))
+        self.assert_df_equal(
+            surveys["pyarrow"].lime_system_info,
+            surveys["c"].lime_system_info,
+            msg="System info not equal.",
+        )
+
+    def test_unknown_engine(self):
+        """Test unknown CSV engine is rejected"""
+
+        survey = LimeSurvey(structure_file=self.structure_file)
+        with self.assertRaises(ValueError):
+            survey.read_responses(responses_file=self.responses_file, engine="python")
+
+    def test_read_organizations(self):
+        """Test reading responses of several organizations into one survey"""
+
+        survey = LimeSurvey.read_organizations(
+            self.structure_file,
+            {"MPS": self.responses_file, "TUM": self.responses_file},
+        )
+        n_responses = len(self.survey.responses)
+
+        self.assertEqual(survey.org, "N2")
+        self.assertEqual(len(survey.responses), 2 * n_responses)
+        self.assertEqual(len(survey.lime_system_info), 2 * n_responses)
+        self.assertTrue(survey.responses.index.is_unique)
+        self.assertEqual(
+            list(survey.responses["organization"].cat.categories), ["MPS", "TUM"]
+        )
+        self.assertEqual(
+            survey.responses["organization"].value_counts().to_dict(),
+            {"MPS": n_responses, "TUM": n_responses},
+        )
+
+        tum_survey = survey.select_organization("TUM")
+        self.assertEqual(tum_survey.org, "TUM")
+        # Ids in the file are kept with the system info
+        original_ids = pd.Index(
+            tum_survey.lime_system_info["original_id"],
+            name=self.survey.responses.index.name,
+        )
+        self.assert_df_equal(
+            tum_survey.responses.drop(columns="organization").set_axis(original_ids),
+            self.survey.responses,
+            msg="Responses not equal.",
+        )
+        self.assert_df_equal(
+            tum_survey.lime_system_info.drop(columns="original_id").set_axis(
+                original_ids
+            ),
+            self.survey.lime_system_info,
+            msg="System info not equal.",
+        )
+        # Responses of an organization are a slice of the combined responses
+        self.assertTrue(
+            np.shares_memory(
+                tum_survey.responses[self.single_choice_column].array.codes,
+                survey.responses[self.single_choice_column].array.codes,
+            )
+        )
+
+    def test_read_organizations_warnings(self):
+        """Test the organization question is not reported missing in files"""
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            LimeSurvey.read_organizations(
+                self.structure_file,
+                {"MPS": self.responses_file, "TUM": self.responses_file},
+            )
+        self.assertFalse(
+            [warning for warning in caught if "organization" in str(warning.message)]
+        )
+
+    def test_read_organizations_with_same_ids(self):
+        """Test responses of different files with the same ids are all kept"""
+
+        with open(self.responses_file, encoding="utf-8-sig", newline="") as fp:
+            header, *rows = csv.reader(fp)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            mps_file = os.path.join(tmp_dir, "mps.csv")
+            tum_file = os.path.join(tmp_dir, "tum.csv")
+            # Other responses of TUM with ids of the first MPS responses
+            tum_rows = [
+                [mps_row[0], *row[1:]] for mps_row, row in zip(rows, rows[10:15])
+            ]
+            for path, file_rows in [(mps_file, rows[:10]), (tum_file, tum_rows)]:
+                with open(path, "w", newline="") as fp:
+                    csv.writer(fp).writerows([header, *file_rows])
+
+            survey = LimeSurvey.read_organizations(
+                self.structure_file, {"MPS": mps_file, "TUM": tum_file}
+            )
+            tum_survey = LimeSurvey(structure_file=self.structure_file)
+            tum_survey.read_responses(tum_file)
+
+            with self.assertRaises(ValueError):
+                survey.append_responses(tum_file)
+
+        self.assertEqual(survey.responses.index.to_list(), list(range(1, 16)))
+        self.assertEqual(
+            survey.lime_system_info["original_id"].to_list(),
+            [int(row[0]) for row in rows[:10] + tum_rows],
+        )
+        self.assert_df_equal(
+            survey.select_organization("TUM")
+            .responses.drop(columns="organization")
+            .set_axis(tum_survey.responses.index),
+            tum_survey.responses,
+            msg="Responses not equal.",
+        )
+
+    def test_append_responses(self):
+        """Test appending new and updated responses of a newer export"""
+
+        with open(self.responses_file, encoding="utf-8-sig", newline="") as fp:
+            header, *rows = csv.reader(fp)
+        # The newer export has more responses and an updated one
+        updated_rows = [list(row) for row in rows]
+        updated_rows[2][header.index("datestamp")] = "2022-01-01 10:00:00"
+        updated_rows[2][header.index("A6")] = "A1"
+
+        transformation_questions = {"depression": "D3", "satisfaction": "C1"}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            old_file = os.path.join(tmp_dir, "old.csv")
+            new_file = os.path.join(tmp_dir, "new.csv")
+            for path, file_rows in [(old_file, rows[:10]), (new_file, updated_rows)]:
+                with open(path, "w", newline="") as fp:
+                    csv.writer(fp).writerows([header, *file_rows])
+
+            survey = LimeSurvey(structure_file=self.structure_file)
+            survey.read_responses(
+                old_file, transformation_questions=transformation_questions
+            )
+            self.assertEqual(survey.append_responses(new_file), len(rows) - 10 + 1)
+            self.assertEqual(survey.append_responses(new_file), 0)
+
+            ref_survey = LimeSurvey(structure_file=self.structure_file)
+            ref_survey.read_responses(
+                new_file, transformation_questions=transformation_questions
+            )
+
+        self.assertEqual(survey.responses[self.single_choice_column].iloc[2], "A1")
+        self.assert_df_equal(
+            survey.responses, ref_survey.responses, msg="Responses not equal."
+        )
+        self.assert_df_equal(
+            survey.lime_system_info,
+            ref_survey.lime_system_info,
+            msg="System info not equal.",
+        )
+
+    def test_select_organization_without_column(self):
+        """Test selecting an organization of a single organization survey"""
+
+        with self.assertRaises(ValueError):
+            self.survey.select_organization("MPS")
+
     def test_mental_health_transformation_questions(self):
         """Test adding responses to mental health transformationquestions in
         read_responses"""
@@ -492,6 +695,18 @@ class TestLimeSurveyReadResponses(BaseTestLimeSurvey2021WithResponsesCase):
             True,
         )
 
+    def test_categories_from_structure(self):
+        """Test categorical columns have all choices of the structure as categories"""
+
+        for column in self.survey.responses.columns:
+            choices = self.survey.questions.loc[column, "choices"]
+            if pd.notnull(choices):
+                self.assertEqual(
+                    list(self.survey.responses[column].cat.categories),
+                    list(choices.keys()),
+                    msg=f"Wrong categories of {column}",
+                )
+
     def test_lime_system_info_dtypes(self):
         """Test data in lime_system_info has correct dtypes"""
 
@@ -802,6 +1017,67 @@ class TestLimeSurveyTransformQuestion(BaseTestLimeSurvey2021WithResponsesCase):
         )
 
 
+class TestLimeSurveyMemory(BaseTestLimeSurvey2021WithResponsesCase):
+    """Test LimeSurvey memory report and optimization"""
+
+    def test_memory_report(self):
+        """Test memory usage is broken down by tables, questions and sections"""
+        report = self.survey.memory_report()
+
+        self.assertEqual(report.total, report.tables.sum())
+        self.assertEqual(
+            report.tables["responses"],
+            self.survey.responses.memory_usage(deep=True, index=False).sum(),
+        )
+        self.assertEqual(
+            report.questions["responses"].sum(), report.tables["responses"]
+        )
+        self.assertEqual(report.questions.loc["A6", "section_id"], 60)
+        self.assertEqual(report.sections.loc[60, "title"], "Demographics")
+        self.assertEqual(report.sections["responses"].sum(), report.tables["responses"])
+
+    def test_optimize_memory(self):
+        """Test optimized responses use less memory and keep their values"""
+        survey = LimeSurvey(structure_file=self.structure_file)
+        survey.read_responses(responses_file=self.responses_file)
+
+        savings = survey.optimize_memory()
+
+        self.assertGreater(savings.loc["responses", "saved"], 0)
+        self.assertGreater(savings.loc["lime_system_info", "saved"], 0)
+        self.assertEqual(
+            survey.memory_report().tables["responses"],
+            savings.loc["responses", "after"],
+        )
+        self.assertEqual(survey.lime_system_info["interviewtime"].dtype, "float32")
+        self.assertEqual(
+            survey.get_responses(self.free_column),
+            self.survey.get_responses(self.free_column),
+        )
+        self.assert_df_equal(
+            survey.responses, self.survey.responses, msg="Responses not equal."
+        )
+
+    def test_optimized_memory_is_kept(self):
+        """Test moved free text stays moved when responses are used"""
+        survey = LimeSurvey(structure_file=self.structure_file)
+        survey.read_responses(responses_file=self.responses_file)
+        survey.optimize_memory()
+        usage = survey.memory_report().tables["responses"]
+
+        survey.get_responses(self.free_column)
+        survey.count(self.single_choice_column)
+        survey.query(f"{self.free_column} == {self.free_column}")
+        survey_copy = copy.deepcopy(survey)
+
+        self.assertEqual(survey.memory_report().tables["responses"], usage)
+        self.assertEqual(survey_copy.memory_report().tables["responses"], usage)
+        self.assertEqual(
+            survey_copy.get_responses(self.free_column),
+            self.survey.get_responses(self.free_column),
+        )
+
+
 class TestLimeSurveyAddQuestion(BaseTestLimeSurvey2021Case):
     """Test LimeSurvey add_question"""
 
@@ -1314,6 +1590,78 @@ class TestLimeSurveyGetChoices(BaseTestLimeSurvey2021Case):
         )
 
 
+class TestLimeSurveyMetadataCache(BaseTestLimeSurvey2021Case):
+    """Test memoization of question metadata accessors"""
+
+    def test_hits_and_misses(self):
+        """Test repeated calls are served from the cache"""
+        survey = LimeSurvey(structure_file=self.structure_file)
+        label = survey.get_label(self.single_choice_column)
+        info = survey.metadata_cache_info()
+
+        self.assertEqual(survey.get_label(self.single_choice_column), label)
+        new_info = survey.metadata_cache_info()
+        self.assertEqual(new_info.hits, info.hits + 1)
+        self.assertEqual(new_info.misses, info.misses)
+
+    def test_count_keeps_cache(self):
+        """Test counting does not drop memoized question metadata"""
+        survey = LimeSurvey(structure_file=self.structure_file)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            survey.read_responses(self.responses_file)
+        survey.count(self.multiple_choice_column)
+        registry = survey._get_registry()
+        info = survey.metadata_cache_info()
+
+        for _ in range(3):
+            survey.count(self.multiple_choice_column)
+        self.assertEqual(survey.metadata_cache_info().misses, info.misses)
+        self.assertIs(survey._get_registry(), registry)
+
+    def test_choices_are_copied(self):
+        """Test modified choices do not change the cache or other questions"""
+        survey = LimeSurvey(structure_file=self.structure_file)
+        first, second = survey.get_question(self.array_column).index[:2]
+        expected = dict(survey.get_choices(first))
+        self.assertEqual(survey.get_choices(second), expected)
+
+        survey.get_choices(first).clear()
+        choices = survey.get_choices(second)
+        choices["new"] = "New"
+        self.assertEqual(survey.get_choices(first), expected)
+        self.assertEqual(survey.get_choices(second), expected)
+
+    def test_invalidation(self):
+        """Test the cache is dropped when questions change"""
+        survey = LimeSurvey(structure_file=self.structure_file)
+        survey.get_choices(self.single_choice_column)
+        self.assertGreater(survey.metadata_cache_info().currsize, 0)
+
+        survey.add_question(self.single_choice_column + "new", type="free")
+        self.assertEqual(survey.metadata_cache_info().currsize, 0)
+
+        survey.get_question_type(self.free_column)
+        survey.questions.loc[self.free_column, "type"] = "single-choice"
+        self.assertEqual(survey.get_question_type(self.free_column), "single-choice")
+
+    def test_read_questions(self):
+        """Test the cache is kept when questions are only read"""
+        survey = LimeSurvey(structure_file=self.structure_file)
+        survey.get_label(self.single_choice_column)
+        survey.questions.shape
+        info = survey.metadata_cache_info()
+        self.assertGreater(info.currsize, 0)
+
+        survey.get_label(self.single_choice_column)
+        self.assertEqual(survey.metadata_cache_info().hits, info.hits + 1)
+
+        # Edits of choices are seen too
+        choices = survey.questions.loc[self.single_choice_column, "choices"]
+        choices["A1"] = "Edited"
+        self.assertEqual(survey.get_choices(self.single_choice_column)["A1"], "Edited")
+
+
 class TestLimeSurveyplot(BaseTestLimeSurvey2021WithResponsesCase):
     def test_single_choice_question(self):
         # Todo implement test using mocking or matplotlib.testing
@@ -1506,6 +1854,43 @@ class TestLimeSurveyGetItem(BaseTestLimeSurvey2021WithResponsesCase):
 
         np.testing.assert_equal(list(filtered_survey.responses.values[:, 6]), ref)
 
+    def test_views(self):
+        """Test filters are views with rows selected from the same responses"""
+        responses = self.survey.responses
+        filtered_survey = self.survey.query("A6 == 'A1'").filter_na("B2")
+        filtered_survey = filtered_survey[
+            filtered_survey.get_responses("B2", labels=False)["B2"] != "A13"
+        ]
+        expected = responses[
+            (responses.A6 == "A1") & responses.B2.notna() & (responses.B2 != "A13")
+        ]
+
+        view = filtered_survey._responses_loader
+        self.assertIs(view._frame, responses)
+        self.assertEqual(
+            list(view.positions), list(responses.index.get_indexer(expected.index))
+        )
+        # Columns are copied on request only
+        self.assertEqual(filtered_survey._responses.shape, (len(expected), 0))
+        self.assertEqual(
+            filtered_survey.count(self.array_column),
+            self.survey[responses.index.to_series().isin(expected.index)].count(
+                self.array_column
+            ),
+        )
+
+        # Columns added to a view are filtered with it
+        filtered_survey.add_responses(
+            pd.Series(range(len(expected)), index=expected.index, name="order")
+        )
+        self.assertEqual(
+            filtered_survey.query("order > 1").responses[["A6", "order"]],
+            expected[["A6"]].assign(order=range(len(expected))).iloc[2:],
+        )
+        self.assertEqual(
+            filtered_survey.responses, expected.assign(order=range(len(expected)))
+        )
+
 
 class TestLimeSurveyQuery(BaseTestLimeSurvey2021WithResponsesCase):
     """Test LimeSurvey query method"""